@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""Micro-benchmark for DocumentationCache freshness checks.
+
+Creates ``--files`` small source files, records them in a cache, then times
+`needs_update` over the whole set in three situations:
+
+* ``unchanged``: nothing touched, answered from the stat signature alone
+* ``touched``: every mtime bumped, so every file is hashed but found equal
+* ``full_read_md5``: the old behaviour, reading and MD5-hashing every file
+
+    python benchmarks/cache_freshness.py --files 100000
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from opendox.core.cache import DocumentationCache
+
+
+def make_files(root: Path, count: int, per_dir: int = 1000):
+    files = []
+    for i in range(count):
+        directory = root / f"pkg_{i // per_dir:04d}"
+        if i % per_dir == 0:
+            directory.mkdir(parents=True)
+        path = directory / f"mod_{i:06d}.py"
+        path.write_text(f"def f_{i}(x):\n    return x + {i}\n" * 20)
+        files.append(path)
+    return files
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return round(time.perf_counter() - start, 3), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=100_000)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix='opendox-cache-bench-'))
+    try:
+        files = make_files(workdir / 'src', args.files)
+        cache = DocumentationCache(workdir)
+        for path in files:
+            cache.needs_update(path)
+            cache.update(path)
+        cache.close()
+
+        cache = DocumentationCache(workdir)
+        results = {'files': args.files}
+        results['unchanged_s'], stale = timed(lambda: sum(cache.needs_update(p) for p in files))
+        assert stale == 0
+
+        for path in files:
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        results['touched_s'], stale = timed(lambda: sum(cache.needs_update(p) for p in files))
+        assert stale == 0
+
+        results['full_read_md5_s'], _ = timed(lambda: [hashlib.md5(p.read_bytes()).hexdigest() for p in files])
+        print(json.dumps(results, indent=2))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""Measure the memory held by a large number of parsed code elements.
+
+Builds ``--count`` function elements shaped like `PythonParser` output (a
+few thousand distinct names, short docstrings, a metadata dict each) in three
+layouts and reports the traced allocation for each:
+
+- ``dataclass``: the ``@dataclass`` CodeElement used before;
+- ``slotted``: the current slotted `CodeElement`;
+- ``store``: an `ElementStore` holding the same elements column-wise.
+
+    python benchmarks/element_memory.py --count 1000000
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from opendox.parsers.base import CodeElement, ElementStore
+
+
+@dataclass
+class DataclassElement:
+    """The CodeElement definition before it was slotted."""
+    name: str
+    type: str
+    line_start: int
+    line_end: Optional[int] = None
+    docstring: Optional[str] = None
+    signature: Optional[str] = None
+    metadata: Dict[str, Any] = None
+
+    def __post_init__(self):
+        if self.metadata is None:
+            self.metadata = {}
+
+
+def fields(i: int):
+    # Names are built at runtime, as they are when read from source
+    name = "handler_" + str(i % 5000)
+    return dict(
+        name=name,
+        type="".join(("func", "tion")),
+        line_start=i % 2000 + 1,
+        line_end=i % 2000 + 12,
+        docstring=None if i % 3 else "Handle one request.",
+        signature=None,
+        metadata={"args": ["self", "request"], "returns": None, "decorators": [],
+                  "is_async": False, "qualname": name, "is_method": True},
+    )
+
+
+def build_dataclass(count):
+    return [DataclassElement(**fields(i)) for i in range(count)]
+
+
+def build_slotted(count):
+    return [CodeElement(**fields(i)) for i in range(count)]
+
+
+def build_store(count):
+    return ElementStore(CodeElement(**fields(i)) for i in range(count))
+
+
+def measure(build, count):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    held = build(count)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return {'mib': round(current / 2**20, 1), 'bytes_per_element': round(current / count),
+            'build_s': round(elapsed, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    results = {'count': args.count}
+    for label, build in (('dataclass', build_dataclass), ('slotted', build_slotted), ('store', build_store)):
+        results[label] = measure(build, args.count)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
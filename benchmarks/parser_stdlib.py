@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""Benchmark PythonParser's element extraction over the standard library.
+
+Compares the single-pass visitor with the previous implementation, which
+walked every tree three times (functions, classes, imports) and rendered
+every signature and return annotation with ``ast.unparse`` up front. Source
+reading and ``ast.parse`` are done once beforehand and excluded, since they
+are identical for both; ``parse_file`` totals are reported separately.
+
+    python benchmarks/parser_stdlib.py --repeat 3
+"""
+import argparse
+import ast
+import json
+import sysconfig
+import time
+from pathlib import Path
+
+from opendox.parsers.python_parser import PythonParser
+
+
+class ThreeWalkExtractor:
+    """The extraction code PythonParser used before the single-pass visitor."""
+
+    def __init__(self):
+        self.parser = PythonParser()
+
+    def extract(self, tree):
+        return self.functions(tree), self.classes(tree), self.imports(tree)
+
+    def functions(self, tree):
+        functions = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.FunctionDef):
+                functions.append((
+                    node.name,
+                    ast.get_docstring(node),
+                    self.parser._get_function_signature(node),
+                    [arg.arg for arg in node.args.args],
+                    ast.unparse(node.returns) if node.returns else None,
+                    [self.parser._get_decorator_name(d) for d in node.decorator_list],
+                ))
+        return functions
+
+    def classes(self, tree):
+        classes = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ClassDef):
+                classes.append((
+                    node.name,
+                    ast.get_docstring(node),
+                    [m.name for m in node.body if isinstance(m, ast.FunctionDef)],
+                    [self.parser._get_name(base) for base in node.bases],
+                ))
+        return classes
+
+    def imports(self, tree):
+        imports = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                imports.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                imports.extend(alias.name for alias in node.names)
+        return imports
+
+
+def load_trees(root: Path):
+    trees = []
+    for path in sorted(root.rglob('*.py')):
+        if 'test' in path.parts or 'site-packages' in path.parts:
+            continue
+        try:
+            trees.append((path, ast.parse(path.read_text(encoding='utf-8'))))
+        except (SyntaxError, UnicodeDecodeError, ValueError):
+            continue
+    return trees
+
+
+def best_of(repeat, fn):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return round(min(times), 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--root', type=Path, default=Path(sysconfig.get_paths()['stdlib']))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    from opendox.parsers.python_parser import _ModuleCollector
+
+    trees = load_trees(args.root)
+    python_parser = PythonParser()
+    legacy = ThreeWalkExtractor()
+
+    def single_pass():
+        for _, tree in trees:
+            collector = _ModuleCollector(python_parser)
+            collector.visit(tree)
+            collector.functions(), collector.classes()
+
+    def three_walks():
+        for _, tree in trees:
+            legacy.extract(tree)
+
+    results = {
+        'files': len(trees),
+        'three_walks_s': best_of(args.repeat, three_walks),
+        'single_pass_s': best_of(args.repeat, single_pass),
+    }
+    results['speedup'] = round(results['three_walks_s'] / results['single_pass_s'], 2)
+    results['parse_file_total_s'] = best_of(1, lambda: [python_parser.parse_file(path) for path, _ in trees])
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
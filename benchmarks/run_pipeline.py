@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+"""End-to-end throughput benchmark for the documentation pipeline.
+
+Generates synthetic repositories, runs DocumentationPipeline against them with
+MockLLMGenerator standing in for Ollama, and reports files/sec, functions/sec,
+per-stage p50/p99 latencies (from the pipeline's tracer) and peak RSS. Each
+size runs in its own process so peak RSS is measured independently. Results
+are written as JSON so runs can be compared between releases.
+
+    python benchmarks/run_pipeline.py --sizes 1000 10000 --latency 0.05 -o bench.json
+"""
+import argparse
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from synthetic_repo import generate_repo  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB, if the OS reports it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+def run_single(args):
+    """Benchmark one repository size in this process and return the result dict."""
+    from opendox.core import pipeline as pipeline_module
+    from opendox.core.pipeline import DocumentationPipeline
+    from opendox.generators.mock_generator import MockLLMGenerator
+
+    workdir = Path(tempfile.mkdtemp(prefix='opendox-bench-'))
+    try:
+        repo = generate_repo(workdir / 'repo', args.files, args.functions)
+        output = workdir / 'docs'
+
+        pipeline_module.console.quiet = True
+        generator = MockLLMGenerator(latency=args.latency)
+        pipeline = DocumentationPipeline(
+            generator=generator,
+            llm_concurrency=args.llm_concurrency,
+            parse_workers=args.parse_workers,
+            batch_size=args.batch_size,
+            llm_cache=False,
+        )
+
+        start = time.perf_counter()
+        stats = pipeline.generate(repo, output, max_files=0, incremental=args.incremental)
+        elapsed = time.perf_counter() - start
+
+        python_files = len(stats['file_details'])
+        result = {
+            'files': args.files,
+            'python_files': python_files,
+            'functions_documented': stats['functions_documented'],
+            'errors': len(stats['errors']),
+            'elapsed_s': round(elapsed, 3),
+            'files_per_sec': round(python_files / elapsed, 2) if elapsed else None,
+            'functions_per_sec': round(stats['functions_documented'] / elapsed, 2) if elapsed else None,
+            'stages': stats['stage_timings'],
+            'peak_rss_mb': peak_rss_mb(),
+        }
+
+        if args.rerun:
+            # Second incremental pass over an unchanged tree
+            pipeline = DocumentationPipeline(generator=generator, llm_cache=False)
+            start = time.perf_counter()
+            pipeline.generate(repo, output, max_files=0, incremental=True)
+            result['noop_rerun_s'] = round(time.perf_counter() - start, 3)
+        return result
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Benchmark the OPENDOX pipeline.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000],
+                        help='Repository sizes in files (e.g. 1000 10000 100000)')
+    parser.add_argument('--files', type=int, default=1000, help=argparse.SUPPRESS)
+    parser.add_argument('--functions', type=int, default=8, help='Functions per synthetic file')
+    parser.add_argument('--latency', type=float, default=0.0, help='Injected mock LLM latency in seconds')
+    parser.add_argument('--llm-concurrency', type=int, default=4)
+    parser.add_argument('--parse-workers', type=int, default=0)
+    parser.add_argument('--batch-size', type=int, default=1)
+    parser.add_argument('--incremental', action='store_true', help='Run with the incremental cache enabled')
+    parser.add_argument('--rerun', action='store_true', help='Also time a no-change incremental rerun')
+    parser.add_argument('-o', '--output', type=Path, default=Path('bench_results.json'))
+    parser.add_argument('--single', action='store_true', help=argparse.SUPPRESS)
+    return parser
+
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(run_single(args)))
+        return
+
+    passthrough = [
+        '--functions', str(args.functions),
+        '--latency', str(args.latency),
+        '--llm-concurrency', str(args.llm_concurrency),
+        '--parse-workers', str(args.parse_workers),
+        '--batch-size', str(args.batch_size),
+    ]
+    if args.incremental:
+        passthrough.append('--incremental')
+    if args.rerun:
+        passthrough.append('--rerun')
+
+    results = []
+    for size in args.sizes:
+        print(f"Benchmarking {size} files...", file=sys.stderr)
+        proc = subprocess.run(
+            [sys.executable, __file__, '--single', '--files', str(size), *passthrough],
+            capture_output=True, text=True, check=True,
+        )
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        results.append(result)
+        print(
+            f"  {result['files_per_sec']} files/s, {result['functions_per_sec']} functions/s, "
+            f"peak RSS {result['peak_rss_mb']} MiB",
+            file=sys.stderr,
+        )
+
+    from opendox import __version__
+    report = {
+        'opendox_version': __version__,
+        'generated_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {k: v for k, v in vars(args).items() if k not in ('output', 'single', 'files', 'sizes')},
+        'results': results,
+    }
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""Generate synthetic Python/JavaScript/Go repositories for benchmarking."""
+import argparse
+import random
+from pathlib import Path
+
+PY_FUNCTION = '''
+def {name}(value, factor=2):
+    """Scale a value for {name}."""
+    result = value * factor
+    if result > 100:
+        return result - 100
+    return result
+'''
+
+PY_CLASS = '''
+class {name}:
+    """Synthetic class {name}."""
+
+    def __init__(self, size):
+        self.size = size
+
+    def grow(self, amount):
+        self.size += amount
+        return self.size
+'''
+
+JS_FUNCTION = '''
+function {name}(value, factor) {{
+  const result = value * (factor || 2);
+  return result > 100 ? result - 100 : result;
+}}
+'''
+
+GO_FUNCTION = '''
+func {name}(value int, factor int) int {{
+\tresult := value * factor
+\tif result > 100 {{
+\t\treturn result - 100
+\t}}
+\treturn result
+}}
+'''
+
+LANGUAGES = {
+    'py': ('.py', PY_FUNCTION, ''),
+    'js': ('.js', JS_FUNCTION, ''),
+    'go': ('.go', GO_FUNCTION, 'package synthetic\n'),
+}
+
+
+def generate_repo(root: Path, files: int, functions_per_file: int = 8,
+                  languages=('py', 'js', 'go'), files_per_dir: int = 100,
+                  seed: int = 0) -> Path:
+    """Write ``files`` source files under ``root`` and return it.
+
+    Files are spread round-robin over ``languages`` and grouped into nested
+    directories of ``files_per_dir`` so discovery sees a realistic tree. A
+    ``node_modules`` directory is added to exercise ignore handling.
+    """
+    rng = random.Random(seed)
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    for index in range(files):
+        lang = languages[index % len(languages)]
+        suffix, template, header = LANGUAGES[lang]
+        package = root / f"pkg{index // (files_per_dir * 10)}" / f"mod{index // files_per_dir}"
+        package.mkdir(parents=True, exist_ok=True)
+        parts = [header]
+        for fn in range(functions_per_file):
+            parts.append(template.format(name=f"func_{index}_{fn}"))
+        if lang == 'py' and rng.random() < 0.5:
+            parts.append(PY_CLASS.format(name=f"Widget{index}"))
+        (package / f"file_{index}{suffix}").write_text(''.join(parts), encoding='utf-8')
+
+    vendored = root / 'node_modules' / 'vendored'
+    vendored.mkdir(parents=True, exist_ok=True)
+    for index in range(min(files, 200)):
+        (vendored / f"dep_{index}.js").write_text(JS_FUNCTION.format(name=f"dep_{index}"), encoding='utf-8')
+    return root
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('output', type=Path, help='Directory to create')
+    parser.add_argument('--files', type=int, default=1000, help='Number of source files')
+    parser.add_argument('--functions', type=int, default=8, help='Functions per file')
+    parser.add_argument('--languages', default='py,js,go', help='Comma-separated: py,js,go')
+    args = parser.parse_args()
+    generate_repo(args.output, args.files, args.functions, tuple(args.languages.split(',')))
+    print(f"Wrote {args.files} files to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
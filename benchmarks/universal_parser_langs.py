@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+"""Benchmark UniversalParser's tree walks per language.
+
+For each language a synthetic file is generated (a few hundred definitions
+with ordinary bodies: loops, calls, literals, comments), parsed once, and the
+extractor is timed with two walks:
+
+- ``recursive``: the previous recursive walk through ``node.children``, with
+  every match decoded from a bytes slice;
+- ``cursor``: `walk_tree` with the language's skip set.
+
+Tree-sitter parse time is reported separately since both share it, as is
+the startup cost of constructing `UniversalParser` and loading its first
+grammar. ``cold_parse_file_ms`` / ``edit_reparse_ms`` compare a full
+`parse_file` with an incremental one after inserting a line mid-file.
+
+    python benchmarks/universal_parser_langs.py --definitions 400 --repeat 3
+"""
+import argparse
+import json
+import tempfile
+import time
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+
+from opendox.parsers import universal_parser
+from opendox.parsers.universal_parser import UniversalParser
+
+warnings.simplefilter('ignore', FutureWarning)  # tree_sitter_languages on newer tree_sitter
+
+TEMPLATES = {
+    '.py': ('', '''
+class Service{i}:
+    """Service number {i}."""
+
+    def handle(self, request, retries=3):
+        """Handle one request."""
+        # Try a few times before giving up
+        for attempt in range(retries):
+            result = self.backend.call(request, {{"attempt": attempt, "id": {i}}})
+            if result and result.get("ok"):
+                return [item * 2 for item in result["items"] if item]
+        raise RuntimeError("failed after %d attempts" % retries)
+''', ''),
+    '.js': ('', '''
+class Service{i} {{
+  handle(request, retries = 3) {{
+    // Try a few times before giving up
+    for (let attempt = 0; attempt < retries; attempt++) {{
+      const result = this.backend.call(request, {{ attempt, id: {i} }});
+      if (result && result.ok) {{
+        return result.items.filter(Boolean).map((item) => item * 2);
+      }}
+    }}
+    throw new Error(`failed after ${{retries}} attempts`);
+  }}
+}}
+function helper{i}(values) {{ return values.reduce((a, b) => a + b, 0); }}
+''', ''),
+    '.ts': ('', '''
+interface Options{i} {{ retries: number; id: string; }}
+class Service{i} {{
+  handle(request: Request, options: Options{i}): number[] {{
+    // Try a few times before giving up
+    for (let attempt = 0; attempt < options.retries; attempt++) {{
+      const result: Result | null = this.backend.call(request, {{ attempt, id: "{i}" }});
+      if (result && result.ok) {{
+        return result.items.filter(Boolean).map((item: number) => item * 2);
+      }}
+    }}
+    throw new Error(`failed after ${{options.retries}} attempts`);
+  }}
+}}
+''', ''),
+    '.go': ('package service\n\nimport "fmt"\n', '''
+// Handle{i} tries a few times before giving up.
+func Handle{i}(request Request, retries int) ([]int, error) {{
+	for attempt := 0; attempt < retries; attempt++ {{
+		result, err := backend.Call(request, map[string]int{{"attempt": attempt, "id": {i}}})
+		if err == nil && result.Ok {{
+			out := make([]int, 0, len(result.Items))
+			for _, item := range result.Items {{
+				out = append(out, item*2)
+			}}
+			return out, nil
+		}}
+	}}
+	return nil, fmt.Errorf("failed after %d attempts", retries)
+}}
+''', ''),
+    '.rs': ('', '''
+struct Service{i} {{ retries: u32 }}
+impl Service{i} {{
+    /// Try a few times before giving up.
+    fn handle(&self, request: &Request) -> Result<Vec<i64>, String> {{
+        for attempt in 0..self.retries {{
+            let result = backend::call(request, attempt, {i});
+            if let Ok(items) = result {{
+                return Ok(items.iter().filter(|x| **x != 0).map(|x| x * 2).collect());
+            }}
+        }}
+        Err(format!("failed after {{}} attempts", self.retries))
+    }}
+}}
+''', ''),
+    '.java': ('', '''
+class Service{i} {{
+    // Try a few times before giving up
+    int[] handle(Request request, int retries) {{
+        for (int attempt = 0; attempt < retries; attempt++) {{
+            Result result = backend.call(request, attempt, {i});
+            if (result != null && result.ok) {{
+                return result.items.stream().filter(x -> x != 0).mapToInt(x -> x * 2).toArray();
+            }}
+        }}
+        throw new RuntimeException("failed after " + retries + " attempts");
+    }}
+}}
+''', ''),
+    '.c': ('#include <stdio.h>\n', '''
+/* Try a few times before giving up */
+int handle_{i}(struct request *request, int retries, int *out) {{
+    for (int attempt = 0; attempt < retries; attempt++) {{
+        struct result result = backend_call(request, attempt, {i});
+        if (result.ok) {{
+            for (int j = 0; j < result.count; j++) {{
+                out[j] = result.items[j] * 2;
+            }}
+            return result.count;
+        }}
+    }}
+    fprintf(stderr, "failed after %d attempts\\n", retries);
+    return -1;
+}}
+''', ''),
+    '.cpp': ('#include <vector>\n', '''
+class Service{i} {{
+public:
+    // Try a few times before giving up
+    std::vector<int> handle(const Request& request, int retries) {{
+        for (int attempt = 0; attempt < retries; ++attempt) {{
+            auto result = backend.call(request, attempt, {i});
+            if (result.ok) {{
+                std::vector<int> out;
+                for (int item : result.items) out.push_back(item * 2);
+                return out;
+            }}
+        }}
+        throw std::runtime_error("failed");
+    }}
+}};
+''', ''),
+}
+
+
+def recursive_walk(node, skip=frozenset()):
+    """The walk used before: recursion through ``node.children``, no pruning."""
+    yield node
+    for child in node.children:
+        yield from recursive_walk(child)
+
+
+class SliceText:
+    """Decode by slicing the bytes, as before."""
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def __call__(self, node) -> str:
+        return self.content[node.start_byte:node.end_byte].decode('utf-8')
+
+
+@contextmanager
+def legacy_walk():
+    walk, text = universal_parser.walk_tree, universal_parser.SourceText
+    universal_parser.walk_tree, universal_parser.SourceText = recursive_walk, SliceText
+    try:
+        yield
+    finally:
+        universal_parser.walk_tree, universal_parser.SourceText = walk, text
+
+
+def time_reparse(content: bytes, ext: str, repeat: int):
+    """Cold `parse_file` time vs. an incremental reparse after a one-line edit."""
+    middle = content.index(b'\n', len(content) // 2) + 1
+    edited = content[:middle] + b'\n' + content[middle:]  # Shifts every later line
+    cold = UniversalParser()
+    incremental = UniversalParser(incremental=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / f'bench{ext}'
+        path.write_bytes(edited)
+        cold_s = best_of(repeat, lambda: cold.parse_file(path))
+        expected = cold.parse_file(path)
+        times = []
+        for _ in range(repeat):
+            incremental.forget(path)
+            path.write_bytes(content)
+            incremental.parse_file(path)
+            path.write_bytes(edited)
+            start = time.perf_counter()
+            result = incremental.parse_file(path)
+            times.append(time.perf_counter() - start)
+            assert result == expected, ext
+    return cold_s, min(times)
+
+
+def best_of(repeat, fn):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--definitions', type=int, default=400)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    up = UniversalParser()
+    construct_s = time.perf_counter() - start
+    if not up.available:
+        raise SystemExit("tree_sitter_languages is not installed")
+    start = time.perf_counter()
+    up.parser_for('.py')
+    first_python_s = time.perf_counter() - start
+    extractors = {
+        '.py': up._extract_python, '.js': up._extract_javascript, '.ts': up._extract_javascript,
+        '.go': up._extract_go, '.rs': up._extract_rust, '.java': up._extract_java,
+        '.c': up._extract_c_cpp, '.cpp': up._extract_c_cpp,
+    }
+
+    # Grammars load on first use of an extension, so a Python-only run pays
+    # for one grammar rather than all of them at construction
+    results = {'startup': {
+        'construct_ms': round(construct_s * 1000, 3),
+        'first_python_parser_ms': round(first_python_s * 1000, 3),
+    }}
+    for ext, (header, body, footer) in TEMPLATES.items():
+        content = (header + ''.join(body.format(i=i) for i in range(args.definitions)) + footer).encode()
+        path = Path(f'bench{ext}')
+        ts_parser = up.parser_for(ext)
+        parse_s = best_of(args.repeat, lambda: ts_parser.parse(content))
+        tree = ts_parser.parse(content)
+        extract = extractors[ext]
+        cursor_s = best_of(args.repeat, lambda: extract(tree.root_node, content, path))
+        with legacy_walk():
+            recursive_s = best_of(args.repeat, lambda: extract(tree.root_node, content, path))
+            legacy_result = extract(tree.root_node, content, path)
+        assert extract(tree.root_node, content, path) == legacy_result, ext
+        cold_s, reparse_s = time_reparse(content, ext, args.repeat)
+        results[ext] = {
+            'kib': len(content) // 1024,
+            'parse_ms': round(parse_s * 1000, 1),
+            'recursive_ms': round(recursive_s * 1000, 1),
+            'cursor_ms': round(cursor_s * 1000, 1),
+            'speedup': round(recursive_s / cursor_s, 1),
+            'cold_parse_file_ms': round(cold_s * 1000, 1),
+            'edit_reparse_ms': round(reparse_s * 1000, 1),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
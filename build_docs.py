@@ -24,7 +24,7 @@ def build_documentation(source_path: Path, output_path: Path):
         if 'error' not in result and result.get('functions'):
             docs = []
             for func in result['functions'][:3]:
-                doc = generator.generate_function_doc(func.__dict__)
+                doc = generator.generate_function_doc(func)
                 docs.append(doc)
             
             formatter.create_module_page(file.stem, result['functions'][:3], docs)
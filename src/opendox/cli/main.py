@@ -2,12 +2,10 @@
 import sys
 from pathlib import Path
 from typing import Optional
-from opendox.core.pipeline import DocumentationPipeline
 
 import typer
 from rich.console import Console
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
 
 app = typer.Typer(
     name="opendox",
@@ -33,6 +31,16 @@ def callback(
     """OPENDOX - Automated Technical Documentation Generator."""
     pass
 
+def _create_backend(name: str, url: Optional[str], timeout: float):
+    """Build the LLM backend for a command, exiting on bad options."""
+    from opendox.generators.backends import create_backend
+    
+    try:
+        return create_backend(name, url, timeout)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+
 @app.command()
 def init(
     repo: str = typer.Argument(
@@ -70,33 +78,118 @@ def generate(
     path: Path = typer.Argument(Path("."), help="Repository path"),
     output: Path = typer.Option(Path("./docs"), "--output", "-o", help="Output directory"),
     model: str = typer.Option("deepseek-coder:1.3b", "--model", "-m", help="LLM model to use"),
-    max_files: int = typer.Option(10, "--max-files", help="Maximum files to process"),
+    backend: str = typer.Option("ollama", "--backend", help="LLM backend: ollama, openai (any OpenAI-compatible server) or mock"),
+    llm_url: Optional[str] = typer.Option(None, "--llm-url", help="LLM server URL, e.g. http://localhost:8080/v1 for --backend openai"),
+    llm_timeout: float = typer.Option(120.0, "--llm-timeout", help="Seconds to wait for the LLM server to respond"),
+    max_files: int = typer.Option(10, "--max-files", help="Maximum files to process (0 for no limit)"),
     no_incremental: bool = typer.Option(False, "--no-incremental", help="Force regenerate all files"),
+    llm_concurrency: int = typer.Option(4, "--llm-concurrency", help="Maximum concurrent LLM requests"),
+    parse_workers: int = typer.Option(0, "--parse-workers", help="Parser processes (0 parses in-process)"),
+    queue_depth: int = typer.Option(64, "--queue-depth", help="Maximum items buffered between pipeline stages"),
+    no_llm_cache: bool = typer.Option(False, "--no-llm-cache", help="Always call the LLM, ignoring cached responses"),
+    batch_size: int = typer.Option(1, "--batch-size", help="Functions packed into one LLM prompt (1 disables batching)"),
+    no_stream: bool = typer.Option(False, "--no-stream", help="Wait for complete LLM responses instead of streaming"),
+    trace: Optional[Path] = typer.Option(None, "--trace", help="Write a Chrome trace-event JSON file of the run"),
+    no_git: bool = typer.Option(False, "--no-git", help="Hash every file instead of asking git what changed"),
+    state_db: bool = typer.Option(False, "--state-db", help="Record file states in .opendox/state.duckdb (needs duckdb)"),
+    no_parse_cache: bool = typer.Option(False, "--no-parse-cache", help="Re-parse every file instead of reusing cached parser output"),
 ):
     """Generate documentation from code."""
     console.print(f"[bold blue]Generating documentation...[/bold blue]")
     console.print(f"Source: {path}")
     console.print(f"Output: {output}")
-    console.print(f"Model: {model}")
+    console.print(f"Model: {model} ({backend})")
     console.print(f"Incremental: {not no_incremental}")
+    console.print(f"LLM concurrency: {llm_concurrency}")
     
     from opendox.core.pipeline import DocumentationPipeline
     
-    pipeline = DocumentationPipeline(model=model)
+    pipeline = DocumentationPipeline(
+        model=model,
+        backend=_create_backend(backend, llm_url, llm_timeout),
+        llm_concurrency=llm_concurrency,
+        parse_workers=parse_workers,
+        queue_depth=queue_depth,
+        llm_cache=not no_llm_cache,
+        batch_size=batch_size,
+        trace=trace is not None,
+        use_git=not no_git,
+        state_db=state_db,
+        parse_cache=not no_parse_cache,
+        stream=not no_stream,
+    )
     pipeline.generate(path, output, max_files=max_files, incremental=not no_incremental)
     
+    if trace is not None:
+        pipeline.export_trace(trace)
+        console.print(f"Trace written to {trace}")
+    
     console.print(f"[bold green]Documentation generated in {output}[/bold green]")
     console.print(f"Run 'mkdocs serve' in {output} to view")
 
+@app.command()
+def watch(
+    path: Path = typer.Argument(Path("."), help="Repository path"),
+    output: Path = typer.Option(Path("./docs"), "--output", "-o", help="Output directory"),
+    model: str = typer.Option("deepseek-coder:1.3b", "--model", "-m", help="LLM model to use"),
+    backend: str = typer.Option("ollama", "--backend", help="LLM backend: ollama, openai (any OpenAI-compatible server) or mock"),
+    llm_url: Optional[str] = typer.Option(None, "--llm-url", help="LLM server URL, e.g. http://localhost:8080/v1 for --backend openai"),
+    llm_timeout: float = typer.Option(120.0, "--llm-timeout", help="Seconds to wait for the LLM server to respond"),
+    max_files: int = typer.Option(0, "--max-files", help="Maximum files in the initial build (0 for no limit)"),
+    llm_concurrency: int = typer.Option(4, "--llm-concurrency", help="Maximum concurrent LLM requests"),
+    batch_size: int = typer.Option(1, "--batch-size", help="Functions packed into one LLM prompt (1 disables batching)"),
+    debounce: float = typer.Option(0.3, "--debounce", help="Seconds without changes before a batch is processed"),
+    poll: bool = typer.Option(False, "--poll", help="Poll file timestamps instead of using file system events"),
+    interval: float = typer.Option(1.0, "--interval", help="Polling interval in seconds"),
+    no_incremental: bool = typer.Option(False, "--no-incremental", help="Force regenerate all files"),
+    no_llm_cache: bool = typer.Option(False, "--no-llm-cache", help="Always call the LLM, ignoring cached responses"),
+    no_parse_cache: bool = typer.Option(False, "--no-parse-cache", help="Re-parse every file instead of reusing cached parser output"),
+    state_db: bool = typer.Option(False, "--state-db", help="Record file states in .opendox/state.duckdb (needs duckdb)"),
+):
+    """Regenerate documentation pages as source files change."""
+    from opendox.core.pipeline import DocumentationPipeline
+    from opendox.core.watcher import run_watch
+    
+    pipeline = DocumentationPipeline(
+        model=model,
+        backend=_create_backend(backend, llm_url, llm_timeout),
+        llm_concurrency=llm_concurrency,
+        llm_cache=not no_llm_cache,
+        batch_size=batch_size,
+        state_db=state_db,
+        parse_cache=not no_parse_cache,
+    )
+    try:
+        run_watch(pipeline, path, output, debounce=debounce, poll=poll, interval=interval, max_files=max_files,
+                  incremental=not no_incremental)
+    except KeyboardInterrupt:
+        console.print("[dim]Stopped watching[/dim]")
+
 @app.command()
 def serve(
     port: int = typer.Option(8000, "--port", "-p"),
     host: str = typer.Option("localhost", "--host"),
+    output: Path = typer.Option(Path("./docs"), "--output", "-o", help="Output directory passed to generate"),
+    no_reload: bool = typer.Option(False, "--no-reload", help="Don't reload open pages when they are rewritten"),
+    poll: bool = typer.Option(False, "--poll", help="Poll for rewritten pages instead of using file system events"),
 ):
     """Serve documentation locally."""
-    console.print(f"[bold magenta]Starting server at http://{host}:{port}[/bold magenta]")
+    from opendox.core.docs_server import DocsServer
+    
+    docs_dir = output / "docs" if (output / "docs").is_dir() else output
+    if not docs_dir.is_dir():
+        console.print(f"[red]No documentation found in {output}; run 'opendox generate' first[/red]")
+        raise typer.Exit(1)
+    
+    server = DocsServer(docs_dir, host, port, live_reload=not no_reload, poll=poll)
+    console.print(f"[bold magenta]Starting server at http://{host}:{server.server_port}[/bold magenta]")
     console.print("[dim]Press Ctrl+C to stop[/dim]")
-    # TODO: Implement MkDocs server
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
 
 @app.command()
 def status():
@@ -1,35 +1,132 @@
 # src/opendox/core/cache.py
 import json
 import hashlib
+import os
+import sqlite3
+import threading
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Set, Tuple
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+HASH_CHUNK_SIZE = 1024 * 1024
 
 class DocumentationCache:
-    def __init__(self, project_root: Path, output_dir: Path = None):
+    """Remember which files have been documented, and from what content.
+
+    Each entry stores the content hash together with the file's stat
+    signature (size, mtime_ns, inode). A file whose signature is unchanged is
+    considered fresh without being read; only files whose stat changed are
+    hashed.
+
+    State lives in a SQLite database in WAL mode. Changes are kept in memory
+    and written in one transaction every ``flush_every`` updates and on
+    `save`, so a crash loses at most the last unflushed batch and never
+    leaves a half-written cache behind.
+    """
+    
+    def __init__(self, project_root: Path, output_dir: Path = None, flush_every: int = 256):
         self.cache_dir = project_root / '.opendox'
-        self.cache_file = self.cache_dir / 'cache.json'
+        self.db_file = self.cache_dir / 'cache.sqlite'
         self.cache_dir.mkdir(exist_ok=True)
-        self.cache = self._load_cache()
         self.output_dir = output_dir
+        self.flush_every = flush_every
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                ino INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS symbols (
+                path TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                doc TEXT NOT NULL,
+                PRIMARY KEY (path, fingerprint)
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+        self._migrate_json()
+        self.cache = self._load_cache()
+        self.meta = dict(self.conn.execute("SELECT key, value FROM meta"))
+        self._pending: Dict[str, Tuple[str, Tuple[int, int, int]]] = {}  # Hashes from needs_update for update
+        self._dirty_files: Set[str] = set()
+        self._dirty_symbols: Dict[str, Dict[str, str]] = {}  # Replaced symbol docs not yet written
+        self._dirty_meta: Set[str] = set()
     
     def _load_cache(self) -> Dict:
-        if self.cache_file.exists():
+        return {
+            path: {'hash': hash_, 'stat': [size, mtime_ns, ino]}
+            for path, hash_, size, mtime_ns, ino in self.conn.execute("SELECT * FROM files")
+        }
+    
+    def _load_json(self, path: Path) -> Dict:
+        if path.exists():
             try:
-                return json.loads(self.cache_file.read_text())
+                return json.loads(path.read_text(encoding='utf-8'))
             except (json.JSONDecodeError, IOError):
                 return {}
         return {}
     
+    def _migrate_json(self):
+        """Import the JSON files written by earlier versions, then remove them."""
+        legacy = [self.cache_dir / name for name in ('cache.json', 'symbols.json', 'meta.json')]
+        if not any(path.exists() for path in legacy):
+            return
+        files, symbols, meta = (self._load_json(path) for path in legacy)
+        with self.conn:
+            for path, entry in files.items():
+                if isinstance(entry, dict):
+                    self.conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                                      (path, entry['hash'], *entry['stat']))
+                else:
+                    # Plain MD5 from before stat signatures; stale on first check
+                    self.conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, 0, 0, 0)", (path, entry))
+            self.conn.executemany("INSERT OR REPLACE INTO symbols VALUES (?, ?, ?)", [
+                (path, fingerprint, doc)
+                for path, docs in symbols.items()
+                for fingerprint, doc in docs.items()
+            ])
+            self.conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", meta.items())
+        for path in legacy:
+            path.unlink(missing_ok=True)
+    
     def get_file_hash(self, file_path: Path) -> str:
-        """Generate hash of file content."""
+        """Generate hash of file content, reading it in chunks."""
+        hasher = xxhash.xxh3_128() if XXHASH_AVAILABLE else hashlib.blake2b(digest_size=16)
         try:
-            content = file_path.read_bytes()
-            return hashlib.md5(content).hexdigest()
+            with open(file_path, 'rb') as f:
+                while chunk := f.read(HASH_CHUNK_SIZE):
+                    hasher.update(chunk)
         except (IOError, OSError):
             return ""
+        return hasher.hexdigest()
+    
+    @staticmethod
+    def _stat_signature(file_path: Path) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        return (st.st_size, st.st_mtime_ns, st.st_ino)
     
-    def needs_update(self, file_path: Path) -> bool:
-        """Check if file has changed since last generation or if output doesn't exist."""
+    def needs_update(self, file_path: Path, content_hash: Optional[str] = None) -> bool:
+        """Check if file has changed since last generation or if output doesn't exist.
+        
+        ``content_hash`` overrides hashing the file, e.g. with its git blob SHA.
+        """
         # Always regenerate if output directory doesn't exist
         if self.output_dir and not self.output_dir.exists():
             return True
@@ -41,28 +138,142 @@ class DocumentationCache:
                 return True
         
         # Check if source file has changed
+        key = str(file_path)
+        entry = self.cache.get(key)
+        if content_hash is not None:
+            return entry is None or entry['hash'] != content_hash
+        
+        signature = self._stat_signature(file_path)
+        if signature is None:
+            return True
+        if entry is not None and tuple(entry['stat']) == signature:
+            return False
+        
+        # Stat changed: hash it, and keep the hash for update()
         current_hash = self.get_file_hash(file_path)
-        cached_hash = self.cache.get(str(file_path))
-        return current_hash != cached_hash
+        self._pending[key] = (current_hash, signature)
+        if entry is not None and entry['hash'] == current_hash:
+            # Touched but not edited
+            with self._lock:
+                entry['stat'] = list(signature)
+                self._dirty_files.add(key)
+            return False
+        return True
     
-    def update(self, file_path: Path):
-        """Mark file as processed."""
-        self.cache[str(file_path)] = self.get_file_hash(file_path)
-        self.save()
+    def update(self, file_path: Path, content_hash: Optional[str] = None):
+        """Mark file as processed.
+        
+        Reuses the hash computed by `needs_update`, so the file is not read
+        again. The stat signature is the one seen at that point, so an edit
+        made while the file was being processed is picked up by the next run.
+        """
+        key = str(file_path)
+        pending = self._pending.pop(key, None)
+        if pending is not None:
+            current_hash, signature = pending
+        else:
+            signature = self._stat_signature(file_path)
+            current_hash = content_hash or self.get_file_hash(file_path)
+        with self._lock:
+            self.cache[key] = {
+                'hash': content_hash or current_hash,
+                'stat': list(signature or (0, 0, 0)),
+            }
+            self._dirty_files.add(key)
+            if len(self._dirty_files) >= self.flush_every:
+                self.save()
+    
+    def known_hash(self, file_path: Path) -> Optional[str]:
+        """The file's content hash if one was computed this run or recorded, without reading it."""
+        key = str(file_path)
+        pending = self._pending.get(key)
+        if pending is not None:
+            return pending[0]
+        entry = self.cache.get(key)
+        return entry['hash'] if entry else None
+    
+    def get_symbol_doc(self, file_path: Path, fingerprint: str) -> Optional[str]:
+        """Return the stored doc for a symbol whose source span is unchanged."""
+        key = str(file_path)
+        with self._lock:
+            if key in self._dirty_symbols:
+                return self._dirty_symbols[key].get(fingerprint)
+            row = self.conn.execute("SELECT doc FROM symbols WHERE path = ? AND fingerprint = ?",
+                                    (key, fingerprint)).fetchone()
+        return row[0] if row else None
+    
+    def update_symbols(self, file_path: Path, docs: Dict[str, str]):
+        """Replace the stored symbol docs for a file (fingerprint -> doc).
+        
+        Written to disk with the next flush or `save`.
+        """
+        with self._lock:
+            self._dirty_symbols[str(file_path)] = dict(docs)
+    
+    def get_meta(self, key: str) -> Optional[str]:
+        """Return a run-level value stored with the cache."""
+        return self.meta.get(key)
+    
+    def set_meta(self, key: str, value: Optional[str]):
+        """Store a run-level value; written with the next `save`."""
+        with self._lock:
+            self.meta[key] = value
+            self._dirty_meta.add(key)
     
     def save(self):
-        """Save cache to disk."""
-        try:
-            self.cache_file.write_text(json.dumps(self.cache, indent=2))
-        except (IOError, OSError):
-            pass  # Fail silently if cache can't be saved
+        """Write pending changes to disk in a single transaction."""
+        with self._lock:
+            if not (self._dirty_files or self._dirty_symbols or self._dirty_meta):
+                return
+            try:
+                with self.conn:
+                    self.conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", [
+                        (key, self.cache[key]['hash'], *self.cache[key]['stat'])
+                        for key in self._dirty_files if key in self.cache
+                    ])
+                    self.conn.executemany("DELETE FROM symbols WHERE path = ?",
+                                          [(key,) for key in self._dirty_symbols])
+                    self.conn.executemany("INSERT INTO symbols VALUES (?, ?, ?)", [
+                        (key, fingerprint, doc)
+                        for key, docs in self._dirty_symbols.items()
+                        for fingerprint, doc in docs.items()
+                    ])
+                    self.conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                                          [(key, self.meta[key]) for key in self._dirty_meta])
+            except sqlite3.Error:
+                return  # Fail silently if cache can't be saved; changes stay pending
+            self._dirty_files.clear()
+            self._dirty_symbols.clear()
+            self._dirty_meta.clear()
     
     def clear(self):
         """Clear all cache entries."""
-        self.cache = {}
-        self.save()
+        with self._lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM files")
+                self.conn.execute("DELETE FROM symbols")
+                self.conn.execute("DELETE FROM meta")
+            self.cache = {}
+            self.meta = {}
+            self._pending.clear()
+            self._dirty_files.clear()
+            self._dirty_symbols.clear()
+            self._dirty_meta.clear()
     
     def remove_entry(self, file_path: Path):
         """Remove a specific file from cache."""
-        self.cache.pop(str(file_path), None)
-        self.save()
\ No newline at end of file
+        key = str(file_path)
+        with self._lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM files WHERE path = ?", (key,))
+                self.conn.execute("DELETE FROM symbols WHERE path = ?", (key,))
+            self.cache.pop(key, None)
+            self._pending.pop(key, None)
+            self._dirty_files.discard(key)
+            self._dirty_symbols.pop(key, None)
+    
+    def close(self):
+        """Flush pending changes and close the database."""
+        self.save()
+        with self._lock:
+            self.conn.close()
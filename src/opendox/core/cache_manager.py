@@ -1,6 +1,10 @@
 """Redis cache manager for documentation."""
 import hashlib
-from typing import Optional
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+from rich.console import Console
 
 try:
     import redis
@@ -9,39 +13,128 @@ except ImportError:
     REDIS_AVAILABLE = False
     redis = None
 
+console = Console()
+
 class DocumentationCache:
-    """Cache documentation with Redis."""
-    
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
+    """Cache documentation in two tiers: a bounded in-process LRU in front of Redis.
+
+    Lookups hit the in-process tier first and fetch the remaining keys with a
+    single MGET; writes for a whole module go out as one pipelined batch of
+    SET ... EX commands. Redis connections come from a shared pool. If Redis is
+    unreachable the in-process tier keeps working and the failure is
+    reported and counted in `stats`.
+    """
+
+    def __init__(self, redis_url: str = "redis://localhost:6379", max_memory_entries: int = 4096,
+                 max_connections: int = 16, socket_timeout: float = 1.0):
         self.enabled = False
-        self.memory_cache = {}
-        
+        self.memory_cache: "OrderedDict[str, str]" = OrderedDict()
+        self.max_memory_entries = max_memory_entries
+        self.metrics = {
+            'memory': {'hits': 0, 'misses': 0, 'evictions': 0},
+            'redis': {'hits': 0, 'misses': 0, 'errors': 0},
+        }
+        self._lock = threading.Lock()
+        self._redis_healthy = True
+
         if REDIS_AVAILABLE:
+            self.pool = redis.ConnectionPool.from_url(
+                redis_url,
+                max_connections=max_connections,
+                socket_timeout=socket_timeout,
+                socket_connect_timeout=socket_timeout,
+                decode_responses=True,
+            )
+            self.redis_client = redis.Redis(connection_pool=self.pool)
             try:
-                self.redis_client = redis.from_url(redis_url)
                 self.redis_client.ping()
                 self.enabled = True
-            except:
-                pass
-    
+            except redis.RedisError as e:
+                self._redis_failed(e)
+
+    @staticmethod
+    def hash_code(code: str) -> str:
+        """Cache key for a code snippet."""
+        return hashlib.md5(code.encode()).hexdigest()
+
     def get_cached_doc(self, code_hash: str) -> Optional[str]:
         """Get cached documentation for code snippet."""
-        if self.enabled:
+        return self.get_cached_docs([code_hash])[code_hash]
+
+    def get_cached_docs(self, code_hashes: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Look up many snippets at once, e.g. every symbol of a module.
+
+        Keys missing from the in-process tier are fetched from Redis in one
+        MGET and promoted into the in-process tier.
+        """
+        found: Dict[str, Optional[str]] = {}
+        missing = []
+        with self._lock:
+            for code_hash in code_hashes:
+                doc = self.memory_cache.get(code_hash)
+                if doc is None:
+                    self.metrics['memory']['misses'] += 1
+                    missing.append(code_hash)
+                else:
+                    self.metrics['memory']['hits'] += 1
+                    self.memory_cache.move_to_end(code_hash)
+                found[code_hash] = doc
+
+        if missing and self.enabled:
             try:
-                doc = self.redis_client.get(f"doc:{code_hash}")
-                return doc.decode() if doc else None
-            except:
-                pass
-        return self.memory_cache.get(code_hash)
-    
+                docs = self.redis_client.mget([f"doc:{code_hash}" for code_hash in missing])
+                self._redis_healthy = True
+            except redis.RedisError as e:
+                self._redis_failed(e)
+                return found
+            with self._lock:
+                for code_hash, doc in zip(missing, docs):
+                    if doc is None:
+                        self.metrics['redis']['misses'] += 1
+                        continue
+                    self.metrics['redis']['hits'] += 1
+                    found[code_hash] = doc
+                    self._remember(code_hash, doc)
+        return found
+
     def cache_doc(self, code: str, documentation: str, ttl: int = 86400):
         """Cache generated documentation."""
-        code_hash = hashlib.md5(code.encode()).hexdigest()
-        
-        if self.enabled:
+        self.cache_docs({self.hash_code(code): documentation}, ttl)
+
+    def cache_docs(self, docs: Dict[str, str], ttl: int = 86400):
+        """Cache several docs (code hash -> doc) with one pipelined round trip."""
+        with self._lock:
+            for code_hash, documentation in docs.items():
+                self._remember(code_hash, documentation)
+
+        if docs and self.enabled:
             try:
-                self.redis_client.setex(f"doc:{code_hash}", ttl, documentation)
-            except:
-                self.memory_cache[code_hash] = documentation
-        else:
-            self.memory_cache[code_hash] = documentation
\ No newline at end of file
+                pipe = self.redis_client.pipeline(transaction=False)
+                for code_hash, documentation in docs.items():
+                    pipe.set(f"doc:{code_hash}", documentation, ex=ttl)
+                pipe.execute()
+                self._redis_healthy = True
+            except redis.RedisError as e:
+                self._redis_failed(e)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit/miss counters per tier."""
+        with self._lock:
+            stats = {tier: dict(counts) for tier, counts in self.metrics.items()}
+            stats['memory']['entries'] = len(self.memory_cache)
+        return stats
+
+    def _remember(self, code_hash: str, documentation: str):
+        """Insert into the in-process tier, evicting the least recently used entry."""
+        self.memory_cache[code_hash] = documentation
+        self.memory_cache.move_to_end(code_hash)
+        while len(self.memory_cache) > self.max_memory_entries:
+            self.memory_cache.popitem(last=False)
+            self.metrics['memory']['evictions'] += 1
+
+    def _redis_failed(self, error: Exception):
+        """Count a Redis failure and report it once per outage."""
+        self.metrics['redis']['errors'] += 1
+        if self._redis_healthy:
+            self._redis_healthy = False
+            console.print(f"[yellow]Warning: Redis cache unavailable, using in-process cache only: {error}[/yellow]")
@@ -0,0 +1,291 @@
+"""Serve generated documentation with cached rendering and live reload."""
+import hashlib
+import html
+import mimetypes
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from opendox.core.watcher import create_watcher
+
+try:
+    from markdown_it import MarkdownIt
+    MARKDOWN_AVAILABLE = True
+except ImportError:
+    MARKDOWN_AVAILABLE = False
+    MarkdownIt = None
+
+LIVERELOAD_PATH = '/__livereload'
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: system-ui, sans-serif; max-width: 60rem; margin: 2rem auto; padding: 0 1rem; line-height: 1.5; }}
+pre {{ background: #f5f5f5; padding: 0.75rem; overflow-x: auto; }}
+code {{ background: #f5f5f5; }}
+table {{ border-collapse: collapse; }}
+th, td {{ border: 1px solid #ddd; padding: 0.25rem 0.5rem; }}
+</style>
+</head>
+<body>
+{body}
+{reload}
+</body>
+</html>
+"""
+
+RELOAD_SCRIPT = """<script>
+new EventSource("%s").onmessage = function () { location.reload(); };
+</script>""" % LIVERELOAD_PATH
+
+
+class RenderCache:
+    """Rendered pages keyed by file content hash.
+
+    A request first compares the file's stat signature with the cached one,
+    so unchanged pages are served without reading the file. When the
+    signature changed the file is hashed and only re-rendered if its content
+    did. Concurrent requests for the same stale page render it once. At
+    most ``max_entries`` pages are kept, least recently served first out,
+    and pages that disappear are dropped.
+    """
+
+    def __init__(self, live_reload: bool = True, max_entries: int = 1024):
+        self.live_reload = live_reload
+        self.max_entries = max_entries
+        self.renders = 0
+        # path -> (stat, etag, body)
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int], str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._path_locks: Dict[str, threading.Lock] = {}
+        self._markdown = MarkdownIt('commonmark').enable('table') if MARKDOWN_AVAILABLE else None
+
+    def get(self, path: Path) -> Tuple[str, bytes]:
+        """Return (etag, body) for a file; markdown is rendered to HTML."""
+        key = str(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._forget(key)
+            raise
+        signature = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                return entry[1], entry[2]
+            path_lock = self._path_locks.setdefault(key, threading.Lock())
+
+        with path_lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                return entry[1], entry[2]  # Rendered while we waited
+            try:
+                data = path.read_bytes()
+            except OSError:
+                self._forget(key)
+                raise
+            etag = '"%s"' % hashlib.blake2b(data, digest_size=16).hexdigest()
+            if entry is not None and entry[1] == etag:
+                body = entry[2]  # Touched, not changed
+            elif path.suffix == '.md':
+                body = self.render(data.decode('utf-8', errors='replace'), path.stem)
+                self.renders += 1
+            else:
+                body = data
+            with self._lock:
+                self._entries[key] = (signature, etag, body)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._path_locks.pop(evicted, None)
+            return etag, body
+
+    def _forget(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._path_locks.pop(key, None)
+
+    def render(self, text: str, title: str) -> bytes:
+        if self._markdown is not None:
+            body = self._markdown.render(text)
+        else:
+            body = f"<pre>{html.escape(text)}</pre>"
+        reload = RELOAD_SCRIPT if self.live_reload else ''
+        return PAGE_TEMPLATE.format(title=html.escape(title), body=body, reload=reload).encode('utf-8')
+
+
+class ReloadHub:
+    """Wake live-reload clients when a page is rewritten.
+
+    ``last_path`` is the rewritten file relative to ``root``, so the
+    server's filesystem layout is not sent to clients.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = root
+        self.version = 0
+        self.last_path = ''
+        self.closed = False
+        self._cond = threading.Condition()
+
+    def notify(self, path: Path):
+        with self._cond:
+            self.version += 1
+            self.last_path = self._relative(path)
+            self._cond.notify_all()
+
+    def _relative(self, path: Path) -> str:
+        if self.root is None:
+            return ''
+        try:
+            return Path(path).resolve().relative_to(self.root).as_posix()
+        except ValueError:
+            return ''
+
+    def wait(self, version: int, timeout: float) -> Optional[int]:
+        """Wait for a version newer than ``version``; None on timeout or close."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.version > version or self.closed, timeout)
+            if self.closed or self.version <= version:
+                return None
+            return self.version
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class DocsRequestHandler(BaseHTTPRequestHandler):
+    """Serve files below the server's docs directory."""
+
+    protocol_version = 'HTTP/1.1'  # Keep-alive for page assets
+    server: "DocsServer"
+
+    def do_GET(self):
+        request_path = unquote(urlsplit(self.path).path)
+        if request_path == LIVERELOAD_PATH and self.server.hub is not None:
+            return self._stream_reloads()
+        path = self.server.resolve(request_path)
+        if path is None:
+            return self._send(404, b'Not found', 'text/plain; charset=utf-8')
+        try:
+            etag, body = self.server.cache.get(path)
+        except OSError:
+            return self._send(404, b'Not found', 'text/plain; charset=utf-8')
+        if self._not_modified(etag):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if path.suffix == '.md':
+            content_type = 'text/html; charset=utf-8'
+        else:
+            content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+        self._send(200, body, content_type, etag)
+
+    def _not_modified(self, etag: str) -> bool:
+        """Whether If-None-Match lists ``etag`` (weak or strong) or is ``*``."""
+        tags = [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]
+        return '*' in tags or etag in tags or f"W/{etag}" in tags
+
+    def _send(self, status: int, body: bytes, content_type: str, etag: Optional[str] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')  # Revalidate, then 304
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream_reloads(self):
+        hub = self.server.hub
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        version = hub.version
+        try:
+            self.wfile.write(b': connected\n\n')
+            self.wfile.flush()
+            while not hub.closed:
+                latest = hub.wait(version, timeout=15)
+                if latest is None:
+                    self.wfile.write(b': ping\n\n')  # Detects clients that went away
+                else:
+                    # A rewrite fires several file events; let them settle into one reload
+                    time.sleep(0.1)
+                    version = max(latest, hub.version)
+                    self.wfile.write(f"data: {hub.last_path}\n\n".encode('utf-8'))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass  # Keep the console for the CLI's own output
+
+
+class DocsServer(ThreadingHTTPServer):
+    """HTTP server for a generated ``docs/`` tree.
+
+    Markdown pages are rendered on request through a shared `RenderCache`
+    and revalidated with ETags. With ``live_reload`` the docs tree is
+    watched and open pages reload when the pipeline rewrites a file.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, docs_dir: Path, host: str = 'localhost', port: int = 8000, live_reload: bool = True,
+                 poll: bool = False):
+        self.docs_dir = Path(docs_dir).resolve()
+        self.cache = RenderCache(live_reload)
+        self.hub = ReloadHub(self.docs_dir) if live_reload else None
+        self.watcher = None
+        if live_reload:
+            self.watcher = create_watcher(self.docs_dir, self.hub.notify, poll=poll, interval=0.5,
+                                          extensions={'.md', '.css', '.js', '.yml'})
+        super().__init__((host, port), DocsRequestHandler)
+
+    def resolve(self, request_path: str) -> Optional[Path]:
+        """Map a URL path to a file in the docs tree, or None."""
+        relative = request_path.lstrip('/')
+        candidates = [relative]
+        if not relative or relative.endswith('/'):
+            candidates = [relative + 'index.md', relative.rstrip('/') + '.md']
+        elif relative.endswith('.html'):
+            candidates = [relative[:-5] + '.md', relative]
+        elif '.' not in Path(relative).name:
+            candidates = [relative + '.md', relative + '/index.md']
+        for candidate in candidates:
+            path = (self.docs_dir / candidate).resolve()
+            if path.is_file() and path.is_relative_to(self.docs_dir):
+                return path
+        return None
+
+    def serve_forever(self, poll_interval: float = 0.5):
+        if self.watcher:
+            self.watcher.start()
+        try:
+            super().serve_forever(poll_interval)
+        finally:
+            if self.watcher:
+                self.watcher.stop()
+                self.watcher = None
+
+    def server_close(self):
+        if self.hub:
+            self.hub.close()
+        super().server_close()
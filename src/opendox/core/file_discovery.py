@@ -1,6 +1,7 @@
 """Discover and filter source files in a repository."""
+import os
 from pathlib import Path
-from typing import List, Set
+from typing import Iterable, Iterator, List, Optional, Set
 
 class FileDiscovery:
     """Find relevant source files for documentation."""
@@ -23,15 +24,69 @@ class FileDiscovery:
     
     def discover_files(self, root_path: Path, max_files: int = 1000) -> List[Path]:
         """Find all source files in the repository."""
-        files = []
-        for path in root_path.rglob('*'):
-            if len(files) >= max_files:
-                break
-            if path.is_file() and path.suffix in self.extensions:
-                # Check if path contains ignored directories
-                if not any(ignored in path.parts for ignored in self.ignore):
-                    files.append(path)
-        return files
+        return list(self.iter_files(root_path, max_files=max_files))
+    
+    def iter_files(self, root_path: Path, max_files: Optional[int] = None,
+                   extensions: Set[str] = None) -> Iterator[Path]:
+        """Lazily yield source files, stopping after ``max_files`` matches.
+        
+        Walks the tree with ``os.scandir``: ignored directories are pruned
+        before descending, the extension is checked on the entry name before
+        any stat call, and file/directory checks reuse the type information
+        returned with each directory entry. Symlinked directories are not
+        followed. A ``max_files`` of None or 0 walks the whole tree.
+        """
+        extensions = extensions or self.extensions
+        ignore = self.ignore
+        found = 0
+        stack = [os.fspath(root_path)]
+        while stack:
+            directory = stack.pop()
+            subdirs = []
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if name not in ignore:
+                                    subdirs.append(entry.path)
+                                continue
+                            if os.path.splitext(name)[1] not in extensions or not entry.is_file():
+                                continue
+                        except OSError:
+                            continue
+                        found += 1
+                        yield Path(entry.path)
+                        if max_files and found >= max_files:
+                            return
+            except OSError:
+                continue  # Unreadable or vanished directory
+            # Depth-first, visiting subdirectories in listing order
+            stack.extend(reversed(subdirs))
+    
+    def filter_paths(self, root_path: Path, paths: Iterable[Path], max_files: Optional[int] = None,
+                     extensions: Set[str] = None) -> Iterator[Path]:
+        """Apply the same extension and ignore rules as `iter_files` to known paths.
+        
+        Used when the candidate files come from elsewhere (e.g. a git change
+        set) instead of a directory walk. Paths that no longer exist are dropped.
+        """
+        extensions = extensions or self.extensions
+        found = 0
+        for path in paths:
+            if path.suffix not in extensions:
+                continue
+            try:
+                parts = path.relative_to(root_path).parts[:-1]
+            except ValueError:
+                continue
+            if any(part in self.ignore for part in parts) or not path.is_file():
+                continue
+            found += 1
+            yield path
+            if max_files and found >= max_files:
+                return
     
     def filter_python_files(self, files: List[Path]) -> List[Path]:
         """Get only Python files from the list."""
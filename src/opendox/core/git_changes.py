@@ -0,0 +1,109 @@
+"""Change detection for git checkouts."""
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+try:
+    import git
+    GIT_AVAILABLE = True
+except ImportError:
+    GIT_AVAILABLE = False
+    git = None
+
+
+class GitChangeDetector:
+    """Compute the set of changed files from git instead of hashing the tree.
+
+    All paths are relative to ``project_root``, which may be a subdirectory
+    of the repository. Changes are the union of commits since the last
+    documented commit, staged and unstaged edits, and untracked files that
+    are not ignored.
+    """
+
+    def __init__(self, project_root: Path):
+        self.project_root = Path(project_root)
+        self.git = git.Git(str(self.project_root))
+
+    @classmethod
+    def open(cls, project_root: Path) -> Optional["GitChangeDetector"]:
+        """Return a detector if ``project_root`` is inside a git checkout with commits."""
+        if not GIT_AVAILABLE:
+            return None
+        try:
+            detector = cls(project_root)
+            if detector.head_commit() is None:
+                return None
+            return detector
+        except Exception:
+            return None
+
+    def head_commit(self) -> Optional[str]:
+        """SHA of the current HEAD commit, or None if there is none."""
+        try:
+            return self.git.rev_parse('--verify', '--quiet', 'HEAD^{commit}') or None
+        except git.GitCommandError:
+            return None
+
+    def has_commit(self, sha: str) -> bool:
+        """Check that ``sha`` names a commit in this repository."""
+        try:
+            self.git.cat_file('-e', f'{sha}^{{commit}}')
+            return True
+        except git.GitCommandError:
+            return False
+
+    def changed_files(self, since: str) -> Optional[Set[Path]]:
+        """Files changed since commit ``since``, including working-tree edits.
+
+        Returns None when ``since`` is unknown (e.g. after a rebase dropped
+        it), in which case the caller should fall back to a full scan.
+        Deleted files are included; callers should check existence.
+        """
+        committed = self.committed_changes(since)
+        if committed is None:
+            return None
+        return committed | self.dirty_files()
+
+    def committed_changes(self, since: str) -> Optional[Set[Path]]:
+        """Files changed by the commits between ``since`` and HEAD; None if ``since`` is unknown."""
+        if not since or not self.has_commit(since):
+            return None
+        names = self._split(self.git.diff('--name-only', '--relative', '-z', since, 'HEAD'))
+        return {self.project_root / name for name in names}
+
+    def dirty_files(self) -> Set[Path]:
+        """Files whose working-tree content differs from HEAD, plus untracked files."""
+        names = self._split(self.git.diff('--name-only', '--relative', '-z', 'HEAD'))
+        names += self._split(self.git.ls_files('--others', '--exclude-standard', '-z'))
+        return {self.project_root / name for name in names}
+
+    def blob_hashes(self, paths: Iterable[Path], chunk_size: int = 500) -> Dict[Path, str]:
+        """Git blob SHAs of the current working-tree content of ``paths``."""
+        paths = [p for p in paths if p.is_file()]
+        hashes: Dict[Path, str] = {}
+        for start in range(0, len(paths), chunk_size):
+            chunk = paths[start:start + chunk_size]
+            relative = [str(p.relative_to(self.project_root)) for p in chunk]
+            output = self.git.hash_object('--', *relative)
+            hashes.update(zip(chunk, output.split()))
+        return hashes
+
+    def tree_hashes(self) -> Dict[Path, str]:
+        """Blob SHAs for every file under the project, as currently on disk.
+
+        Tracked files take their SHA straight from the index; only files with
+        unstaged edits and untracked files are hashed.
+        """
+        hashes: Dict[Path, str] = {}
+        for entry in self._split(self.git.ls_files('--stage', '-z')):
+            info, name = entry.split('\t', 1)
+            mode, sha, _stage = info.split()
+            if mode != '160000':  # Submodule commits are not file content
+                hashes[self.project_root / name] = sha
+        dirty = self._split(self.git.diff('--name-only', '--relative', '-z'))
+        dirty += self._split(self.git.ls_files('--others', '--exclude-standard', '-z'))
+        hashes.update(self.blob_hashes(self.project_root / name for name in dirty))
+        return hashes
+
+    @staticmethod
+    def _split(output: str) -> List[str]:
+        return [name for name in output.split('\0') if name]
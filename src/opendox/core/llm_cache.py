@@ -0,0 +1,112 @@
+"""Persistent, content-addressed cache of LLM responses."""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class LLMResponseCache:
+    """On-disk LLM response cache keyed by hash(model, prompt, options).
+
+    Entries live in a SQLite database and are evicted least-recently-used
+    first once their total size exceeds ``max_bytes``. Safe to share between
+    the LLM worker threads.
+    """
+
+    def __init__(self, cache_path: Path, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_path = Path(cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.cache_path), check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        row = self.conn.execute("SELECT COALESCE(SUM(size), 0), COALESCE(MAX(last_used), 0) FROM responses").fetchone()
+        self.total_bytes, self._last_tick = row
+
+    @staticmethod
+    def make_key(model: str, prompt: str, options: Dict[str, Any]) -> str:
+        """Build the cache key for a generation request."""
+        payload = json.dumps([model, prompt, options], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _tick(self) -> float:
+        """Strictly increasing access time, even on coarse system clocks."""
+        self._last_tick = max(time.time(), self._last_tick + 1e-6)
+        return self._last_tick
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for ``key`` and mark it recently used."""
+        with self._lock:
+            row = self.conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (self._tick(), key))
+            return row[0]
+
+    def put(self, key: str, response: str):
+        """Store a response, evicting old entries to stay under ``max_bytes``."""
+        size = len(response.encode('utf-8'))
+        with self._lock:
+            old = self.conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, response, size, self._tick()),
+            )
+            self.total_bytes += size - (old[0] if old else 0)
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least-recently-used entries until the cache fits its budget."""
+        # Walk the last_used index lazily; only the evicted rows are read
+        cursor = self.conn.execute("SELECT key, size FROM responses ORDER BY last_used")
+        doomed = []
+        for key, size in cursor:
+            if self.total_bytes <= self.max_bytes:
+                break
+            doomed.append((key,))
+            self.total_bytes -= size
+        cursor.close()
+        self.conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        self.evictions += len(doomed)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': entries,
+            'bytes': self.total_bytes,
+        }
+
+    def clear(self):
+        """Remove every cached response."""
+        with self._lock:
+            self.conn.execute("DELETE FROM responses")
+            self.total_bytes = 0
+
+    def close(self):
+        """Close the underlying database."""
+        with self._lock:
+            self.conn.close()
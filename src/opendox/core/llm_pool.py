@@ -0,0 +1,46 @@
+"""Bounded worker pool for concurrent LLM requests."""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class LLMWorkerPool:
+    """Run LLM calls on a fixed number of threads with a cap on in-flight requests.
+
+    ``submit`` blocks once ``max_in_flight`` requests are queued or running, so
+    callers that fan out over a whole repository never build an unbounded
+    backlog of pending prompts.
+    """
+
+    def __init__(self, max_in_flight: int = 4):
+        self.max_in_flight = max(1, max_in_flight)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_in_flight,
+            thread_name_prefix="opendox-llm",
+        )
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Schedule ``fn`` once a slot is free and return its future."""
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(self._release_slot)
+        return future
+
+    def _release_slot(self, _future: Future):
+        self._slots.release()
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work and optionally wait for running requests."""
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self) -> "LLMWorkerPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown(wait=exc_type is None)
+        return False
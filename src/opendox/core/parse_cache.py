@@ -0,0 +1,137 @@
+"""Persistent cache of parser output keyed by file content."""
+import hashlib
+import marshal
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from opendox.core.parse_pool import compact_result, expand_result
+from opendox.core.tracing import tracer
+from opendox.parsers.python_parser import PythonParser
+
+
+class ParseResultCache:
+    """Store parse results in SQLite, keyed by (parser, parser version, content hash).
+
+    Results are stored as ``marshal`` blobs: `PythonParser` output in the
+    compact tuple layout used by the parse workers, other parsers' plain
+    dict/list results as they are. Because keys depend only on content, a
+    file that moved or was reformatted back to known content is a hit too;
+    the ``file`` field is rewritten on the way out. Writes are committed in
+    batches of ``flush_every``. The marshal format may change between
+    Python versions, so keys include the interpreter version and blobs that
+    fail to load count as misses.
+    """
+
+    def __init__(self, cache_path: Path, flush_every: int = 256):
+        self.cache_path = Path(cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._writes: Dict[str, bytes] = {}  # Not yet committed, but already served
+        self.conn = sqlite3.connect(str(self.cache_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS parses (
+                key TEXT PRIMARY KEY,
+                data BLOB NOT NULL
+            )
+        """)
+
+    @staticmethod
+    def content_hash(file_path: Path) -> Optional[str]:
+        """Hash a file's bytes; None if it cannot be read."""
+        try:
+            return hashlib.blake2b(Path(file_path).read_bytes(), digest_size=16).hexdigest()
+        except OSError:
+            return None
+
+    @staticmethod
+    def make_key(parser: Any, content_hash: str) -> str:
+        """Cache key for ``parser``'s output on content with ``content_hash``."""
+        python = '%d.%d' % sys.version_info[:2]
+        return f"{type(parser).__name__}:{getattr(parser, 'VERSION', 0)}:py{python}:{content_hash}"
+
+    def get_compact(self, key: str) -> Optional[Any]:
+        """Return the decoded blob stored under ``key``; None if missing or unreadable."""
+        with self._lock:
+            blob = self._writes.get(key)
+            if blob is None:
+                row = self.conn.execute("SELECT data FROM parses WHERE key = ?", (key,)).fetchone()
+                blob = row[0] if row else None
+        try:
+            data = marshal.loads(blob) if blob is not None else None
+        except (ValueError, EOFError, TypeError):
+            data = None
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+
+    def put_compact(self, key: str, data: Any):
+        """Queue a marshal-able result for storage under ``key``."""
+        blob = marshal.dumps(data)
+        with self._lock:
+            self._writes[key] = blob
+            if len(self._writes) >= self.flush_every:
+                self._flush()
+
+    def lookup(self, parser: Any, file_path: Path) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Return (cache key, cached result) for a file; the key is None if it cannot be read."""
+        content_hash = self.content_hash(file_path)
+        if content_hash is None:
+            return None, None
+        key = self.make_key(parser, content_hash)
+        data = self.get_compact(key)
+        if data is None:
+            return key, None
+        with tracer.span('parse.cached', file=file_path):
+            return key, self.decode(parser, data, file_path)
+    
+    def parse(self, parser: Any, file_path: Path) -> Dict[str, Any]:
+        """``parser.parse_file(file_path)``, served from the cache when possible."""
+        key, result = self.lookup(parser, file_path)
+        if result is not None:
+            return result
+        result = parser.parse_file(file_path)
+        if key is not None and 'error' not in result:
+            self.put_compact(key, self.encode(parser, result))
+        return result
+
+    @staticmethod
+    def encode(parser: Any, result: Dict[str, Any]) -> Any:
+        if isinstance(parser, PythonParser):
+            return compact_result(result)
+        return result
+
+    @staticmethod
+    def decode(parser: Any, data: Any, file_path: Path) -> Dict[str, Any]:
+        if isinstance(parser, PythonParser):
+            result = expand_result(data)
+        else:
+            result = data
+        result['file'] = str(file_path)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters."""
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def _flush(self):
+        if self._writes:
+            with self.conn:
+                self.conn.executemany("INSERT OR REPLACE INTO parses (key, data) VALUES (?, ?)", self._writes.items())
+            self._writes = {}
+
+    def close(self):
+        """Write pending results and close the database."""
+        with self._lock:
+            self._flush()
+            self.conn.close()
@@ -0,0 +1,238 @@
+"""Parse stage that can fan source files out to worker processes."""
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from opendox.core.tracing import tracer
+from opendox.parsers.base import CodeElement
+from opendox.parsers.python_parser import PythonParser
+
+# Compact element layout shipped back from workers. Plain tuples of str/int/None
+# pickle far smaller and faster than CodeElement instances with metadata dicts.
+# (name, type, line_start, line_end, docstring, signature,
+#  args, returns, decorators, is_async, methods, bases, fingerprint,
+#  qualname, is_method)
+CompactElement = Tuple[Any, ...]
+# (module, name, alias, type); name is None for plain imports
+CompactImport = Tuple[Optional[str], Optional[str], Optional[str], str]
+# (file, error, functions, classes, total_lines, imports)
+CompactResult = Tuple[str, Optional[str], Tuple[CompactElement, ...], Tuple[CompactElement, ...], int,
+                      Tuple[CompactImport, ...]]
+# Per-file timing reported by a worker: (pid, start, duration)
+ParseTiming = Tuple[int, float, float]
+
+_worker_parser: Optional[PythonParser] = None
+
+
+def compact_element(element: CodeElement) -> CompactElement:
+    """Flatten a CodeElement into a picklable tuple."""
+    meta = element.metadata or {}
+    return (
+        element.name,
+        element.type,
+        element.line_start,
+        element.line_end,
+        element.docstring,
+        str(element.signature) if element.signature is not None else None,
+        tuple(meta.get('args', ())),
+        str(meta['returns']) if meta.get('returns') is not None else None,
+        tuple(meta.get('decorators', ())),
+        meta.get('is_async', False),
+        tuple(meta.get('methods', ())),
+        tuple(meta.get('bases', ())),
+        meta.get('fingerprint'),
+        meta.get('qualname', element.name),
+        meta.get('is_method', False),
+    )
+
+
+def expand_element(data: CompactElement) -> CodeElement:
+    """Rebuild a CodeElement from its compact tuple."""
+    (name, elem_type, line_start, line_end, docstring, signature,
+     args, returns, decorators, is_async, methods, bases, fingerprint,
+     qualname, is_method) = data
+    if elem_type == 'class':
+        metadata = {
+            'methods': list(methods),
+            'bases': list(bases),
+            'decorators': list(decorators),
+            'fingerprint': fingerprint,
+            'qualname': qualname,
+        }
+    else:
+        metadata = {
+            'args': list(args),
+            'returns': returns,
+            'decorators': list(decorators),
+            'is_async': is_async,
+            'fingerprint': fingerprint,
+            'qualname': qualname,
+            'is_method': is_method,
+        }
+    return CodeElement(
+        name=name,
+        type=elem_type,
+        line_start=line_start,
+        line_end=line_end,
+        docstring=docstring,
+        signature=signature,
+        metadata=metadata,
+    )
+
+
+def compact_result(result: Dict[str, Any]) -> CompactResult:
+    """Flatten a `PythonParser.parse_file` result for transfer between processes."""
+    if 'error' in result:
+        return (result.get('file', ''), result['error'], (), (), 0, ())
+    return (
+        result['file'],
+        None,
+        tuple(compact_element(e) for e in result.get('functions', [])),
+        tuple(compact_element(e) for e in result.get('classes', [])),
+        result.get('total_lines', 0),
+        tuple((i.get('module'), i.get('name'), i.get('alias'), i['type']) for i in result.get('imports', [])),
+    )
+
+
+def expand_result(data: CompactResult) -> Dict[str, Any]:
+    """Rebuild the `parse_file` result shape from a compact result."""
+    file, error, functions, classes, total_lines, imports = data
+    if error is not None:
+        return {'error': error, 'file': file}
+    return {
+        'file': file,
+        'language': 'python',
+        'functions': [expand_element(e) for e in functions],
+        'classes': [expand_element(e) for e in classes],
+        'imports': [expand_import(i) for i in imports],
+        'total_lines': total_lines,
+    }
+
+
+def expand_import(data: CompactImport) -> Dict[str, Any]:
+    """Rebuild an import entry as `PythonParser` reports it."""
+    module, name, alias, kind = data
+    if kind == 'import':
+        return {'module': module, 'alias': alias, 'type': kind}
+    return {'module': module, 'name': name, 'alias': alias, 'type': kind}
+
+
+def parse_chunk(paths: List[str]) -> List[Tuple[CompactResult, ParseTiming]]:
+    """Worker entry point: parse a chunk of files into compact results.
+    
+    Each result comes with its timing so the main process can trace work
+    done in the worker.
+    """
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = PythonParser()
+    pid = os.getpid()
+    results = []
+    for path in paths:
+        start = time.time()
+        try:
+            data = compact_result(_worker_parser.parse_file(Path(path)))
+        except Exception as e:
+            data = (path, str(e), (), (), 0, ())
+        results.append((data, (pid, start, time.time() - start)))
+    return results
+
+
+class ParseStage:
+    """Parse files either in-process or on a `ProcessPoolExecutor`.
+
+    Paths are pulled lazily from the input iterable and submitted in chunks,
+    with at most ``workers * max_pending_chunks`` chunks outstanding, so the
+    caller can start generating documentation for early files while later
+    ones are still being parsed. With a `ParseResultCache`, files whose
+    content was parsed before are answered from it and never reach a parser.
+    """
+
+    def __init__(self, parser: PythonParser = None, workers: int = 0,
+                 chunk_size: int = 32, max_pending_chunks: int = 2, cache=None):
+        self.parser = parser or PythonParser()
+        self.workers = workers
+        self.chunk_size = max(1, chunk_size)
+        self.max_pending_chunks = max(1, max_pending_chunks)
+        self.cache = cache  # Optional ParseResultCache
+
+    def _lookup(self, path: Path) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Return (cache key, cached result) for a path; both None without a cache."""
+        if self.cache is None:
+            return None, None
+        return self.cache.lookup(self.parser, path)
+
+    def _store(self, key: Optional[str], data: CompactResult):
+        if key is not None and data[1] is None:  # Errors are not cached
+            self.cache.put_compact(key, data)
+
+    def imap(self, paths: Iterable[Path]) -> Iterator[Tuple[Path, Dict[str, Any]]]:
+        """Yield ``(path, parse_result)`` pairs in input order."""
+        if self.workers <= 0:
+            for path in paths:
+                key, result = self._lookup(path)
+                if result is None:
+                    try:
+                        result = self.parser.parse_file(path)
+                    except Exception as e:
+                        result = {'error': str(e), 'file': str(path)}
+                    if key is not None:
+                        self._store(key, compact_result(result))
+                yield path, result
+            return
+
+        path_iter = iter(paths)
+        # Input-ordered entries [path, result]; a cache miss holds
+        # (key, future, index, chunk size) until its chunk is parsed
+        pending = deque()
+        max_chunks = self.workers * self.max_pending_chunks
+        max_lookahead = max_chunks * self.chunk_size
+        in_flight = 0
+        more = True
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            def submit_next() -> bool:
+                """Pull up to one chunk of paths, submitting the cache misses."""
+                nonlocal in_flight
+                misses = []
+                exhausted = True
+                for path in path_iter:
+                    key, result = self._lookup(path)
+                    entry = [path, result]
+                    pending.append(entry)
+                    if result is None:
+                        misses.append((entry, key))
+                    if len(pending) >= max_lookahead or len(misses) >= self.chunk_size:
+                        exhausted = False
+                        break
+                if misses:
+                    future = executor.submit(parse_chunk, [str(entry[0]) for entry, _ in misses])
+                    in_flight += 1
+                    for index, (entry, key) in enumerate(misses):
+                        entry[1] = (key, future, index, len(misses))
+                return not exhausted
+
+            while pending or more:
+                # Keep the workers fed before blocking on the oldest entry
+                while more and in_flight < max_chunks and len(pending) < max_lookahead:
+                    more = submit_next()
+                if not pending:
+                    continue
+                path, payload = pending.popleft()
+                if isinstance(payload, dict):
+                    yield path, payload
+                    continue
+                key, future, index, size = payload
+                if index == size - 1:
+                    in_flight -= 1
+                try:
+                    data, timing = future.result()[index]
+                except Exception as e:
+                    data, timing = (str(path), str(e), (), (), 0, ()), None
+                if timing is not None:
+                    pid, start, duration = timing
+                    tracer.record('parse', start, duration, pid=pid, tid=pid, file=path)
+                self._store(key, data)
+                yield path, expand_result(data)
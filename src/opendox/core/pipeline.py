@@ -1,6 +1,9 @@
 """Main documentation generation pipeline."""
+import json
+import threading
+import time
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Any, Dict, Iterable, List, Optional
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn
 from rich.table import Table
@@ -10,20 +13,53 @@ from opendox.generators.llm_generator import LLMGenerator
 from opendox.formats.mkdocs_formatter import MkDocsFormatter
 from opendox.core.file_discovery import FileDiscovery
 from opendox.core.cache import DocumentationCache
+from opendox.core.git_changes import GitChangeDetector
+from opendox.core.llm_cache import LLMResponseCache
+from opendox.core.llm_pool import LLMWorkerPool
+from opendox.core.parse_cache import ParseResultCache
+from opendox.core.parse_pool import ParseStage
+from opendox.core.streaming import StageRunner
+from opendox.core.tracing import tracer
 
 console = Console()
 
+STATE_BATCH_SIZE = 500  # File states buffered before a bulk upsert
+
 class DocumentationPipeline:
     """Orchestrate the documentation generation process."""
     
-    def __init__(self, model: str = "deepseek-coder:1.3b"):
+    def __init__(self, model: str = "deepseek-coder:1.3b", llm_concurrency: int = 4, parse_workers: int = 0,
+                 queue_depth: int = 64, llm_cache: bool = True, batch_size: int = 1,
+                 batch_token_budget: int = 2048, generator=None, trace: bool = False, use_git: bool = True,
+                 state_db: bool = False, parse_cache: bool = True, backend=None,
+                 stream: bool = True):
         self.discovery = FileDiscovery()
         self.parser = PythonParser()
-        self.generator = LLMGenerator(model=model)
+        self.parse_stage = ParseStage(self.parser, workers=parse_workers)
+        self.generator = generator or LLMGenerator(model=model, backend=backend, stream=stream)
+        self.llm_concurrency = llm_concurrency
+        self.queue_depth = queue_depth
+        self.batch_size = batch_size
+        self.batch_token_budget = batch_token_budget
+        self.trace = trace  # Keep individual spans for export_trace()
+        self.tracer = tracer
         self.cache = None  # Will be initialized per project
+        self.use_git = use_git  # Take the change set from git when possible
+        self.content_hashes = {}  # Git blob SHAs standing in for file hashes
+        self.dirty_files = set()  # Uncommitted files seen by the current git run
+        self.use_llm_cache = llm_cache
+        self.llm_cache = None  # Response cache, also per project
+        self.use_parse_cache = parse_cache  # Reuse parser output for known file contents
+        self.state_db = state_db  # Record file states in the DuckDB state database
+        self.state = None
+        self.session = None  # (source, output) while a watch session is open
+        self.formatter = None  # Shared by the runs of a session
+        self._state_rows = []
+        self._state_lock = threading.RLock()
         self.stats = {
             'modules_processed': 0,
             'functions_documented': 0,
+            'functions_reused': 0,  # Served from stored per-symbol docs
             'classes_documented': 0,
             'errors': [],
             'file_details': {}  # Track details for each file
@@ -35,17 +71,250 @@ class DocumentationPipeline:
         Args:
             source_path: Path to the source code
             output_path: Path for output documentation
-            max_files: Maximum number of files to process
+            max_files: Maximum number of files to process (0 for no limit)
             incremental: Use cache for incremental updates
         """
+        # Per-stage timings are always aggregated; full events only when tracing
+        self.tracer.start(keep_events=self.trace)
+        
+        # A watch session keeps the caches open across runs
+        in_session = self.session is not None
+        errors_before = len(self.stats['errors'])
+        try:
+            if not in_session:
+                self._open_project(source_path, output_path, incremental)
+            
+            # In a git checkout only files changed since the last documented
+            # commit are candidates, so unchanged files are never read or hashed
+            git_head = None
+            changed_files = None
+            self.content_hashes = {}
+            if self.cache and self.use_git:
+                detector = GitChangeDetector.open(source_path)
+                if detector:
+                    git_head = detector.head_commit()
+                    changed_files = self._git_change_set(detector, output_path)
+            
+            # Setup formatter
+            formatter = self.formatter or MkDocsFormatter(output_path)
+            project_name = self._project_name(source_path)
+                
+            console.print(f"[bold blue]Setting up documentation for:[/bold blue] {project_name}")
+            
+            # Stages run concurrently: discovery feeds parsing, parsing feeds LLM
+            # submission and finished modules are written as their docs arrive.
+            # Every hand-off is a bounded queue, so memory stays flat on big repos.
+            runner = StageRunner(self.queue_depth)
+            paths_q = runner.channel()
+            parsed_q = runner.channel()
+            pending_q = runner.channel()
+            summary_files = []  # First files seen, for the summary table
+            discovered = [0]  # Number of files found
+            truncated = []  # Set when max_files cut discovery short
+            
+            # Process files with progress bar
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+                console=console
+            ) as progress:
+                task = progress.add_task("Processing files...", total=None)
+                
+                def discover():
+                    if changed_files is not None:
+                        candidates = self.discovery.filter_paths(source_path, changed_files, max_files=max_files, extensions={'.py'})
+                    else:
+                        candidates = self.discovery.iter_files(source_path, max_files=max_files, extensions={'.py'})
+                    with self.tracer.span('discover', root=source_path):
+                        for file_path in candidates:
+                            if len(summary_files) < 20:
+                                summary_files.append(file_path)
+                            discovered[0] += 1
+                            if not runner.put(paths_q, file_path):
+                                return
+                    found = discovered[0]
+                    if max_files and found >= max_files:
+                        truncated.append(True)
+                    progress.update(task, total=found)
+                    kind = "changed Python files" if changed_files is not None else "Python files"
+                    console.print(f"[green]Found {found} {kind} to process[/green]")
+                
+                def files_to_parse():
+                    # Cached files are settled here; only the rest reach the parse stage
+                    for file_path in runner.iterate(paths_q):
+                        if self._needs_processing(file_path):
+                            yield file_path
+                        else:
+                            progress.update(task, advance=1)
+                
+                def parse():
+                    for file_path, result in self.parse_stage.imap(files_to_parse()):
+                        if not runner.put(parsed_q, (file_path, result)):
+                            return
+                
+                def submit(pool: LLMWorkerPool):
+                    for file_path, result in runner.iterate(parsed_q):
+                        job = self._prepare_parsed(file_path, result, pool, progress, task)
+                        if not runner.put(pending_q, (file_path, job)):
+                            return
+                
+                def write():
+                    # Collect results in file order so docs line up with their functions
+                    for file_path, job in runner.iterate(pending_q):
+                        if self._finish_file(file_path, job, formatter):
+                            self.stats['modules_processed'] += 1
+                        progress.update(task, advance=1)
+                
+                with LLMWorkerPool(self.llm_concurrency) as pool:
+                    runner.start('discover', discover, output=paths_q)
+                    runner.start('parse', parse, output=parsed_q)
+                    runner.start('generate', submit, pool, output=pending_q)
+                    runner.start('write', write)
+                    runner.join()
+            
+            # Finalize documentation
+            formatter.create_index(project_name, f"Automated documentation for {project_name}")
+            formatter.finalize()
+            
+            # Only a complete run may become the baseline for the next change set
+            if self.cache and git_head:
+                failed = {Path(error['file']) for error in self.stats['errors'][errors_before:]}
+                self._carry_over(source_path, failed, keep_previous=bool(truncated))
+                if not truncated:
+                    self.cache.set_meta('git_commit', git_head)
+        finally:
+            self.tracer.stop()
+        self.stats['stage_timings'] = self.tracer.stage_breakdown()
+        
+        if in_session:
+            self._save_project()
+        else:
+            self._close_project()
+        
+        # Display summary
+        self._display_summary(summary_files, discovered[0])
+        
+        return self.stats
+    
+    def open_session(self, source_path: Path, output_path: Path, incremental: bool = True):
+        """Keep caches, the LLM client and the formatter open across runs.
+        
+        Used by `opendox watch`: `generate` and `update_files` calls made
+        until `close_session` share them instead of reopening per run.
+        Without ``incremental`` no documentation cache is opened, so every
+        file is regenerated.
+        """
+        self._open_project(source_path, output_path, incremental=incremental)
+        self.formatter = MkDocsFormatter(output_path)
+        self.formatter.load_existing_pages()
+        self.session = (Path(source_path), Path(output_path))
+    
+    def close_session(self):
+        """Flush and close everything opened by `open_session`."""
+        if self.session is None:
+            return
+        self._close_project()
+        self.formatter = None
+        self.session = None
+    
+    def update_files(self, paths: Iterable[Path]) -> Dict[str, List[Path]]:
+        """Regenerate the pages of changed or deleted files in the open session.
+        
+        Unchanged files (e.g. saved without edits) are settled by the cache.
+        Only the affected module pages are written; the index and
+        navigation are rewritten only if the module list or counts changed.
+        
+        Returns:
+            Dict of 'updated', 'removed' and 'unchanged' paths
+        """
+        source_path, output_path = self.session
+        paths = {Path(p) for p in paths}
+        removed = sorted(p for p in paths if p.suffix == '.py' and not p.exists())
+        files = sorted(self.discovery.filter_paths(source_path, paths, extensions={'.py'}))
+        
+        for file_path in removed:
+            self.formatter.remove_module(file_path)
+            if self.cache:
+                self.cache.remove_entry(file_path)
+        if self.state and removed:
+            self._flush_state()
+            self.state.remove_file_states(removed)
+        
+        updated = []
+        self.content_hashes = {}
+        with LLMWorkerPool(self.llm_concurrency) as pool:
+            jobs = [(file_path, self._prepare_file(file_path, pool)) for file_path in files]
+            for file_path, job in jobs:
+                if self._finish_file(file_path, job, self.formatter):
+                    updated.append(file_path)
+        
+        self.formatter.refresh_navigation(self._project_name(source_path))
+        self._save_project()
+        return {
+            'updated': updated,
+            'removed': removed,
+            'unchanged': [p for p in files if p not in updated],
+        }
+    
+    def _open_project(self, source_path: Path, output_path: Path, incremental: bool):
+        """Open the per-project caches and state database."""
         # Initialize cache for this project if incremental mode
-        if incremental:
-            self.cache = DocumentationCache(source_path, output_path)
+        self.cache = DocumentationCache(source_path, output_path) if incremental else None
+        
+        # Parser output is keyed by content, so it survives forced rebuilds
+        if self.use_parse_cache:
+            self.parse_stage.cache = ParseResultCache(source_path / '.opendox' / 'parse_cache.sqlite')
+        
+        if self.state_db:
+            from opendox.database.state_manager import DocumentationStateManager
+            self.state = DocumentationStateManager(source_path)
+        
+        # Reuse LLM answers from earlier runs, even when regenerating everything
+        if self.use_llm_cache:
+            self.llm_cache = LLMResponseCache(source_path / '.opendox' / 'llm_cache.sqlite')
+            self.generator.cache = self.llm_cache
+    
+    def _save_project(self):
+        """Persist pending cache and state writes without closing anything."""
+        if self.cache:
+            self.cache.save()
+        if self.state:
+            self._flush_state()
+        if self.parse_stage.cache:
+            self.stats['parse_cache'] = self.parse_stage.cache.stats()
+        if self.llm_cache:
+            self.stats['llm_cache'] = self.llm_cache.stats()
+    
+    def _close_project(self):
+        """Flush and close what `_open_project` opened, keeping their stats."""
+        if self.cache:
+            self.cache.close()
         
-        # Setup formatter
-        formatter = MkDocsFormatter(output_path)
+        if self.parse_stage.cache:
+            self.stats['parse_cache'] = self.parse_stage.cache.stats()
+            self.parse_stage.cache.close()
+            self.parse_stage.cache = None
         
-        # Setup MkDocs configuration
+        if self.state:
+            self._flush_state()
+            self.state.close()
+            self.state = None
+        
+        if self.llm_cache:
+            self.stats['llm_cache'] = self.llm_cache.stats()
+            self.generator.cache = None
+            self.llm_cache.close()
+            self.llm_cache = None
+        
+        # Pooled backend connections are reopened on demand
+        close_generator = getattr(self.generator, 'close', None)
+        if close_generator:
+            close_generator()
+    
+    @staticmethod
+    def _project_name(source_path: Path) -> str:
         if source_path.name == '.' or source_path.name == '':
             # Try to get the actual directory name when using '.'
             project_name = Path.cwd().name if source_path == Path('.') else "OPENDOX"
@@ -55,39 +324,7 @@ class DocumentationPipeline:
         # Ensure we have a valid project name
         if not project_name or project_name in ['.', '..', '']:
             project_name = "OPENDOX"
-            
-        console.print(f"[bold blue]Setting up documentation for:[/bold blue] {project_name}")
-        
-        # Discover Python files
-        all_files = self.discovery.discover_files(source_path, max_files=max_files * 2)  # Get more files initially
-        files = self.discovery.filter_python_files(all_files)[:max_files]  # Then limit Python files
-        
-        console.print(f"[green]Found {len(files)} Python files to process[/green]")
-        
-        # Process files with progress bar
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-            console=console
-        ) as progress:
-            task = progress.add_task("Processing files...", total=len(files))
-            
-            for file_path in files:
-                success = self._process_file(file_path, formatter, progress, task)
-                if success:
-                    self.stats['modules_processed'] += 1
-                progress.update(task, advance=1)
-        
-        # Finalize documentation
-        formatter.create_index(project_name, f"Automated documentation for {project_name}")
-        formatter.finalize()
-        
-        # Display summary
-        self._display_summary(files)
-        
-        return self.stats
+        return project_name
     
     def _process_file(self, file_path: Path, formatter: MkDocsFormatter, progress: Progress = None, task_id = None) -> bool:
         """Process a single file and generate documentation.
@@ -101,30 +338,62 @@ class DocumentationPipeline:
         Returns:
             True if file was successfully processed
         """
+        with LLMWorkerPool(1) as pool:
+            job = self._prepare_file(file_path, pool, progress, task_id)
+            return self._finish_file(file_path, job, formatter)
+    
+    def _prepare_file(self, file_path: Path, pool: LLMWorkerPool, progress: Progress = None, task_id = None) -> Optional[Dict[str, Any]]:
+        """Parse a file and submit its functions to the LLM worker pool.
+        
+        Returns:
+            A job dict for `_finish_file`, or None if the file needs no page
+        """
+        if not self._needs_processing(file_path):
+            return None
+        try:
+            if self.parse_stage.cache:
+                result = self.parse_stage.cache.parse(self.parser, file_path)
+            else:
+                result = self.parser.parse_file(file_path)
+        except Exception as e:
+            self._record_file_error(file_path, e)
+            return None
+        return self._prepare_parsed(file_path, result, pool, progress, task_id)
+    
+    def _needs_processing(self, file_path: Path) -> bool:
+        """Register a file in the stats and check it against the cache."""
+        # Initialize file stats
+        self.stats['file_details'][str(file_path)] = {
+            'functions': 0,
+            'classes': 0,
+            'status': 'Processing'
+        }
+        
         try:
-            # Initialize file stats
-            self.stats['file_details'][str(file_path)] = {
-                'functions': 0,
-                'classes': 0,
-                'status': 'Processing'
-            }
-            
             # Check cache if enabled
-            if self.cache and not self.cache.needs_update(file_path):
-                self.stats['file_details'][str(file_path)]['status'] = 'Cached'
-                console.print(f"  [dim]→ Skipping {file_path.name} (cached)[/dim]")
-                return False
-            
-            # Parse the file
-            result = self.parser.parse_file(file_path)
-            
+            if self.cache:
+                with self.tracer.span('hash', file=file_path):
+                    changed = self.cache.needs_update(file_path, self.content_hashes.get(file_path))
+                if not changed:
+                    self.stats['file_details'][str(file_path)]['status'] = 'Cached'
+                    console.print(f"  [dim]→ Skipping {file_path.name} (cached)[/dim]")
+                    return False
+        except Exception as e:
+            self._record_file_error(file_path, e)
+            return False
+        return True
+    
+    def _prepare_parsed(self, file_path: Path, result: Dict[str, Any], pool: LLMWorkerPool, progress: Progress = None, task_id = None) -> Optional[Dict[str, Any]]:
+        """Turn a parse result into a job and submit its functions to the LLM workers."""
+        try:
             if 'error' in result:
                 self.stats['errors'].append({
                     'file': str(file_path),
                     'error': result['error']
                 })
                 self.stats['file_details'][str(file_path)]['status'] = f"Error: {result['error'][:40]}"
-                return False
+                self._record_state(file_path, parse_success=False, doc_generated=False)
+                return None
             
             # Extract functions and classes
             functions = result.get('functions', [])
@@ -137,35 +406,141 @@ class DocumentationPipeline:
             # Skip empty files
             if not functions and not classes:
                 self.stats['file_details'][str(file_path)]['status'] = 'Empty'
-                return False
+                return None
             
-            # Generate documentation for functions
-            function_docs = []
-            for func in functions[:5]:  # Limit to 5 functions per file
-                if progress and task_id is not None:
-                    progress.update(task_id, description=f"Processing files... [cyan]→ Documenting {func.name}[/cyan]")
-                
-                # Convert to dict if needed
-                func_data = func.__dict__ if hasattr(func, '__dict__') else func
-                doc = self.generator.generate_function_doc(func_data)
-                function_docs.append(doc)
-                self.stats['functions_documented'] += 1
+            # Fan function documentation out to the LLM workers, packing
+            # several functions into one prompt when batching is enabled
+            # Elements support mapping access, so they are passed on uncopied
+            func_datas = functions[:5]  # Limit to 5 functions per file
+            # Symbols whose source span is unchanged reuse their stored doc;
+            # only new or edited ones go to the LLM
+            stored_docs = [self._stored_doc(file_path, func_data) for func_data in func_datas]
+            to_generate = [f for f, doc in zip(func_datas, stored_docs) if doc is None]
+            if self.batch_size > 1:
+                batches = self.generator.pack_batches(to_generate, self.batch_size, self.batch_token_budget)
+            else:
+                batches = [[func_data] for func_data in to_generate]
+            function_futures = [
+                pool.submit(self._document_functions, batch, progress, task_id)
+                for batch in batches
+            ]
             
             # Generate documentation for classes  
             class_docs = []
-            for cls in classes[:3]:  # Limit to 3 classes per file
-                if progress and task_id is not None:
-                    progress.update(task_id, description=f"Processing files... [cyan]→ Documenting {cls.name}[/cyan]")
-                
-                # Convert to dict if needed
-                cls_data = cls.__dict__ if hasattr(cls, '__dict__') else cls
+            for cls_data in classes[:3]:  # Limit to 3 classes per file
                 # For now, just use the existing docstring or generate a simple one
                 if cls_data.get('docstring'):
                     doc = cls_data['docstring']
                 else:
                     doc = f"Class {cls_data.get('name', 'Unknown')} with {len(cls_data.get('metadata', {}).get('methods', []))} methods."
                 class_docs.append(doc)
-                self.stats['classes_documented'] += 1
+            
+            return {
+                'started': time.perf_counter(),
+                'functions': functions,
+                'classes': classes,
+                'class_docs': class_docs,
+                'function_datas': func_datas,
+                'stored_docs': stored_docs,
+                'function_futures': function_futures,
+            }
+            
+        except Exception as e:
+            self._record_file_error(file_path, e)
+            return None
+    
+    def _git_change_set(self, detector: GitChangeDetector, output_path: Path) -> Optional[List[Path]]:
+        """Collect blob SHAs and return the files changed since the last run.
+        
+        Returns None when the whole tree has to be scanned: on the first run,
+        when the recorded commit is gone, or when the output was removed.
+        """
+        with self.tracer.span('git'):
+            since = self.cache.get_meta('git_commit')
+            self.dirty_files = {p for p in detector.dirty_files() if p.suffix == '.py'}
+            changed = None
+            if since and (output_path / 'docs' / 'api').exists():
+                changed = detector.committed_changes(since)
+            if changed is None:
+                self.content_hashes = detector.tree_hashes()
+                return None
+            # Files that were dirty or failed at the last run may since have
+            # been reverted or fixed without appearing in any diff
+            carried = self._carried_files(detector.project_root)
+            changed |= self.dirty_files | carried.keys()
+            self.content_hashes = detector.blob_hashes(changed)
+            changed -= {p for p, sha in carried.items()
+                        if sha and p not in self.dirty_files and self.content_hashes.get(p) == sha}
+            return sorted(changed)
+    
+    def _carried_files(self, root: Path) -> Dict[Path, Optional[str]]:
+        """Files carried over from the last git run, with the blob SHA they were documented at."""
+        stored = self.cache.get_meta('git_carry')
+        return {root / name: sha for name, sha in json.loads(stored).items()} if stored else {}
+    
+    def _carry_over(self, root: Path, failed: Iterable[Path], keep_previous: bool = False):
+        """Remember this run's uncommitted and failed files for the next change set.
+        
+        Uncommitted files are stored with the blob SHA they were documented
+        at; failed files without one, so they are always retried.
+        """
+        carry = {}
+        if keep_previous:
+            carry.update((str(p.relative_to(root)), sha) for p, sha in self._carried_files(root).items())
+        for path in self.dirty_files:
+            carry[str(path.relative_to(root))] = self.content_hashes.get(path)
+        for path in failed:
+            carry[str(path.relative_to(root))] = None
+        self.cache.set_meta('git_carry', json.dumps(carry, sort_keys=True))
+    
+    def _symbol_key(self, func_data: Dict[str, Any]) -> Optional[str]:
+        """Key stored symbol docs by source span and by what generated them."""
+        fingerprint = func_data.get('metadata', {}).get('fingerprint')
+        if not fingerprint:
+            return None
+        source = getattr(self.generator, 'cache_model', None) or getattr(self.generator, 'model', '')
+        return f"{source}:{fingerprint}"
+    
+    def _stored_doc(self, file_path: Path, func_data: Dict[str, Any]) -> Optional[str]:
+        """Look up the stored doc for an unchanged symbol."""
+        key = self._symbol_key(func_data)
+        if not self.cache or not key:
+            return None
+        return self.cache.get_symbol_doc(file_path, key)
+    
+    def _document_functions(self, batch: List[Dict[str, Any]], progress: Progress = None, task_id = None) -> List[str]:
+        """Generate documentation for a batch of functions (runs on an LLM worker)."""
+        names = ', '.join(func_data.get('name', '?') for func_data in batch)
+        if progress and task_id is not None:
+            progress.update(task_id, description=f"Processing files... [cyan]→ Documenting {names}[/cyan]")
+        with self.tracer.span('document', symbol=names):
+            if len(batch) == 1:
+                return [self.generator.generate_function_doc(batch[0])]
+            return self.generator.generate_batch_docs(batch)
+    
+    def _finish_file(self, file_path: Path, job: Optional[Dict[str, Any]], formatter: MkDocsFormatter) -> bool:
+        """Collect a file's LLM results in order and write its module page.
+        
+        Returns:
+            True if file was successfully processed
+        """
+        if job is None:
+            return False
+        
+        try:
+            # Results are gathered in submission order so docs line up with functions
+            generated = iter([doc for future in job['function_futures'] for doc in future.result()])
+            function_docs = [
+                doc if doc is not None else next(generated)
+                for doc in job['stored_docs']
+            ]
+            functions = job['functions']
+            classes = job['classes']
+            class_docs = job['class_docs']
+            
+            self.stats['functions_documented'] += len(function_docs)
+            self.stats['functions_reused'] += sum(doc is not None for doc in job['stored_docs'])
+            self.stats['classes_documented'] += len(class_docs)
             
             # Create module data
             module_data = {
@@ -182,28 +557,76 @@ class DocumentationPipeline:
             
             # Update cache if enabled
             if self.cache:
-                self.cache.update(file_path)
+                # Fallback text written while the LLM was unavailable is not kept
+                is_fallback = getattr(self.generator, 'is_fallback', None)
+                self.cache.update_symbols(file_path, {
+                    self._symbol_key(func_data): doc
+                    for func_data, doc in zip(job['function_datas'], function_docs)
+                    if self._symbol_key(func_data) and not (is_fallback and is_fallback(doc, func_data))
+                })
+                self.cache.update(file_path, self.content_hashes.get(file_path))
             
             # Update status
             self.stats['file_details'][str(file_path)]['status'] = 'Documented'
+            self._record_state(
+                file_path,
+                parse_success=True,
+                doc_generated=True,
+                generation_time_ms=int((time.perf_counter() - job['started']) * 1000),
+                doc_coverage=len(function_docs) / len(functions) if functions else 1.0,
+            )
             
             return True
             
         except Exception as e:
-            self.stats['errors'].append({
-                'file': str(file_path),
-                'error': str(e)
-            })
-            self.stats['file_details'][str(file_path)] = {
-                'functions': 0,
-                'classes': 0,
-                'status': f"Error: {str(e)[:40]}"
-            }
-            console.print(f"  [red]→ Error processing {file_path.name}: {e}[/red]")
+            self._record_file_error(file_path, e)
             return False
     
-    def _display_summary(self, files: List[Path]):
-        """Display processing summary table."""
+    def _record_file_error(self, file_path: Path, error: Exception):
+        """Record a processing failure for the summary table."""
+        self.stats['errors'].append({
+            'file': str(file_path),
+            'error': str(error)
+        })
+        self.stats['file_details'][str(file_path)] = {
+            'functions': 0,
+            'classes': 0,
+            'status': f"Error: {str(error)[:40]}"
+        }
+        console.print(f"  [red]→ Error processing {file_path.name}: {error}[/red]")
+    
+    def _record_state(self, file_path: Path, **state):
+        """Queue a file state for the state database, upserting in batches."""
+        if not self.state:
+            return
+        # Reuse the hash the cache already computed; the state manager only
+        # reads the file when neither git nor the cache has one
+        content_hash = self.content_hashes.get(file_path)
+        if content_hash is None and self.cache:
+            content_hash = self.cache.known_hash(file_path)
+        state.update(file_path=str(file_path), content_hash=content_hash,
+                     model=getattr(self.generator, 'model', None))
+        with self._state_lock:
+            self._state_rows.append(state)
+            if len(self._state_rows) >= STATE_BATCH_SIZE:
+                self._flush_state()
+    
+    def _flush_state(self):
+        """Write queued file states to the state database."""
+        with self._state_lock:
+            rows, self._state_rows = self._state_rows, []
+            self.state.upsert_file_states(rows)
+    
+    def export_trace(self, path: Path):
+        """Write the spans of the last run in Chrome trace-event format."""
+        self.tracer.export_chrome(path)
+    
+    def _display_summary(self, files: List[Path], total: Optional[int] = None):
+        """Display processing summary table.
+        
+        ``files`` may be the first few of ``total`` files found; the rest
+        are summarized in one row.
+        """
         console.print("\n")
         
         # Create summary table
@@ -214,7 +637,8 @@ class DocumentationPipeline:
         table.add_column("Status")
         
         # Add rows for each file
-        for file_path in files[:20]:  # Show first 20 files
+        shown = 20
+        for file_path in files[:shown]:  # Show first 20 files
             file_str = str(file_path)
             
             # Get details from stats if available
@@ -247,14 +671,45 @@ class DocumentationPipeline:
                 class_count,
                 status_display
             )
+        remaining = (len(files) if total is None else total) - min(len(files), shown)
+        if remaining > 0:
+            table.add_row(f"[dim]… and {remaining} more[/dim]", "", "", "")
         
         console.print(table)
         
+        # Where the time went, per pipeline stage
+        if self.stats.get('stage_timings'):
+            timing_table = Table(title="Stage Timings")
+            timing_table.add_column("Stage", style="cyan")
+            timing_table.add_column("Calls", justify="right")
+            timing_table.add_column("Total (ms)", justify="right")
+            timing_table.add_column("p50 (ms)", justify="right")
+            timing_table.add_column("p99 (ms)", justify="right")
+            for stage, timing in self.stats['stage_timings'].items():
+                timing_table.add_row(
+                    stage,
+                    str(timing['count']),
+                    f"{timing['total_ms']:.1f}",
+                    f"{timing['p50_ms']:.2f}",
+                    f"{timing['p99_ms']:.2f}"
+                )
+            console.print(timing_table)
+        
         # Print final statistics
         console.print("\n[bold green]✅ Documentation Complete![/bold green]")
         console.print(f"  • Modules documented: {self.stats['modules_processed']}")
         console.print(f"  • Functions documented: {self.stats['functions_documented']}")  
+        if self.stats['functions_reused']:
+            console.print(f"  • Functions reused unchanged: {self.stats['functions_reused']}")
         console.print(f"  • Classes documented: {self.stats['classes_documented']}")
         
+        if self.stats.get('llm_cache'):
+            cache_stats = self.stats['llm_cache']
+            console.print(f"  • LLM cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+        
+        if self.stats.get('parse_cache'):
+            cache_stats = self.stats['parse_cache']
+            console.print(f"  • Parse cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+        
         if self.stats['errors']:
             console.print(f"  • [yellow]Errors encountered: {len(self.stats['errors'])}[/yellow]")
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""Thread-based stage runner connected by bounded queues."""
+import queue
+import threading
+from typing import Any, Callable, Iterator, List, Optional
+
+_DONE = object()
+
+
+class StageRunner:
+    """Run pipeline stages on threads connected by bounded queues.
+
+    Every channel holds at most ``queue_depth`` items, so a slow stage blocks
+    the ones feeding it instead of letting work pile up in memory. If any
+    stage raises, all stages are asked to stop and ``join`` re-raises the
+    first error.
+    """
+
+    def __init__(self, queue_depth: int = 64):
+        self.queue_depth = max(1, queue_depth)
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._errors: List[BaseException] = []
+
+    def channel(self) -> queue.Queue:
+        """Create a bounded queue connecting two stages."""
+        return queue.Queue(maxsize=self.queue_depth)
+
+    def start(self, name: str, fn: Callable[..., Any], *args, output: Optional[queue.Queue] = None):
+        """Run ``fn(*args)`` on its own thread, closing ``output`` when it returns."""
+        def run():
+            try:
+                fn(*args)
+            except BaseException as e:
+                self._errors.append(e)
+                self._stop.set()
+            finally:
+                if output is not None:
+                    self.close(output)
+
+        thread = threading.Thread(target=run, name=f"opendox-{name}", daemon=True)
+        self._threads.append(thread)
+        thread.start()
+        return thread
+
+    def put(self, channel: queue.Queue, item: Any) -> bool:
+        """Block until ``item`` fits in the channel; False if the run is stopping."""
+        while not self._stop.is_set():
+            try:
+                channel.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def close(self, channel: queue.Queue):
+        """Signal downstream that no more items will arrive."""
+        while True:
+            try:
+                channel.put(_DONE, timeout=0.1)
+                return
+            except queue.Full:
+                if self._stop.is_set():
+                    # Nobody is draining any more; make room for the marker
+                    try:
+                        channel.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    def iterate(self, channel: queue.Queue) -> Iterator[Any]:
+        """Yield items from a channel until it is closed or the run stops."""
+        while True:
+            try:
+                item = channel.get(timeout=0.1)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+                continue
+            if item is _DONE:
+                return
+            yield item
+
+    def join(self):
+        """Wait for every stage and re-raise the first failure."""
+        for thread in self._threads:
+            thread.join()
+        if self._errors:
+            raise self._errors[0]
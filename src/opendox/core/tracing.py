@@ -0,0 +1,131 @@
+"""Lightweight span tracing with Chrome trace-event export."""
+import json
+import math
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class Tracer:
+    """Record timed spans from any thread (or worker process).
+
+    While enabled, every span's duration is aggregated per stage name for
+    `stage_breakdown` as a running count and total plus a bounded sample
+    for percentiles, so memory stays flat on long runs. Full events (file, symbol, timestamps) are only kept
+    when ``keep_events`` is set, since they are needed just for trace export.
+    Timestamps use wall-clock time so spans reported by parse worker
+    processes line up with those recorded in the main process.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.keep_events = False
+        self._lock = threading.Lock()
+        self._events: List[Dict[str, Any]] = []
+        self._durations: Dict[str, _StageStats] = defaultdict(_StageStats)
+
+    def start(self, keep_events: bool = False):
+        """Clear previous data and begin recording."""
+        with self._lock:
+            self._events = []
+            self._durations = defaultdict(_StageStats)
+        self.keep_events = keep_events
+        self.enabled = True
+
+    def stop(self):
+        """Stop recording; collected data stays available."""
+        self.enabled = False
+
+    @contextmanager
+    def span(self, name: str, **args):
+        """Time the enclosed block as a span called ``name``."""
+        if not self.enabled:
+            yield
+            return
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.time() - start, **args)
+
+    def record(self, name: str, start: float, duration: float,
+               pid: Optional[int] = None, tid: Optional[int] = None, **args):
+        """Add a span measured elsewhere (seconds since the epoch, seconds)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._durations[name].add(duration)
+            if self.keep_events:
+                self._events.append({
+                    'name': name,
+                    'cat': name.split('.')[0],
+                    'ph': 'X',
+                    'ts': start * 1e6,
+                    'dur': duration * 1e6,
+                    'pid': pid if pid is not None else os.getpid(),
+                    'tid': tid if tid is not None else threading.get_ident(),
+                    'args': {k: str(v) for k, v in args.items()},
+                })
+
+    def stage_breakdown(self) -> Dict[str, Dict[str, float]]:
+        """Return count, total, p50 and p99 (milliseconds) per stage."""
+        with self._lock:
+            stages = {name: (stats.count, stats.total, sorted(stats.samples))
+                      for name, stats in self._durations.items()}
+        breakdown = {}
+        for name, (count, total, values) in sorted(stages.items()):
+            breakdown[name] = {
+                'count': count,
+                'total_ms': round(total * 1000, 3),
+                'p50_ms': round(_percentile(values, 50) * 1000, 3),
+                'p99_ms': round(_percentile(values, 99) * 1000, 3),
+            }
+        return breakdown
+
+    def export_chrome(self, path: Path):
+        """Write recorded events in Chrome trace-event format (chrome://tracing, Perfetto)."""
+        with self._lock:
+            events = list(self._events)
+        Path(path).write_text(json.dumps({'traceEvents': events, 'displayTimeUnit': 'ms'}))
+
+
+class _StageStats:
+    """Running count and total of a stage's durations, plus a reservoir sample.
+
+    Percentiles are exact up to ``SAMPLE_SIZE`` spans and estimated from a
+    uniform sample beyond that.
+    """
+
+    SAMPLE_SIZE = 2048
+    __slots__ = ('count', 'total', 'samples')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.samples: List[float] = []
+
+    def add(self, duration: float):
+        self.count += 1
+        self.total += duration
+        if len(self.samples) < self.SAMPLE_SIZE:
+            self.samples.append(duration)
+        else:
+            slot = random.randrange(self.count)
+            if slot < self.SAMPLE_SIZE:
+                self.samples[slot] = duration
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+# Process-wide tracer shared by the pipeline, parsers, generator and formatter
+tracer = Tracer()
@@ -0,0 +1,217 @@
+"""Watch a source tree and hand changed files out in debounced batches."""
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from rich.console import Console
+
+from opendox.core.file_discovery import FileDiscovery
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+    FileSystemEventHandler = object
+    Observer = None
+
+console = Console()
+
+
+class ChangeBatcher:
+    """Collect changed paths and release them once changes stop arriving.
+
+    A batch is released when no new path was added for ``debounce`` seconds,
+    or ``max_delay`` seconds after its first path, whichever comes first, so a
+    checkout touching hundreds of files becomes one batch while a steady
+    stream of saves still gets processed.
+    """
+
+    def __init__(self, debounce: float = 0.3, max_delay: float = 5.0):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._paths: Set[Path] = set()
+        self._first = 0.0
+        self._last = 0.0
+        self._stopped = False
+        self._cond = threading.Condition()
+
+    def add(self, path: Path):
+        with self._cond:
+            now = time.monotonic()
+            if not self._paths:
+                self._first = now
+            self._paths.add(Path(path))
+            self._last = now
+            self._cond.notify_all()
+
+    def next_batch(self, timeout: Optional[float] = None) -> Set[Path]:
+        """Block until a batch is ready; empty on timeout or after `stop`."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._stopped:
+                now = time.monotonic()
+                if self._paths:
+                    ready_at = min(self._last + self.debounce, self._first + self.max_delay)
+                    if now >= ready_at:
+                        batch, self._paths = self._paths, set()
+                        return batch
+                    wait = ready_at - now
+                elif deadline is None:
+                    wait = None
+                else:
+                    wait = deadline - now
+                    if wait <= 0:
+                        return set()
+                self._cond.wait(wait)
+            return set()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+
+class PollingWatcher:
+    """Detect changes by comparing stat signatures every ``interval`` seconds.
+
+    Used where inotify/FSEvents are unavailable (no watchdog, network
+    filesystems). Reports added, modified and deleted files.
+    """
+
+    def __init__(self, root: Path, on_change: Callable[[Path], None], interval: float = 1.0,
+                 extensions: Set[str] = None, discovery: FileDiscovery = None):
+        self.root = Path(root)
+        self.on_change = on_change
+        self.interval = interval
+        self.extensions = extensions or {'.py'}
+        self.discovery = discovery or FileDiscovery()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._snapshot = self.scan()
+
+    def scan(self) -> Dict[Path, Tuple[int, int]]:
+        snapshot = {}
+        for path in self.discovery.iter_files(self.root, max_files=0, extensions=self.extensions):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def poll(self):
+        """Rescan once and report every path whose signature changed."""
+        snapshot = self.scan()
+        previous, self._snapshot = self._snapshot, snapshot
+        for path, signature in snapshot.items():
+            if previous.get(path) != signature:
+                self.on_change(path)
+        for path in previous.keys() - snapshot.keys():
+            self.on_change(path)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='opendox-poll', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+
+class _EventHandler(FileSystemEventHandler):
+    """Forward file events for matching, non-ignored paths."""
+
+    def __init__(self, watcher: "EventWatcher"):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type in ('opened', 'closed_no_write'):
+            return
+        for path in (event.src_path, getattr(event, 'dest_path', None)):
+            if path:
+                self.watcher.report(Path(os.fsdecode(path)))
+
+
+class EventWatcher:
+    """Receive change notifications from the OS through watchdog."""
+
+    def __init__(self, root: Path, on_change: Callable[[Path], None], extensions: Set[str] = None,
+                 discovery: FileDiscovery = None):
+        self.root = Path(root)
+        self.on_change = on_change
+        self.extensions = extensions or {'.py'}
+        self.discovery = discovery or FileDiscovery()
+        self.observer = Observer()
+        self.observer.schedule(_EventHandler(self), str(self.root), recursive=True)
+
+    def report(self, path: Path):
+        if path.suffix not in self.extensions:
+            return
+        try:
+            parts = path.relative_to(self.root).parts[:-1]
+        except ValueError:
+            return
+        if not any(part in self.discovery.ignore for part in parts):
+            self.on_change(path)
+
+    def start(self):
+        self.observer.start()
+
+    def stop(self):
+        self.observer.stop()
+        self.observer.join()
+
+
+def create_watcher(root: Path, on_change: Callable[[Path], None], poll: bool = False,
+                   interval: float = 1.0, extensions: Set[str] = None):
+    """Use OS file events when watchdog is installed, polling otherwise."""
+    if WATCHDOG_AVAILABLE and not poll:
+        return EventWatcher(root, on_change, extensions)
+    return PollingWatcher(root, on_change, interval, extensions)
+
+
+def run_watch(pipeline, source_path: Path, output_path: Path, debounce: float = 0.3, poll: bool = False,
+              interval: float = 1.0, max_files: int = 0, stop: Optional[threading.Event] = None,
+              incremental: bool = True):
+    """Build the docs once, then regenerate affected pages as files change.
+
+    The pipeline stays in one session throughout, so its caches and LLM
+    client stay warm. Runs until ``stop`` is set or the process is
+    interrupted. Without ``incremental`` the initial build and every
+    change regenerate pages without consulting the documentation cache.
+    """
+    source_path, output_path = Path(source_path), Path(output_path)
+    batcher = ChangeBatcher(debounce)
+    watcher = create_watcher(source_path, batcher.add, poll=poll, interval=interval)
+    pipeline.open_session(source_path, output_path, incremental=incremental)
+    try:
+        # Start watching first so edits made during the initial build are not lost
+        watcher.start()
+        pipeline.generate(source_path, output_path, max_files=max_files, incremental=incremental)
+        mode = "polling" if isinstance(watcher, PollingWatcher) else "file events"
+        console.print(f"[bold blue]Watching {source_path} ({mode}); press Ctrl+C to stop[/bold blue]")
+        while stop is None or not stop.is_set():
+            batch = batcher.next_batch(timeout=0.5)
+            if not batch:
+                continue
+            started = time.perf_counter()
+            changes = pipeline.update_files(batch)
+            if changes['updated'] or changes['removed']:
+                console.print(
+                    f"[green]Updated {len(changes['updated'])} page(s), removed {len(changes['removed'])} "
+                    f"in {time.perf_counter() - started:.2f}s[/green]"
+                )
+    finally:
+        watcher.stop()
+        batcher.stop()
+        pipeline.close_session()
@@ -2,7 +2,7 @@
 import hashlib
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
 try:
     import duckdb
@@ -11,18 +11,28 @@ except ImportError:
     DUCKDB_AVAILABLE = False
     duckdb = None
 
+try:
+    import pyarrow
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    pyarrow = None
+
+FILE_COLUMNS = ('file_path', 'content_hash', 'last_parsed', 'last_documented', 'parse_success', 'doc_generated')
+METADATA_COLUMNS = ('file_path', 'doc_coverage', 'quality_score', 'last_llm_model', 'generation_time_ms')
+
 class DocumentationStateManager:
     """Manage documentation state with DuckDB."""
-    
+
     def __init__(self, project_root: Path):
         if not DUCKDB_AVAILABLE:
             raise ImportError("DuckDB is not installed. Install with: pip install duckdb")
-        
+
         self.db_path = project_root / '.opendox' / 'state.duckdb'
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.conn = duckdb.connect(str(self.db_path))
         self._initialize_schema()
-    
+
     def _initialize_schema(self):
         """Create tables for tracking documentation state."""
         self.conn.execute("""
@@ -35,7 +45,7 @@ class DocumentationStateManager:
                 doc_generated BOOLEAN DEFAULT FALSE
             )
         """)
-        
+
         self.conn.execute("""
             CREATE TABLE IF NOT EXISTS documentation_metadata (
                 file_path VARCHAR PRIMARY KEY,
@@ -45,35 +55,127 @@ class DocumentationStateManager:
                 generation_time_ms INTEGER
             )
         """)
-    
+
     def get_changed_files(self, since: Optional[datetime] = None) -> List[str]:
-        """Get files that need documentation updates."""
-        try:
-            query = """
-                SELECT file_path 
-                FROM files 
-                WHERE last_parsed > last_documented
-                   OR doc_generated = false
-                   OR last_documented IS NULL
+        """Get files that need documentation updates.
+
+        That is every file without current documentation, plus, when
+        ``since`` is given, every file parsed after that time.
+        """
+        result = self.conn.execute(
             """
-            result = self.conn.execute(query).fetchall()
-            return [row[0] for row in result]
-        except:
-            # Table might be empty
-            return []
-    
+            SELECT file_path
+            FROM files
+            WHERE NOT doc_generated
+               OR last_documented IS NULL
+               OR last_parsed > last_documented
+               OR last_parsed > ?
+            """,
+            (since,)
+        ).fetchall()
+        return [row[0] for row in result]
+
     def update_file_state(self, file_path: Path, content: str):
         """Update file hash and timestamps."""
         content_hash = hashlib.sha256(content.encode()).hexdigest()
-        
-        self.conn.execute(
-            """
-            INSERT INTO files (file_path, content_hash, last_parsed, last_documented, doc_generated)
-            VALUES (?, ?, ?, ?, ?)
-            ON CONFLICT (file_path) DO UPDATE SET
-                content_hash = EXCLUDED.content_hash,
-                last_documented = EXCLUDED.last_documented,
-                doc_generated = true
-            """,
-            (str(file_path), content_hash, datetime.now(), datetime.now(), True)
-        )
\ No newline at end of file
+        self.upsert_file_states([{
+            'file_path': str(file_path),
+            'content_hash': content_hash,
+            'parse_success': True,
+            'doc_generated': True,
+        }])
+
+    def upsert_file_states(self, states: Iterable[Dict[str, Any]]):
+        """Insert or update many file states in one statement per table.
+
+        Each state is a dict with ``file_path``, ``content_hash``,
+        ``parse_success`` and ``doc_generated``, and optionally
+        ``generation_time_ms``, ``model`` and ``doc_coverage``. A missing
+        content hash is computed from the file.
+        """
+        # DuckDB rejects two updates of the same key in one statement
+        latest = {str(state['file_path']): state for state in states}
+        if not latest:
+            return
+        now = datetime.now()
+        file_rows = []
+        metadata_rows = []
+        for file_path, state in latest.items():
+            content_hash = state.get('content_hash') or self._hash_file(file_path)
+            documented = bool(state.get('doc_generated'))
+            file_rows.append((
+                file_path, content_hash, now, now if documented else None,
+                bool(state.get('parse_success')), documented,
+            ))
+            if documented:
+                metadata_rows.append((
+                    file_path, state.get('doc_coverage'), state.get('quality_score'),
+                    state.get('model'), state.get('generation_time_ms'),
+                ))
+
+        self._bulk_upsert('files', FILE_COLUMNS, file_rows, """
+            content_hash = EXCLUDED.content_hash,
+            last_parsed = EXCLUDED.last_parsed,
+            last_documented = COALESCE(EXCLUDED.last_documented, last_documented),
+            parse_success = EXCLUDED.parse_success,
+            doc_generated = EXCLUDED.doc_generated
+        """)
+        self._bulk_upsert('documentation_metadata', METADATA_COLUMNS, metadata_rows, """
+            doc_coverage = EXCLUDED.doc_coverage,
+            quality_score = EXCLUDED.quality_score,
+            last_llm_model = EXCLUDED.last_llm_model,
+            generation_time_ms = EXCLUDED.generation_time_ms
+        """)
+
+    def remove_file_states(self, file_paths: Iterable[Path]):
+        """Forget deleted files."""
+        rows = [(str(file_path),) for file_path in file_paths]
+        if not rows:
+            return
+        for table in ('files', 'documentation_metadata'):
+            self.conn.executemany(f"DELETE FROM {table} WHERE file_path = ?", rows)
+
+    def _bulk_upsert(self, table: str, columns: Sequence[str], rows: List[tuple], updates: str):
+        """Upsert ``rows`` into ``table`` with a single INSERT ... SELECT.
+
+        Rows are handed to DuckDB as an Arrow table when pyarrow is installed.
+        Otherwise they go through executemany into a temporary staging table,
+        which avoids running the conflict check once per statement.
+        """
+        if not rows:
+            return
+        column_list = ', '.join(columns)
+        staged = f"staged_{table}"
+        if PYARROW_AVAILABLE:
+            schema = self.conn.execute(f"SELECT {column_list} FROM {table} LIMIT 0").arrow().schema
+            batch = pyarrow.Table.from_arrays(
+                [pyarrow.array(column, type=field.type) for column, field in zip(zip(*rows), schema)],
+                schema=schema,
+            )
+            self.conn.register(staged, batch)
+        else:
+            self.conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS {staged} AS SELECT {column_list} FROM {table} LIMIT 0")
+            placeholders = ', '.join('?' for _ in columns)
+            self.conn.executemany(f"INSERT INTO {staged} VALUES ({placeholders})", rows)
+        try:
+            self.conn.execute(f"""
+                INSERT INTO {table} ({column_list})
+                SELECT {column_list} FROM {staged}
+                ON CONFLICT (file_path) DO UPDATE SET {updates}
+            """)
+        finally:
+            if PYARROW_AVAILABLE:
+                self.conn.unregister(staged)
+            else:
+                self.conn.execute(f"DELETE FROM {staged}")
+
+    @staticmethod
+    def _hash_file(file_path: str) -> str:
+        try:
+            return hashlib.blake2b(Path(file_path).read_bytes(), digest_size=16).hexdigest()
+        except OSError:
+            return ""
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
@@ -4,6 +4,10 @@ from typing import List, Dict, Any, Optional
 import yaml
 import json
 from datetime import datetime
+from itertools import islice
+
+from opendox.core.tracing import tracer
+from opendox.parsers.base import ElementStore
 
 class MkDocsFormatter:
     """Convert parsed code to MkDocs documentation."""
@@ -20,6 +24,7 @@ class MkDocsFormatter:
         # Track modules for complete documentation
         self.modules = []
         self.nav_structure = {}
+        self._nav_signature = None  # Module list and counts last written to the nav
         
     def create_config(self, project_name: str = "Documentation"):
         """Create mkdocs.yml configuration with enhanced features."""
@@ -301,6 +306,9 @@ pipeline.generate(
                     func_count = len(module.get('functions', []))
                     class_count = len(module.get('classes', []))
                     content += f"| {module_name} | {func_count} | {class_count} | [View Documentation](api/{module_name}.md) |\n"
+                known = {m.get('name') for m in self.modules}
+                for page in sorted(p for p in self.api_pages if p not in known):
+                    content += f"| {page} | - | - | [View Documentation](api/{page}.md) |\n"
             else:
                 for page in sorted(self.api_pages):
                     module_title = page.replace('_', ' ').title()
@@ -360,12 +368,13 @@ ignore:
         module_name = module_data.get('name', 'unknown')
         module_path = module_data.get('path', '')
         
-        # Store module data
+        # Store module data, replacing an earlier version of the same module
+        self.modules = [m for m in self.modules if m['name'] != module_name]
         self.modules.append({
             'name': module_name,
             'path': module_path,
-            'functions': module_data.get('functions', []),
-            'classes': module_data.get('classes', []),
+            'functions': ElementStore(module_data.get('functions', [])),
+            'classes': ElementStore(module_data.get('classes', [])),
             'description': module_data.get('description', '')
         })
         
@@ -374,8 +383,60 @@ ignore:
             self.api_pages.append(module_name)
         
         # Create the module documentation page
-        self._create_module_documentation(module_data)
+        with tracer.span('write', file=module_path or module_name):
+            self._create_module_documentation(module_data)
+        
+    def remove_module(self, module_path: str):
+        """Forget the module read from ``module_path`` and delete its page.
         
+        Pages are named after the module, so a page is only deleted if it was
+        written for this path, not for another module with the same name.
+        """
+        module_path = str(module_path)
+        module_name = Path(module_path).stem
+        page = self.docs_dir / 'api' / f"{module_name}.md"
+        if self._page_source(module_name, page) != module_path:
+            return
+        self.modules = [m for m in self.modules if m['name'] != module_name]
+        if module_name in self.api_pages:
+            self.api_pages.remove(module_name)
+        page.unlink(missing_ok=True)
+    
+    def _page_source(self, module_name: str, page: Path) -> Optional[str]:
+        """The source path a module page was written for."""
+        for module in self.modules:
+            if module['name'] == module_name:
+                return str(module['path'])
+        # Pages from an earlier run record their source near the top
+        try:
+            with open(page, encoding='utf-8') as f:
+                for line in islice(f, 5):
+                    if line.startswith('**Source:** `'):
+                        return line.strip()[len('**Source:** `'):-1]
+        except OSError:
+            pass
+        return None
+    
+    def load_existing_pages(self):
+        """Register module pages already on disk, e.g. written by an earlier run."""
+        api_dir = self.docs_dir / 'api'
+        if api_dir.is_dir():
+            for page in sorted(api_dir.glob('*.md')):
+                if page.stem not in self.api_pages:
+                    self.api_pages.append(page.stem)
+    
+    def refresh_navigation(self, project_name: str) -> bool:
+        """Rewrite the index and mkdocs.yml only if the module list or counts changed."""
+        if self._navigation_signature() == self._nav_signature:
+            return False
+        self.create_index(project_name, f"Automated documentation for {project_name}")
+        self.finalize()
+        return True
+    
+    def _navigation_signature(self):
+        counts = {m['name']: (len(m.get('functions', [])), len(m.get('classes', []))) for m in self.modules}
+        return tuple(sorted((name, counts.get(name)) for name in set(self.api_pages) | counts.keys()))
+    
     def _create_module_documentation(self, module_data: Dict[str, Any]):
         """Create documentation page for a module."""
         module_name = module_data.get('name', 'unknown')
@@ -409,14 +470,14 @@ ignore:
             if classes:
                 content += "### Classes\n\n"
                 for cls in classes:
-                    cls_name = cls.get('name', 'Unknown') if isinstance(cls, dict) else getattr(cls, 'name', 'Unknown')
+                    cls_name = cls.get('name', 'Unknown')
                     content += f"- [`{cls_name}`](#{cls_name.lower().replace(' ', '-')})\n"
                 content += "\n"
                 
             if functions:
                 content += "### Functions\n\n"
                 for func in functions:
-                    func_name = func.get('name', 'Unknown') if isinstance(func, dict) else getattr(func, 'name', 'Unknown')
+                    func_name = func.get('name', 'Unknown')
                     content += f"- [`{func_name}()`](#{func_name.lower().replace(' ', '-')})\n"
                 content += "\n"
         
@@ -450,10 +511,8 @@ ignore:
     
     def format_function(self, func_data: Any, docstring: str = "") -> str:
         """Format a function as markdown."""
-        # Handle both dict and object representations
-        if hasattr(func_data, '__dict__'):
-            func_dict = func_data.__dict__
-        elif isinstance(func_data, dict):
+        # Dicts, CodeElements and ElementViews all support mapping access
+        if hasattr(func_data, 'get'):
             func_dict = func_data
         else:
             func_dict = {'name': 'unknown'}
@@ -533,10 +592,8 @@ ignore:
     
     def format_class(self, class_data: Any, docstring: str = "") -> str:
         """Format a class as markdown."""
-        # Handle both dict and object representations
-        if hasattr(class_data, '__dict__'):
-            class_dict = class_data.__dict__
-        elif isinstance(class_data, dict):
+        # Dicts, CodeElements and ElementViews all support mapping access
+        if hasattr(class_data, 'get'):
             class_dict = class_data
         else:
             class_dict = {'name': 'unknown'}
@@ -615,12 +672,8 @@ ignore:
         if self.api_pages or self.modules:
             api_section = {'API Reference': []}
             
-            # Use modules if available, otherwise api_pages
-            pages_to_add = []
-            if self.modules:
-                pages_to_add = [m['name'] for m in self.modules]
-            elif self.api_pages:
-                pages_to_add = self.api_pages
+            # Pages from earlier runs have no module data, so include both
+            pages_to_add = set(self.api_pages) | {m['name'] for m in self.modules}
                 
             for page_name in sorted(pages_to_add):
                 api_section['API Reference'].append({page_name: f'api/{page_name}.md'})
@@ -631,6 +684,7 @@ ignore:
     
     def finalize(self):
         """Finalize documentation generation."""
+        self._nav_signature = self._navigation_signature()
         # Update config with final navigation
         if self.modules or self.api_pages:
             project_name = self.output_dir.name
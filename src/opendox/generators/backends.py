@@ -0,0 +1,252 @@
+"""LLM backends: the transport behind `LLMGenerator`."""
+import http.client
+import json
+import os
+import queue
+import threading
+from typing import Any, Dict, Iterator, Optional, Protocol
+from urllib.parse import urlsplit
+
+
+class LLMBackend(Protocol):
+    """What `LLMGenerator` needs from an LLM server.
+
+    ``options`` use Ollama's names (``num_predict``, ``temperature``,
+    ``top_p``); backends translate them. `stream` returns a generator that
+    the caller closes to abandon the answer early. `check` is only called
+    after a request failed and returns a description of the problem, or
+    None if the server looks healthy.
+    """
+
+    name: str
+
+    def complete(self, model: str, prompt: str, options: Dict[str, Any]) -> str: ...
+
+    def stream(self, model: str, prompt: str, options: Dict[str, Any]) -> Iterator[str]: ...
+
+    def check(self, model: str) -> Optional[str]: ...
+
+    def close(self): ...
+
+
+class OllamaBackend:
+    """Talk to Ollama through its Python client.
+
+    The client (and the ``ollama`` package, which is slow to import) is only
+    created on the first request.
+    """
+
+    name = 'ollama'
+
+    def __init__(self, host: Optional[str] = None, timeout: Optional[float] = None, client=None):
+        self.host = host
+        self.timeout = timeout
+        self._client = client
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    import ollama
+                    self._client = ollama.Client(host=self.host, timeout=self.timeout)
+        return self._client
+
+    def complete(self, model: str, prompt: str, options: Dict[str, Any]) -> str:
+        return self.client.generate(model=model, prompt=prompt, options=options)['response']
+
+    def stream(self, model: str, prompt: str, options: Dict[str, Any]) -> Iterator[str]:
+        parts = self.client.generate(model=model, prompt=prompt, options=options, stream=True)
+        try:
+            for part in parts:
+                yield part['response']
+        finally:
+            # Closing the stream drops the connection, which stops Ollama generating
+            close = getattr(parts, 'close', None)
+            if close:
+                close()
+
+    def check(self, model: str) -> Optional[str]:
+        try:
+            self.client.list()
+        except Exception as e:
+            return (f"Ollama connection issue: {e}\n"
+                    f"  Make sure Ollama is running: 'ollama serve'\n"
+                    f"  Make sure model is installed: 'ollama pull {model}'")
+        return None
+
+    def close(self):
+        pass
+
+
+class HTTPBackendError(Exception):
+    """An OpenAI-compatible server answered with an error status."""
+
+
+class OpenAIBackend:
+    """Talk to any OpenAI-compatible ``/chat/completions`` endpoint.
+
+    Works with llama.cpp, vLLM, LM Studio, Ollama's ``/v1`` API and hosted
+    services. Connections are kept alive and pooled, up to ``pool_size``
+    idle ones, so concurrent requests from the LLM worker pool don't pay a
+    TCP (and TLS) handshake each. ``connect_timeout`` bounds connection
+    setup and ``timeout`` each read from the server.
+    """
+
+    name = 'openai'
+
+    def __init__(self, base_url: str = 'http://localhost:8080/v1', api_key: Optional[str] = None,
+                 timeout: float = 120.0, connect_timeout: float = 5.0, pool_size: int = 8):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"Not an http(s) URL: {base_url}")
+        self.base_url = base_url
+        self.https = parts.scheme == 'https'
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = parts.path.rstrip('/')
+        self.api_key = api_key if api_key is not None else os.environ.get('OPENAI_API_KEY')
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.connections_opened = 0
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(maxsize=pool_size)
+        self._lock = threading.Lock()
+
+    def complete(self, model: str, prompt: str, options: Dict[str, Any]) -> str:
+        conn, response = self._request('POST', '/chat/completions', self._payload(model, prompt, options))
+        body = json.loads(self._read(conn, response))
+        return body['choices'][0]['message'].get('content') or ''
+
+    def stream(self, model: str, prompt: str, options: Dict[str, Any]) -> Iterator[str]:
+        payload = self._payload(model, prompt, options)
+        payload['stream'] = True
+        conn, response = self._request('POST', '/chat/completions', payload)
+        if response.status != 200:
+            self._read(conn, response)  # Raises with the server's message on errors
+            # Any other status has no event stream, and the connection is already released
+            raise HTTPBackendError(f"HTTP {response.status}: expected an event stream")
+        finished = False
+        try:
+            while True:
+                line = response.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if not line.startswith(b'data:'):
+                    continue
+                data = line[5:].strip()
+                if data == b'[DONE]':
+                    finished = True
+                    break
+                choices = json.loads(data).get('choices') or [{}]
+                piece = (choices[0].get('delta') or {}).get('content')
+                if piece:
+                    yield piece
+        finally:
+            if finished and not response.will_close:
+                response.read()  # Drain the terminating chunk so the connection can be reused
+                self._release(conn)
+            else:
+                # Hanging up is the only way to stop the server generating
+                conn.close()
+
+    def check(self, model: str) -> Optional[str]:
+        try:
+            conn, response = self._request('GET', '/models')
+            self._read(conn, response)
+        except Exception as e:
+            return f"LLM server at {self.base_url} is not reachable: {e}"
+        return None
+
+    def close(self):
+        """Close the pooled idle connections."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    @staticmethod
+    def _payload(model: str, prompt: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        payload = {'model': model, 'messages': [{'role': 'user', 'content': prompt}]}
+        if 'num_predict' in options:
+            payload['max_tokens'] = options['num_predict']
+        for key in ('temperature', 'top_p', 'stop', 'seed'):
+            if key in options:
+                payload[key] = options[key]
+        return payload
+
+    def _connect(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        conn = cls(self.host, self.port, timeout=self.connect_timeout)
+        conn.connect()
+        conn.sock.settimeout(self.timeout)
+        with self._lock:
+            self.connections_opened += 1
+        return conn
+
+    def _request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None):
+        """Send a request on a pooled connection and return (connection, response)."""
+        body = json.dumps(payload).encode('utf-8') if payload is not None else None
+        headers = {'Content-Type': 'application/json', 'Accept': 'application/json, text/event-stream'}
+        if self.api_key:
+            headers['Authorization'] = f"Bearer {self.api_key}"
+        try:
+            conn = self._idle.get_nowait()
+            reused = True
+        except queue.Empty:
+            conn, reused = self._connect(), False
+        try:
+            conn.request(method, self.path + path, body=body, headers=headers)
+            return conn, conn.getresponse()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            conn.close()
+            if not reused:
+                raise
+            # The server closed the idle connection; retry once on a fresh one
+            conn = self._connect()
+            try:
+                conn.request(method, self.path + path, body=body, headers=headers)
+                return conn, conn.getresponse()
+            except Exception:
+                conn.close()
+                raise
+        except Exception:
+            conn.close()
+            raise
+
+    def _read(self, conn: http.client.HTTPConnection, response: http.client.HTTPResponse) -> bytes:
+        """Read a whole response, returning its connection to the pool."""
+        try:
+            data = response.read()
+        except Exception:
+            conn.close()
+            raise
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(conn)
+        if response.status >= 400:
+            raise HTTPBackendError(f"HTTP {response.status}: {data[:200].decode('utf-8', 'replace')}")
+        return data
+
+    def _release(self, conn: http.client.HTTPConnection):
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+
+def create_backend(name: str = 'ollama', url: Optional[str] = None, timeout: Optional[float] = None,
+                   latency: float = 0.0) -> LLMBackend:
+    """Build a backend by name: ``ollama``, ``openai`` or ``mock``."""
+    if name == 'ollama':
+        return OllamaBackend(host=url, timeout=timeout)
+    if name == 'openai':
+        kwargs = {} if timeout is None else {'timeout': timeout}
+        return OpenAIBackend(url or 'http://localhost:8080/v1', **kwargs)
+    if name == 'mock':
+        from opendox.generators.mock_generator import MockBackend
+        return MockBackend(latency=latency)
+    raise ValueError(f"Unknown LLM backend: {name} (expected ollama, openai or mock)")
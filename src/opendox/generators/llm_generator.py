@@ -1,47 +1,219 @@
-"""LLM-based documentation generator using Ollama."""
-import ollama
-from typing import Dict, Any
+"""LLM-based documentation generator."""
+import re
+import threading
+from typing import Dict, Any, List, Optional
 import time
 from rich.console import Console
 
+from opendox.core.tracing import tracer
+from opendox.generators.backends import LLMBackend, OllamaBackend
+
 console = Console()
 
+# Marker the model is asked to put before each function in a batched answer
+BATCH_MARKER = re.compile(r'^[\s#*]*FUNCTION\s+(\d+)\s*:', re.IGNORECASE)
+
+
+class ResponseSectionParser:
+    """Incrementally parse the sections of a structured LLM answer.
+    
+    Text can be fed in arbitrary chunks as it streams in. Once every expected
+    section has been seen and the last one is followed by a blank line or a
+    stop sequence, `complete` is set so the caller can stop generation.
+    """
+    
+    EXPECTED_SECTIONS = ('description', 'details', 'parameters', 'returns', 'notes')
+    STOP_SEQUENCES = ('```', '<|EOT|>')
+    
+    def __init__(self, expected=EXPECTED_SECTIONS):
+        self.expected = set(expected) if expected is not None else None
+        self.reset()
+    
+    def reset(self):
+        """Forget everything parsed so far (used when a request is retried)."""
+        self.description = ""
+        self.details = ""
+        self.parameters = []
+        self.returns = ""
+        self.notes = ""
+        self.current_section = None
+        self.seen = set()
+        self.complete = False
+        self._buffer = ""
+    
+    def feed(self, text: str):
+        """Consume a chunk of response text."""
+        if self.complete:
+            return
+        self._buffer += text
+        *lines, self._buffer = self._buffer.split('\n')
+        for line in lines:
+            self._feed_line(line)
+            if self.complete:
+                return
+    
+    def finish(self):
+        """Flush the final, unterminated line."""
+        if self._buffer and not self.complete:
+            self._feed_line(self._buffer)
+        self._buffer = ""
+    
+    def _feed_line(self, line: str):
+        line = line.strip()
+        if self.seen and any(stop in line for stop in self.STOP_SEQUENCES):
+            self.complete = self._all_seen()
+            if self.complete:
+                return
+        if line.startswith('DESCRIPTION:'):
+            self.description = line.replace('DESCRIPTION:', '').strip()
+            self.seen.add('description')
+        elif line.startswith('DETAILS:'):
+            self.current_section = 'details'
+            self.details = line.replace('DETAILS:', '').strip()
+        elif line.startswith('PARAMETERS:'):
+            self.current_section = 'parameters'
+        elif line.startswith('RETURNS:'):
+            self.current_section = 'returns'
+            self.returns = line.replace('RETURNS:', '').strip()
+        elif line.startswith('USAGE NOTES:') or line.startswith('NOTES:'):
+            self.current_section = 'notes'
+            self.notes = line.replace('USAGE NOTES:', '').replace('NOTES:', '').strip()
+        elif self.current_section == 'parameters' and line.startswith('-'):
+            self.parameters.append(line)
+        elif self.current_section == 'details' and line:
+            self.details += " " + line
+        elif self.current_section == 'returns' and line:
+            self.returns += " " + line
+        elif self.current_section == 'notes' and line:
+            self.notes += " " + line
+        elif not line and self.current_section and self._section_has_content(self.current_section):
+            # A blank line closes the current section
+            self.complete = self._all_seen()
+            return
+        else:
+            return
+        if self.current_section:
+            self.seen.add(self.current_section)
+    
+    def _all_seen(self) -> bool:
+        return self.expected is not None and self.expected <= self.seen
+    
+    def _section_has_content(self, section: str) -> bool:
+        return bool(getattr(self, section))
+
+
 class LLMGenerator:
-    """Generate documentation using Ollama."""
+    """Generate documentation with an LLM behind a pluggable backend.
+    
+    The backend (Ollama unless given) is not contacted until a prompt misses
+    the cache; its health is only checked once a request fails.
+    """
+    
+    # Expected answer length per function in a batched prompt
+    BATCH_TOKENS_PER_FUNCTION = 200
     
-    def __init__(self, model: str = "deepseek-coder:1.3b"):
+    def __init__(self, model: str = "deepseek-coder:1.3b", cache=None, stream: bool = True,
+                 backend: Optional[LLMBackend] = None):
         self.model = model
-        self.client = ollama.Client()
-        # Test connection on init
-        try:
-            self.client.list()
-            console.print(f"[green]✓ Connected to Ollama with model: {model}[/green]")
-        except Exception as e:
-            console.print(f"[yellow]⚠ Ollama connection issue: {e}[/yellow]")
-            console.print("[yellow]  Make sure Ollama is running: 'ollama serve'[/yellow]")
-            console.print(f"[yellow]  Make sure model is installed: 'ollama pull {model}'[/yellow]")
-    
-    def generate(self, prompt: str, max_tokens: int = 500) -> str:
-        """Generate text using Ollama with retry logic."""
+        self.backend = backend or OllamaBackend()
+        self.cache = cache  # Optional LLMResponseCache in front of generate()
+        self.stream = stream  # Stream answers so structured ones can stop early
+        self._checked = False
+        self._check_lock = threading.Lock()
+    
+    @property
+    def cache_model(self) -> str:
+        """Model name used in cache keys; Ollama keeps the bare name of earlier runs."""
+        if self.backend.name == 'ollama':
+            return self.model
+        return f"{self.backend.name}:{self.model}"
+    
+    def check_backend(self):
+        """Diagnose the backend after the first failed request, once per generator."""
+        with self._check_lock:
+            if self._checked:
+                return
+            self._checked = True
+            problem = self.backend.check(self.model)
+        if problem:
+            for line in problem.splitlines():
+                console.print(f"[yellow]⚠ {line.strip()}[/yellow]")
+    
+    def close(self):
+        """Release the backend's connections."""
+        self.backend.close()
+    
+    def generate(self, prompt: str, max_tokens: int = 500, sections: ResponseSectionParser = None) -> str:
+        """Generate text with retry logic.
+        
+        When ``sections`` is given, the answer is fed into it as it arrives
+        and, in streaming mode, generation stops as soon as the parser has
+        every section it expects.
+        """
+        options = {
+            'num_predict': max_tokens,
+            'temperature': 0.7,
+            'top_p': 0.9
+        }
+        
+        cache_key = None
+        if self.cache is not None:
+            # Answers cut short once their sections are complete are cached apart from full ones
+            early_stop = self.stream and sections is not None
+            key_options = dict(options, early_stop=True) if early_stop else options
+            cache_key = self.cache.make_key(self.cache_model, prompt, key_options)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                if sections is not None:
+                    sections.feed(cached)
+                    sections.finish()
+                return cached
+        
+        with tracer.span('llm', model=self.model, prompt_chars=len(prompt)):
+            return self._generate_with_retry(prompt, options, sections, cache_key)
+    
+    def _generate_with_retry(self, prompt: str, options: Dict[str, Any],
+                             sections: Optional[ResponseSectionParser], cache_key: Optional[str]) -> str:
+        """Call the backend up to three times, caching the first good answer."""
         for attempt in range(3):
             try:
-                response = self.client.generate(
-                    model=self.model, 
-                    prompt=prompt,
-                    options={
-                        'num_predict': max_tokens,
-                        'temperature': 0.7,
-                        'top_p': 0.9
-                    }
-                )
-                return response['response']
+                if sections is not None:
+                    sections.reset()
+                if self.stream and sections is not None:
+                    text = self._generate_streaming(prompt, options, sections)
+                else:
+                    text = self.backend.complete(self.model, prompt, options)
+                    if sections is not None:
+                        sections.feed(text)
+                if sections is not None:
+                    sections.finish()
+                if cache_key is not None:
+                    self.cache.put(cache_key, text)
+                return text
             except Exception as e:
+                if attempt == 0:
+                    self.check_backend()
                 if attempt == 2:
                     console.print(f"[red]✗ LLM generation failed after 3 attempts: {e}[/red]")
                     return self._fallback_documentation()
                 time.sleep(1)
         return self._fallback_documentation()
     
+    def _generate_streaming(self, prompt: str, options: Dict[str, Any], sections: ResponseSectionParser) -> str:
+        """Stream a response, hanging up once every expected section has arrived."""
+        chunks = []
+        stream = self.backend.stream(self.model, prompt, options)
+        try:
+            for piece in stream:
+                chunks.append(piece)
+                sections.feed(piece)
+                if sections.complete:
+                    break
+        finally:
+            # Closing the stream hangs up, which stops the server generating
+            stream.close()
+        return ''.join(chunks)
+    
     def generate_function_doc(self, function_data: Dict[str, Any]) -> str:
         """Generate comprehensive documentation for a function."""
         name = function_data.get('name', 'unknown')
@@ -84,13 +256,14 @@ Any important information about using this function
 
 Based on the function name '{name}', generate helpful documentation:"""
         
-        response = self.generate(prompt, max_tokens=500)
+        sections = ResponseSectionParser()
+        response = self.generate(prompt, max_tokens=500, sections=sections)
         
         if not response or response == self._fallback_documentation():
             # If LLM fails, create basic documentation from available info
             return self._create_basic_documentation(function_data)
         
-        return self.format_llm_response(response, function_data)
+        return self._format_sections(sections, function_data)
     
     def enhance_docstring(self, function_data: Dict[str, Any], existing: str) -> str:
         """Enhance an existing docstring with additional details."""
@@ -120,43 +293,126 @@ Return ONLY the enhanced documentation text, no code or quotes:"""
         
         return self.clean_response(response)
     
+    def pack_batches(self, functions: List[Dict[str, Any]], max_batch: int = 8, token_budget: int = 2048) -> List[List[Dict[str, Any]]]:
+        """Group functions into batches that fit one prompt.
+        
+        Functions with a substantial docstring are enhanced individually and
+        always get a batch of their own. Token counts are estimated at four
+        characters per token, plus room for each function's answer.
+        """
+        batches = []
+        current = []
+        used = self._estimate_tokens(self._batch_prompt([]))
+        for func in functions:
+            existing_doc = func.get('docstring', '') or ''
+            if len(existing_doc) > 50:
+                # Flush first: callers match results to functions in source order
+                if current:
+                    batches.append(current)
+                    current = []
+                    used = self._estimate_tokens(self._batch_prompt([]))
+                batches.append([func])
+                continue
+            cost = self._estimate_tokens(self._batch_entry(len(current) + 1, func)) + self.BATCH_TOKENS_PER_FUNCTION
+            if current and (len(current) >= max_batch or used + cost > token_budget):
+                batches.append(current)
+                current = []
+                used = self._estimate_tokens(self._batch_prompt([]))
+            current.append(func)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+    
+    def generate_batch_docs(self, functions: List[Dict[str, Any]]) -> List[str]:
+        """Document several functions from one module with a single prompt.
+        
+        The response is split on the FUNCTION markers and each part goes
+        through `format_llm_response`. Entries that are missing or cannot be
+        parsed fall back to an individual `generate_function_doc` call.
+        """
+        if len(functions) == 1:
+            return [self.generate_function_doc(functions[0])]
+        
+        prompt = self._batch_prompt(functions)
+        response = self.generate(prompt, max_tokens=self.BATCH_TOKENS_PER_FUNCTION * len(functions))
+        if response == self._fallback_documentation():
+            response = ""
+        sections = self._split_batch_response(response)
+        
+        docs = []
+        for index, func in enumerate(functions, start=1):
+            section = sections.get(index, "")
+            if 'DESCRIPTION:' in section:
+                docs.append(self.format_llm_response(section, func))
+            else:
+                docs.append(self.generate_function_doc(func))
+        return docs
+    
+    def _batch_entry(self, index: int, function_data: Dict[str, Any]) -> str:
+        """Describe one function inside a batched prompt."""
+        args = function_data.get('metadata', {}).get('args', [])
+        returns = function_data.get('metadata', {}).get('returns', 'None')
+        return (
+            f"FUNCTION {index}: {function_data.get('name', 'unknown')}\n"
+            f"Parameters: {', '.join(args) if args else 'None'}\n"
+            f"Return Type: {returns if returns else 'None'}\n"
+        )
+    
+    def _batch_prompt(self, functions: List[Dict[str, Any]]) -> str:
+        """Build a structured prompt covering several functions."""
+        entries = "\n".join(self._batch_entry(i, f) for i, f in enumerate(functions, start=1))
+        return f"""You are a technical documentation expert. Generate documentation for each of these Python functions.
+
+{entries}
+For EACH function, start a block with its marker line exactly as given (for example "FUNCTION 1: name") and then use this format:
+DESCRIPTION: [One clear sentence about what this function does]
+
+DETAILS: [2-3 sentences explaining how it works and when to use it]
+
+PARAMETERS:
+- parameter_name: [type] Description of what this parameter does
+
+RETURNS:
+[type] Description of what is returned
+
+USAGE NOTES:
+Any important information about using this function
+
+Document every function, in order:"""
+    
+    def _split_batch_response(self, response: str) -> Dict[int, str]:
+        """Split a batched response into per-function sections keyed by index."""
+        sections: Dict[int, List[str]] = {}
+        current = None
+        for line in response.split('\n'):
+            match = BATCH_MARKER.match(line)
+            if match:
+                current = int(match.group(1))
+                sections[current] = []
+            elif current is not None:
+                sections[current].append(line)
+        return {index: '\n'.join(lines) for index, lines in sections.items()}
+    
+    def _estimate_tokens(self, text: str) -> int:
+        """Rough token estimate used for batch packing."""
+        return len(text) // 4 + 1
+    
     def format_llm_response(self, response: str, function_data: Dict[str, Any]) -> str:
         """Format the LLM response into proper documentation."""
-        # Parse the structured response
-        lines = response.strip().split('\n')
+        sections = ResponseSectionParser(expected=None)
+        sections.feed(response.strip())
+        sections.finish()
+        return self._format_sections(sections, function_data)
+    
+    def _format_sections(self, sections: ResponseSectionParser, function_data: Dict[str, Any]) -> str:
+        """Build documentation text from parsed response sections."""
         formatted = []
-        
-        # Try to extract sections from the response
-        description = ""
-        details = ""
-        parameters = []
-        returns = ""
-        notes = ""
-        
-        current_section = None
-        for line in lines:
-            line = line.strip()
-            if line.startswith('DESCRIPTION:'):
-                description = line.replace('DESCRIPTION:', '').strip()
-            elif line.startswith('DETAILS:'):
-                current_section = 'details'
-                details = line.replace('DETAILS:', '').strip()
-            elif line.startswith('PARAMETERS:'):
-                current_section = 'parameters'
-            elif line.startswith('RETURNS:'):
-                current_section = 'returns'
-                returns = line.replace('RETURNS:', '').strip()
-            elif line.startswith('USAGE NOTES:') or line.startswith('NOTES:'):
-                current_section = 'notes'
-                notes = line.replace('USAGE NOTES:', '').replace('NOTES:', '').strip()
-            elif current_section == 'parameters' and line.startswith('-'):
-                parameters.append(line)
-            elif current_section == 'details' and line:
-                details += " " + line
-            elif current_section == 'returns' and line:
-                returns += " " + line
-            elif current_section == 'notes' and line:
-                notes += " " + line
+        description = sections.description
+        details = sections.details
+        parameters = sections.parameters
+        returns = sections.returns
+        notes = sections.notes
         
         # Build the formatted documentation
         if description:
@@ -312,6 +568,10 @@ Return ONLY the enhanced documentation text, no code or quotes:"""
         else:
             return f"Parameter for {param_name.replace('_', ' ')}"
     
+    def is_fallback(self, doc: str, function_data: Dict[str, Any]) -> bool:
+        """Whether ``doc`` was built without a usable LLM answer."""
+        return doc in (self._fallback_documentation(), self._create_basic_documentation(function_data))
+    
     def _fallback_documentation(self) -> str:
         """Return a fallback when generation completely fails."""
         return "Function implementation. See source code for details."
@@ -1,52 +1,64 @@
 """Mock documentation generator for testing."""
-from typing import Dict, Any
-
-class MockLLMGenerator:
-    """Generate mock documentation for testing."""
-    
-    def __init__(self, model: str = "mock"):
-        self.model = model
-    
-    def generate(self, prompt: str, max_tokens: int = 200) -> str:
-        """Generate mock response."""
-        return "This is mock documentation for testing purposes."
-    
-    def generate_function_doc(self, function_data: Dict[str, Any]) -> str:
-        """Generate mock function documentation."""
-        name = function_data.get('name', 'unknown')
-        args = function_data.get('metadata', {}).get('args', [])
-        language = function_data.get('language', 'python')
-        
-        if language == 'javascript' or language == 'typescript':
-            doc = f"""
-Processes data and returns a result.
-
-@param {{{', '.join(args) if args else 'void'}}} - Input parameters
-@returns {{any}} Processed result
-"""
-        elif language == 'python':
-            doc = f"""
-Performs operations on the given inputs.
+import re
+import time
+from typing import Dict, Any, Iterator, Optional
 
-Args:
-    {chr(10).join([f'    {arg}: Input parameter.' for arg in args]) if args else '    None'}
+from opendox.generators.llm_generator import LLMGenerator
 
-Returns:
-    Processed result or None.
-"""
-        elif language == 'go':
-            doc = f"""
-// {name} performs the required operation.
-// Takes {len(args)} parameters and returns a result.
-"""
-        else:
-            doc = f"""
-Function {name} with {len(args)} parameters.
-Performs the required operation and returns a result.
+MOCK_ANSWER = """DESCRIPTION: Performs operations on the given inputs.
+
+DETAILS: Mock documentation for testing purposes.
+
+PARAMETERS:
+- args: Input parameters.
+
+RETURNS:
+Processed result or None.
+
+USAGE NOTES:
+Generated by the mock backend.
 """
-        
-        return doc.strip()
+
+
+class MockBackend:
+    """LLM backend that answers every prompt with canned, well-formed text.
+    
+    Runs the real `LLMGenerator` (prompts, caching, streaming, batch
+    splitting) without a model server. Batched prompts get one answer block
+    per ``FUNCTION n:`` marker. ``latency`` seconds are slept per request.
+    """
+    
+    name = 'mock'
+    
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.requests = 0
+    
+    def complete(self, model: str, prompt: str, options: Dict[str, Any]) -> str:
+        self.requests += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+        markers = re.findall(r'^FUNCTION \d+: .*$', prompt, re.MULTILINE)
+        if not markers:
+            return MOCK_ANSWER
+        return '\n'.join(f"{marker}\n{MOCK_ANSWER}" for marker in markers)
+    
+    def stream(self, model: str, prompt: str, options: Dict[str, Any]) -> Iterator[str]:
+        yield from self.complete(model, prompt, options).splitlines(keepends=True)
+    
+    def check(self, model: str) -> Optional[str]:
+        return None
+    
+    def close(self):
+        pass
+
+
+class MockLLMGenerator(LLMGenerator):
+    """`LLMGenerator` backed by `MockBackend`, for tests and benchmarks.
+    
+    ``latency`` seconds are slept per request to stand in for LLM round-trips
+    when benchmarking the pipeline.
+    """
     
-    def clean_response(self, response: str) -> str:
-        """Clean up response."""
-        return response.strip()
\ No newline at end of file
+    def __init__(self, model: str = "mock", latency: float = 0.0):
+        super().__init__(model=model, backend=MockBackend(latency=latency))
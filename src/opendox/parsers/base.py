@@ -1,24 +1,193 @@
 """Base parser interface."""
+import sys
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from array import array
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-
-@dataclass
-class CodeElement:
-    """Represents a code element (function, class, etc)."""
-    name: str
-    type: str
-    line_start: int
-    line_end: Optional[int] = None
-    docstring: Optional[str] = None
-    signature: Optional[str] = None
-    metadata: Dict[str, Any] = None
-    
-    def __post_init__(self):
-        if self.metadata is None:
-            self.metadata = {}
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+class _ElementAccess:
+    """Mapping-style access shared by `CodeElement` and `ElementView`.
+
+    The generator and formatter read elements with ``element.get('name')`` and
+    ``element['metadata']['args']``; supporting that directly means elements
+    never have to be copied into dicts on their way through the pipeline.
+    """
+
+    __slots__ = ()
+    FIELDS = ("name", "type", "line_start", "line_end", "docstring", "signature", "metadata")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self.FIELDS else default
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.FIELDS
+
+    def keys(self):
+        return self.FIELDS
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, _ElementAccess):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+
+class CodeElement(_ElementAccess):
+    """Represents a code element (function, class, etc).
+
+    Slotted, with interned ``name`` and ``type``; ``metadata`` is created on
+    first access.
+    """
+
+    __slots__ = ("name", "type", "line_start", "line_end", "docstring", "signature", "_metadata")
+
+    def __init__(self, name: str, type: str, line_start: int, line_end: Optional[int] = None,
+                 docstring: Optional[str] = None, signature: Optional[str] = None,
+                 metadata: Optional[Dict[str, Any]] = None):
+        self.name = sys.intern(name) if isinstance(name, str) else name
+        self.type = sys.intern(type)
+        self.line_start = line_start
+        self.line_end = line_end
+        self.docstring = docstring
+        self.signature = signature
+        self._metadata = metadata or None
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value: Optional[Dict[str, Any]]):
+        self._metadata = value or None
+
+    def __getstate__(self):
+        return (self.name, self.type, self.line_start, self.line_end,
+                self.docstring, self.signature, self._metadata)
+
+    def __setstate__(self, state):
+        (self.name, self.type, self.line_start, self.line_end,
+         self.docstring, self.signature, self._metadata) = state
+
+
+class ElementStore:
+    """Columnar storage for many code elements.
+
+    Line numbers live in ``array('l')`` columns and types in a byte column
+    indexing a small table of interned type names; names are interned and the
+    remaining fields are kept in one list each, with empty metadata stored as
+    None. Indexing returns an `ElementView`, a two-slot handle that reads
+    straight from the columns and can be passed anywhere a `CodeElement` is
+    accepted.
+    """
+
+    def __init__(self, elements: Iterable[Any] = ()):
+        self.types: List[str] = []
+        self._type_codes: Dict[str, int] = {}
+        self.type_column = array('B')
+        self.line_starts = array('l')
+        self.line_ends = array('l')  # 0 means unknown
+        self.names: List[str] = []
+        self.docstrings: List[Optional[str]] = []
+        self.signatures: List[Optional[str]] = []
+        self.metadatas: List[Optional[Dict[str, Any]]] = []
+        self.extend(elements)
+
+    def append(self, element: Any) -> "ElementView":
+        """Add a `CodeElement`, `ElementView` or element dict."""
+        get = element.get
+        type_name = get('type') or ''
+        code = self._type_codes.get(type_name)
+        if code is None:
+            code = self._type_codes[type_name] = len(self.types)
+            self.types.append(sys.intern(type_name))
+        self.type_column.append(code)
+        self.line_starts.append(get('line_start') or 0)
+        self.line_ends.append(get('line_end') or 0)
+        name = get('name')
+        self.names.append(sys.intern(name) if isinstance(name, str) else name)
+        self.docstrings.append(get('docstring'))
+        self.signatures.append(get('signature'))
+        self.metadatas.append(get('metadata') or None)
+        return ElementView(self, len(self.names) - 1)
+
+    def extend(self, elements: Iterable[Any]):
+        for element in elements:
+            self.append(element)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [ElementView(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("element index out of range")
+        return ElementView(self, index)
+
+    def __iter__(self) -> Iterator["ElementView"]:
+        for index in range(len(self)):
+            yield ElementView(self, index)
+
+
+class ElementView(_ElementAccess):
+    """Read-only view of one element in an `ElementStore`."""
+
+    __slots__ = ("store", "index")
+
+    def __init__(self, store: ElementStore, index: int):
+        self.store = store
+        self.index = index
+
+    @property
+    def name(self) -> str:
+        return self.store.names[self.index]
+
+    @property
+    def type(self) -> str:
+        return self.store.types[self.store.type_column[self.index]]
+
+    @property
+    def line_start(self) -> int:
+        return self.store.line_starts[self.index]
+
+    @property
+    def line_end(self) -> Optional[int]:
+        return self.store.line_ends[self.index] or None
+
+    @property
+    def docstring(self) -> Optional[str]:
+        return self.store.docstrings[self.index]
+
+    @property
+    def signature(self) -> Optional[str]:
+        return self.store.signatures[self.index]
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self.store.metadatas[self.index] or {}
+
+    def to_element(self) -> CodeElement:
+        """Copy the viewed element out of the store."""
+        return CodeElement(self.name, self.type, self.line_start, self.line_end,
+                           self.docstring, self.signature, self.store.metadatas[self.index])
 
 
 class BaseParser(ABC):
@@ -1,7 +1,10 @@
 """Python code parser using AST."""
 import ast
+import hashlib
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
+
+from opendox.core.tracing import tracer
 
 from .base import BaseParser, CodeElement
 
@@ -9,12 +12,18 @@ from .base import BaseParser, CodeElement
 class PythonParser(BaseParser):
     """Parser for Python source files."""
     
+    VERSION = 5  # Bump when the extracted elements change; invalidates cached parses
+    
     @property
     def supported_extensions(self) -> List[str]:
         return [".py", ".pyw"]
     
     def parse_file(self, file_path: Path) -> Dict[str, Any]:
         """Parse Python file and extract all elements."""
+        with tracer.span("parse", file=file_path):
+            return self._parse_file(file_path)
+    
+    def _parse_file(self, file_path: Path) -> Dict[str, Any]:
         try:
             with open(file_path, "r", encoding="utf-8") as f:
                 content = f.read()
@@ -26,98 +35,48 @@ class PythonParser(BaseParser):
         except SyntaxError as e:
             return {"error": f"Syntax error: {e}", "file": str(file_path)}
         
-        functions = self.extract_functions(tree)
-        classes = self.extract_classes(tree)
+        # Elements are fingerprinted by source span for per-symbol change detection
+        lines = content.splitlines()
+        collector = _ModuleCollector(self, lines)
+        collector.visit(tree)
+        functions = collector.functions()
+        classes = collector.classes()
         
         return {
             "file": str(file_path),
             "language": "python",
             "functions": functions,
             "classes": classes,
-            "imports": self._extract_imports(tree),
-            "total_lines": len(content.splitlines()),
+            "imports": collector.imports,
+            "total_lines": len(lines),
         }
     
-    # src/opendox/parsers/python_parser.py
-# Replace the simplified version with full implementation
-
     def extract_functions(self, tree: ast.AST) -> List[CodeElement]:
         """Extract all function definitions with full details."""
-        functions = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef or ast.AsyncFunctionDef):
-                element = CodeElement(
-                    name=node.name,
-                    type="function",
-                    line_start=node.lineno,
-                    line_end=node.end_lineno,
-                    docstring=ast.get_docstring(node),
-                    signature=self._get_function_signature(node),
-                    metadata={
-                        "args": [arg.arg for arg in node.args.args],
-                        "returns": ast.unparse(node.returns) if node.returns else None,
-                        "decorators": [self._get_decorator_name(d) for d in node.decorator_list],
-                        "is_async": isinstance(node, ast.AsyncFunctionDef),
-                    }
-                )
-                functions.append(element)
-        return functions
+        collector = _ModuleCollector(self)
+        collector.visit(tree)
+        return collector.functions()
 
     def _get_decorator_name(self, decorator):
         """Extract decorator name safely."""
         if hasattr(decorator, 'id'):
             return decorator.id
-        elif hasattr(decorator, 'attr'):
-            return f"{decorator.value.id}.{decorator.attr}"
         return ast.unparse(decorator)
     
     def extract_classes(self, tree: ast.AST) -> List[CodeElement]:
         """Extract all class definitions."""
-        classes = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                methods = [m.name for m in node.body 
-                          if isinstance(m, ast.FunctionDef)]
-                
-                element = CodeElement(
-                    name=node.name,
-                    type="class",
-                    line_start=node.lineno,
-                    line_end=node.end_lineno,
-                    docstring=ast.get_docstring(node),
-                    metadata={
-                        "methods": methods,
-                        "bases": [self._get_name(base) for base in node.bases],
-                        "decorators": [d.id if hasattr(d, "id") else str(d) 
-                                     for d in node.decorator_list],
-                    }
-                )
-                classes.append(element)
-        return classes
+        collector = _ModuleCollector(self)
+        collector.visit(tree)
+        return collector.classes()
     
     def _extract_imports(self, tree: ast.AST) -> List[Dict[str, Any]]:
         """Extract import statements."""
-        imports = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    imports.append({
-                        "module": alias.name,
-                        "alias": alias.asname,
-                        "type": "import"
-                    })
-            elif isinstance(node, ast.ImportFrom):
-                for alias in node.names:
-                    imports.append({
-                        "module": node.module,
-                        "name": alias.name,
-                        "alias": alias.asname,
-                        "type": "from"
-                    })
-        return imports
+        collector = _ModuleCollector(self)
+        collector.visit(tree)
+        return collector.imports
     
     def _get_function_signature(self, node: ast.FunctionDef) -> str:
-        """Extract function signature as string."""
+        """Get function signature as string."""
         args = []
         for arg in node.args.args:
             arg_str = arg.arg
@@ -131,6 +90,13 @@ class PythonParser(BaseParser):
         
         return signature
     
+    def _fingerprint(self, lines: List[str], node: ast.AST) -> str:
+        """Hash the source lines of a definition, decorators included."""
+        start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+        end = node.end_lineno or node.lineno
+        span = "\n".join(lines[start - 1:end])
+        return hashlib.blake2b(span.encode("utf-8"), digest_size=16).hexdigest()
+    
     def _get_name(self, node: ast.AST) -> str:
         """Get name from AST node."""
         if hasattr(node, "id"):
@@ -138,4 +104,123 @@ class PythonParser(BaseParser):
         elif hasattr(node, "name"):
             return node.name
         else:
-            return ast.unparse(node)
\ No newline at end of file
+            return ast.unparse(node)
+
+
+# Fields holding statements (or except handlers / match cases that hold them)
+_STATEMENT_FIELDS = frozenset({"body", "orelse", "finalbody", "handlers", "cases"})
+
+
+class _ModuleCollector(ast.NodeVisitor):
+    """Collect functions, classes and imports in a single pass over the tree.
+    
+    Elements are returned in the breadth-first order ``ast.walk`` produced
+    (sorting by tree depth, then by visiting order) so callers that take the
+    first few symbols of a module keep seeing the same ones.
+    """
+    
+    def __init__(self, parser: PythonParser, lines: Optional[List[str]] = None):
+        self.parser = parser
+        self.lines = lines  # Source lines; elements are fingerprinted when given
+        self._functions: List[Tuple[int, int, CodeElement]] = []
+        self._classes: List[Tuple[int, int, CodeElement]] = []
+        self.imports: List[Dict[str, Any]] = []
+        self._scope: List[Tuple[str, bool]] = []  # (qualname, is_class)
+        self._depth = 0
+        self._order = 0
+    
+    def functions(self) -> List[CodeElement]:
+        return [element for _, _, element in sorted(self._functions, key=lambda item: item[:2])]
+    
+    def classes(self) -> List[CodeElement]:
+        return [element for _, _, element in sorted(self._classes, key=lambda item: item[:2])]
+    
+    def _qualname(self, name: str) -> str:
+        if not self._scope:
+            return name
+        parent, is_class = self._scope[-1]
+        return f"{parent}.{name}" if is_class else f"{parent}.<locals>.{name}"
+    
+    def generic_visit(self, node: ast.AST):
+        # Definitions and imports only occur in statement lists, so
+        # expression subtrees are never entered
+        self._depth += 1
+        for field in node._fields:
+            if field in _STATEMENT_FIELDS:
+                for child in getattr(node, field):
+                    self.visit(child)
+        self._depth -= 1
+    
+    def _visit_scope(self, node: ast.AST, qualname: str, is_class: bool):
+        self._scope.append((qualname, is_class))
+        self.generic_visit(node)
+        self._scope.pop()
+    
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        qualname = self._qualname(node.name)
+        is_method = bool(self._scope) and self._scope[-1][1]
+        element = CodeElement(
+            name=node.name,
+            type="function",
+            line_start=node.lineno,
+            line_end=node.end_lineno,
+            docstring=ast.get_docstring(node),
+            signature=self.parser._get_function_signature(node),
+            metadata={
+                "args": [arg.arg for arg in node.args.args],
+                "returns": ast.unparse(node.returns) if node.returns else None,
+                "decorators": [self.parser._get_decorator_name(d) for d in node.decorator_list],
+                "is_async": isinstance(node, ast.AsyncFunctionDef),
+                "qualname": qualname,
+                "is_method": is_method,
+            }
+        )
+        if self.lines is not None:
+            element.metadata["fingerprint"] = self.parser._fingerprint(self.lines, node)
+        self._functions.append((self._depth, self._next(), element))
+        self._visit_scope(node, qualname, False)
+    
+    visit_AsyncFunctionDef = visit_FunctionDef
+    
+    def visit_ClassDef(self, node: ast.ClassDef):
+        qualname = self._qualname(node.name)
+        element = CodeElement(
+            name=node.name,
+            type="class",
+            line_start=node.lineno,
+            line_end=node.end_lineno,
+            docstring=ast.get_docstring(node),
+            metadata={
+                "methods": [m.name for m in node.body
+                            if isinstance(m, (ast.FunctionDef, ast.AsyncFunctionDef))],
+                "bases": [self.parser._get_name(base) for base in node.bases],
+                "decorators": [d.id if hasattr(d, "id") else str(d)
+                               for d in node.decorator_list],
+                "qualname": qualname,
+            }
+        )
+        if self.lines is not None:
+            element.metadata["fingerprint"] = self.parser._fingerprint(self.lines, node)
+        self._classes.append((self._depth, self._next(), element))
+        self._visit_scope(node, qualname, True)
+    
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            self.imports.append({
+                "module": alias.name,
+                "alias": alias.asname,
+                "type": "import"
+            })
+    
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        for alias in node.names:
+            self.imports.append({
+                "module": node.module,
+                "name": alias.name,
+                "alias": alias.asname,
+                "type": "from"
+            })
+    
+    def _next(self) -> int:
+        self._order += 1
+        return self._order
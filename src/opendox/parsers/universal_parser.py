@@ -1,71 +1,113 @@
 """Universal parser using Tree-sitter for multiple languages."""
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 import ast  # Fallback for Python parsing
 
+from opendox.core.tracing import tracer
+
 try:
     import tree_sitter_languages as tsl
-    from tree_sitter import Node
+    from tree_sitter import Node, Parser
     TREESITTER_AVAILABLE = True
 except ImportError:
     TREESITTER_AVAILABLE = False
     tsl = None
     Node = None
+    Parser = None
+
+# Tree-sitter grammar for each supported extension
+EXTENSION_LANGUAGES = {
+    '.py': 'python',
+    '.js': 'javascript',
+    '.jsx': 'javascript',
+    '.ts': 'typescript',
+    '.tsx': 'tsx',
+    '.go': 'go',
+    '.rs': 'rust',
+    '.java': 'java',
+    '.cpp': 'cpp',
+    '.c': 'c',
+}
+
+
+@lru_cache(maxsize=None)
+def load_language(name: str):
+    """Load a grammar once per process."""
+    return tsl.get_language(name)
+
+
+_thread_parsers = threading.local()
+
+
+def load_parser(name: str):
+    """Parser for grammar ``name``, created once per thread.
+    
+    Languages are immutable and shared, but a `Parser` holds the state of
+    the parse in progress, so threads must not share one.
+    """
+    parsers = getattr(_thread_parsers, 'parsers', None)
+    if parsers is None:
+        parsers = _thread_parsers.parsers = {}
+    parser = parsers.get(name)
+    if parser is None:
+        parser = Parser()
+        parser.set_language(load_language(name))
+        parsers[name] = parser
+    return parser
+
 
 class UniversalParser:
-    """Parse multiple languages using Tree-sitter."""
+    """Parse multiple languages using Tree-sitter.
     
-    def __init__(self):
-        self.available = False
-        self.parsers = {}
-        
-        if not TREESITTER_AVAILABLE:
-            self.supported_extensions = ['.py']
-            return
-        
-        try:
-            # Get language parsers from tree-sitter-languages
-            self.parsers = {
-                '.py': tsl.get_language('python'),
-                '.js': tsl.get_language('javascript'),
-                '.jsx': tsl.get_language('javascript'),
-                '.ts': tsl.get_language('typescript'),
-                '.tsx': tsl.get_language('tsx'),
-                '.go': tsl.get_language('go'),
-                '.rs': tsl.get_language('rust'),
-                '.java': tsl.get_language('java'),
-                '.cpp': tsl.get_language('cpp'),
-                '.c': tsl.get_language('c'),
-            }
-            
-            # Get parsers for queries
-            self.parser_objects = {
-                ext: tsl.get_parser(lang)
-                for ext, lang in {
-                    '.py': 'python',
-                    '.js': 'javascript',
-                    '.jsx': 'javascript',
-                    '.ts': 'typescript',
-                    '.tsx': 'tsx',
-                    '.go': 'go',
-                    '.rs': 'rust',
-                    '.java': 'java',
-                    '.cpp': 'cpp',
-                    '.c': 'c',
-                }.items()
-            }
-            
-            self.supported_extensions = list(self.parsers.keys())
-            self.available = True
-            
-        except Exception as e:
-            print(f"Tree-sitter initialization failed: {e}")
+    Grammars and parsers are loaded the first time a file with a given
+    extension is parsed, so constructing a parser is free and a Python-only
+    run never loads the other grammars. With ``incremental=True`` the last
+    tree of every parsed path is kept, and parsing the path again after an
+    edit reparses and re-extracts only what the edit touched.
+    
+    Incremental parsing is library API for long-lived callers such as
+    editor integrations. The pipeline and ``opendox watch`` document Python
+    through `PythonParser` and do not use it.
+    """
+    
+    VERSION = 2  # Bump when the extracted elements change; invalidates cached parses
+    
+    def __init__(self, incremental: bool = False):
+        self.available = TREESITTER_AVAILABLE
+        self.incremental = incremental
+        self.trees: Dict[str, "ParsedFile"] = {}  # Last parse per path, when incremental
+        self.reparse_stats = {'cold': 0, 'incremental': 0, 'unchanged': 0, 'reused': 0, 'extracted': 0}
+        if self.available:
+            self.supported_extensions = list(EXTENSION_LANGUAGES)
+        else:
             self.supported_extensions = ['.py']
-            self.available = False
+    
+    def parser_for(self, extension: str):
+        """Tree-sitter parser for ``extension`` on this thread, created on first use."""
+        return load_parser(EXTENSION_LANGUAGES[extension])
+    
+    @property
+    def parsers(self) -> Dict[str, Any]:
+        """Language per extension, as before lazy loading; loads every grammar."""
+        if not self.available:
+            return {}
+        return {ext: load_language(name) for ext, name in EXTENSION_LANGUAGES.items()}
+    
+    @property
+    def parser_objects(self) -> Dict[str, Any]:
+        """This thread's parser per extension; loads every grammar."""
+        if not self.available:
+            return {}
+        return {ext: load_parser(name) for ext, name in EXTENSION_LANGUAGES.items()}
     
     def parse_file(self, file_path: Path) -> Dict[str, Any]:
         """Parse file using Tree-sitter or fallback to AST for Python."""
-        
+        with tracer.span('parse', file=file_path):
+            return self._parse_file(file_path)
+    
+    def _parse_file(self, file_path: Path) -> Dict[str, Any]:
         # Always support Python with AST fallback
         if file_path.suffix == '.py' and not self.available:
             return self._parse_python_fallback(file_path)
@@ -76,38 +118,123 @@ class UniversalParser:
         if file_path.suffix not in self.supported_extensions:
             return {'error': f'Unsupported file type: {file_path.suffix}', 'file': str(file_path)}
         
+        try:
+            parser = self.parser_for(file_path.suffix)
+        except Exception as e:
+            if file_path.suffix == '.py':
+                return self._parse_python_fallback(file_path)
+            return {'error': f'Tree-sitter grammar failed to load: {e}', 'file': str(file_path)}
+        
         try:
             with open(file_path, 'rb') as f:
                 content = f.read()
             
-            # Parse with tree-sitter-languages
-            parser = self.parser_objects[file_path.suffix]
-            tree = parser.parse(content)
-            
-            # Extract functions and classes based on language
-            if file_path.suffix == '.py':
-                return self._extract_python(tree, content, file_path)
-            elif file_path.suffix in ['.js', '.jsx', '.ts', '.tsx']:
-                return self._extract_javascript(tree, content, file_path)
-            elif file_path.suffix == '.go':
-                return self._extract_go(tree, content, file_path)
-            elif file_path.suffix == '.rs':
-                return self._extract_rust(tree, content, file_path)
-            elif file_path.suffix == '.java':
-                return self._extract_java(tree, content, file_path)
-            elif file_path.suffix in ['.c', '.cpp']:
-                return self._extract_c_cpp(tree, content, file_path)
-            else:
+            extract = self._extractor(file_path.suffix)
+            if extract is None:
                 return {
                     'functions': [],
                     'classes': [],
                     'file': str(file_path),
                     'language': file_path.suffix[1:]
                 }
+            if self.incremental:
+                return self._parse_incremental(parser, extract, content, file_path)
+            
+            tree = parser.parse(content)
+            return extract(tree.root_node, content, file_path)
                 
         except Exception as e:
+            self.trees.pop(str(file_path), None)
             return {'error': str(e), 'file': str(file_path)}
     
+    def _extractor(self, extension: str) -> Optional[Callable]:
+        """Extraction method for a file extension."""
+        if extension == '.py':
+            return self._extract_python
+        elif extension in ['.js', '.jsx', '.ts', '.tsx']:
+            return self._extract_javascript
+        elif extension == '.go':
+            return self._extract_go
+        elif extension == '.rs':
+            return self._extract_rust
+        elif extension == '.java':
+            return self._extract_java
+        elif extension in ['.c', '.cpp']:
+            return self._extract_c_cpp
+        return None
+    
+    def _parse_incremental(self, parser, extract: Callable, content: bytes, file_path: Path) -> Dict[str, Any]:
+        """Parse ``file_path``, reusing the tree and elements from its last parse.
+        
+        The byte range that differs from the previous content becomes a
+        single ``tree.edit``; tree-sitter then reparses only what the edit
+        invalidated. Elements are kept per top-level node, and only nodes
+        overlapping the edit or tree-sitter's changed ranges are extracted
+        again. Nodes after the edit reuse their elements with line numbers
+        shifted.
+        """
+        key = str(file_path)
+        previous = self.trees.get(key)
+        if previous is not None and previous.content == content:
+            self.reparse_stats['unchanged'] += 1
+            return previous.result(file_path)
+        
+        if previous is None:
+            tree = parser.parse(content)
+            changed: List[Tuple[int, int]] = []
+            self.reparse_stats['cold'] += 1
+        else:
+            old = previous.content
+            edit_start = _common_prefix(old, content)
+            suffix = _common_suffix(old, content, min(len(old), len(content)) - edit_start)
+            old_end, new_end = len(old) - suffix, len(content) - suffix
+            tree = previous.tree
+            tree.edit(
+                start_byte=edit_start,
+                old_end_byte=old_end,
+                new_end_byte=new_end,
+                start_point=_point(old, edit_start),
+                old_end_point=_point(old, old_end),
+                new_end_point=_point(content, new_end),
+            )
+            new_tree = parser.parse(content, tree)
+            changed = [(r.start_byte, r.end_byte) for r in tree.changed_ranges(new_tree)]
+            changed.append((edit_start, new_end))
+            tree = new_tree
+            shift_bytes = new_end - old_end
+            shift_lines = content.count(b'\n', edit_start, new_end) - old.count(b'\n', edit_start, old_end)
+            old_chunks = {chunk[0]: chunk for chunk in previous.chunks}
+            self.reparse_stats['incremental'] += 1
+        
+        chunks = []
+        language = None
+        for node in tree.root_node.children:
+            node_start, node_end = node.start_byte, node.end_byte
+            if previous is not None and not any(node_start <= hi and lo <= node_end for lo, hi in changed):
+                # Untouched: same bytes before the edit, shifted bytes after it
+                offset = 0 if node_end < edit_start else shift_bytes
+                chunk = old_chunks.get(node_start - offset)
+                if chunk is not None and chunk[1] == node_end - offset:
+                    if offset:
+                        chunk = _shift_chunk(chunk, offset, shift_lines)
+                    chunks.append(chunk)
+                    self.reparse_stats['reused'] += 1
+                    continue
+            result = extract(node, content, file_path)
+            language = result['language']
+            chunks.append((node_start, node_end, result['functions'], result['classes']))
+            self.reparse_stats['extracted'] += 1
+        
+        if language is None:
+            language = previous.language if previous is not None else extract(tree.root_node, content, file_path)['language']
+        parsed = ParsedFile(content, tree, chunks, language)
+        self.trees[key] = parsed
+        return parsed.result(file_path)
+    
+    def forget(self, file_path: Path):
+        """Drop the tree kept for ``file_path`` (e.g. after it was deleted)."""
+        self.trees.pop(str(file_path), None)
+    
     def _parse_python_fallback(self, file_path: Path) -> Dict[str, Any]:
         """Fallback Python parsing using AST."""
         try:
@@ -144,46 +271,39 @@ class UniversalParser:
         except Exception as e:
             return {'error': str(e), 'file': str(file_path)}
     
-    def _extract_python(self, tree, content: bytes, file_path: Path) -> Dict[str, Any]:
+    def _extract_python(self, root, content: bytes, file_path: Path) -> Dict[str, Any]:
         """Extract Python elements from tree."""
         functions = []
         classes = []
+        text = SourceText(content)
         
-        def traverse(node):
+        for node in walk_tree(root, SKIP_TYPES['python']):
             if node.type == 'function_definition':
                 name_node = node.child_by_field_name('name')
                 if name_node:
-                    name = content[name_node.start_byte:name_node.end_byte].decode('utf-8')
-                    
                     # Get parameters
                     params_node = node.child_by_field_name('parameters')
                     params = []
                     if params_node:
                         for child in params_node.children:
                             if child.type == 'identifier':
-                                params.append(content[child.start_byte:child.end_byte].decode('utf-8'))
+                                params.append(text(child))
                     
                     functions.append({
-                        'name': name,
+                        'name': text(name_node),
                         'line_start': name_node.start_point[0] + 1,
                         'metadata': {'args': params},
-                        'docstring': self._extract_docstring(node, content)
+                        'docstring': self._extract_docstring(node, text)
                     })
             
             elif node.type == 'class_definition':
                 name_node = node.child_by_field_name('name')
                 if name_node:
-                    name = content[name_node.start_byte:name_node.end_byte].decode('utf-8')
                     classes.append({
-                        'name': name,
+                        'name': text(name_node),
                         'line_start': name_node.start_point[0] + 1,
-                        'docstring': self._extract_docstring(node, content)
+                        'docstring': self._extract_docstring(node, text)
                     })
-            
-            for child in node.children:
-                traverse(child)
-        
-        traverse(tree.root_node)
         
         return {
             'functions': functions,
@@ -192,21 +312,23 @@ class UniversalParser:
             'language': 'python'
         }
     
-    def _extract_javascript(self, tree, content: bytes, file_path: Path) -> Dict[str, Any]:
+    def _extract_javascript(self, root, content: bytes, file_path: Path) -> Dict[str, Any]:
         """Extract JavaScript/TypeScript elements."""
         functions = []
         classes = []
+        text = SourceText(content)
+        language = 'javascript' if file_path.suffix in ['.js', '.jsx'] else 'typescript'
         
-        def traverse(node):
+        for node in walk_tree(root, SKIP_TYPES[language]):
             if node.type in ['function_declaration', 'function', 'arrow_function', 'method_definition']:
                 name_node = node.child_by_field_name('name')
                 if name_node:
-                    name = content[name_node.start_byte:name_node.end_byte].decode('utf-8')
+                    name = text(name_node)
                 elif node.parent and node.parent.type == 'variable_declarator':
                     # Arrow function assigned to variable
                     name_node = node.parent.child_by_field_name('name')
                     if name_node:
-                        name = content[name_node.start_byte:name_node.end_byte].decode('utf-8')
+                        name = text(name_node)
                     else:
                         name = 'anonymous'
                 else:
@@ -222,43 +344,32 @@ class UniversalParser:
             elif node.type in ['class_declaration', 'class']:
                 name_node = node.child_by_field_name('name')
                 if name_node:
-                    name = content[name_node.start_byte:name_node.end_byte].decode('utf-8')
                     classes.append({
-                        'name': name,
+                        'name': text(name_node),
                         'line_start': name_node.start_point[0] + 1
                     })
-            
-            for child in node.children:
-                traverse(child)
-        
-        traverse(tree.root_node)
         
         return {
             'functions': functions,
             'classes': classes,
             'file': str(file_path),
-            'language': 'javascript' if file_path.suffix in ['.js', '.jsx'] else 'typescript'
+            'language': language
         }
     
-    def _extract_go(self, tree, content: bytes, file_path: Path) -> Dict[str, Any]:
+    def _extract_go(self, root, content: bytes, file_path: Path) -> Dict[str, Any]:
         """Extract Go elements."""
         functions = []
+        text = SourceText(content)
         
-        def traverse(node):
+        for node in walk_tree(root, SKIP_TYPES['go']):
             if node.type == 'function_declaration':
                 name_node = node.child_by_field_name('name')
                 if name_node:
-                    name = content[name_node.start_byte:name_node.end_byte].decode('utf-8')
                     functions.append({
-                        'name': name,
+                        'name': text(name_node),
                         'line_start': name_node.start_point[0] + 1,
                         'metadata': {'args': []}
                     })
-            
-            for child in node.children:
-                traverse(child)
-        
-        traverse(tree.root_node)
         
         return {
             'functions': functions,
@@ -267,34 +378,28 @@ class UniversalParser:
             'language': 'go'
         }
     
-    def _extract_rust(self, tree, content: bytes, file_path: Path) -> Dict[str, Any]:
+    def _extract_rust(self, root, content: bytes, file_path: Path) -> Dict[str, Any]:
         """Extract Rust elements."""
         functions = []
         structs = []
+        text = SourceText(content)
         
-        def traverse(node):
+        for node in walk_tree(root, SKIP_TYPES['rust']):
             if node.type == 'function_item':
                 name_node = node.child_by_field_name('name')
                 if name_node:
-                    name = content[name_node.start_byte:name_node.end_byte].decode('utf-8')
                     functions.append({
-                        'name': name,
+                        'name': text(name_node),
                         'line_start': name_node.start_point[0] + 1,
                         'metadata': {'args': []}
                     })
             elif node.type == 'struct_item':
                 name_node = node.child_by_field_name('name')
                 if name_node:
-                    name = content[name_node.start_byte:name_node.end_byte].decode('utf-8')
                     structs.append({
-                        'name': name,
+                        'name': text(name_node),
                         'line_start': name_node.start_point[0] + 1
                     })
-            
-            for child in node.children:
-                traverse(child)
-        
-        traverse(tree.root_node)
         
         return {
             'functions': functions,
@@ -303,34 +408,28 @@ class UniversalParser:
             'language': 'rust'
         }
     
-    def _extract_java(self, tree, content: bytes, file_path: Path) -> Dict[str, Any]:
+    def _extract_java(self, root, content: bytes, file_path: Path) -> Dict[str, Any]:
         """Extract Java elements."""
         functions = []
         classes = []
+        text = SourceText(content)
         
-        def traverse(node):
+        for node in walk_tree(root, SKIP_TYPES['java']):
             if node.type == 'method_declaration':
                 name_node = node.child_by_field_name('name')
                 if name_node:
-                    name = content[name_node.start_byte:name_node.end_byte].decode('utf-8')
                     functions.append({
-                        'name': name,
+                        'name': text(name_node),
                         'line_start': name_node.start_point[0] + 1,
                         'metadata': {'args': []}
                     })
             elif node.type == 'class_declaration':
                 name_node = node.child_by_field_name('name')
                 if name_node:
-                    name = content[name_node.start_byte:name_node.end_byte].decode('utf-8')
                     classes.append({
-                        'name': name,
+                        'name': text(name_node),
                         'line_start': name_node.start_point[0] + 1
                     })
-            
-            for child in node.children:
-                traverse(child)
-        
-        traverse(tree.root_node)
         
         return {
             'functions': functions,
@@ -339,54 +438,189 @@ class UniversalParser:
             'language': 'java'
         }
     
-    def _extract_c_cpp(self, tree, content: bytes, file_path: Path) -> Dict[str, Any]:
+    def _extract_c_cpp(self, root, content: bytes, file_path: Path) -> Dict[str, Any]:
         """Extract C/C++ elements."""
         functions = []
         classes = []
+        text = SourceText(content)
+        language = 'c' if file_path.suffix == '.c' else 'cpp'
         
-        def traverse(node):
+        for node in walk_tree(root, SKIP_TYPES[language]):
             if node.type == 'function_definition':
                 # Find function name in declarator
                 declarator = node.child_by_field_name('declarator')
                 if declarator:
                     name_node = declarator.child_by_field_name('declarator')
                     if name_node and name_node.type == 'identifier':
-                        name = content[name_node.start_byte:name_node.end_byte].decode('utf-8')
                         functions.append({
-                            'name': name,
+                            'name': text(name_node),
                             'line_start': name_node.start_point[0] + 1,
                             'metadata': {'args': []}
                         })
             elif node.type == 'class_specifier' and file_path.suffix == '.cpp':
                 name_node = node.child_by_field_name('name')
                 if name_node:
-                    name = content[name_node.start_byte:name_node.end_byte].decode('utf-8')
                     classes.append({
-                        'name': name,
+                        'name': text(name_node),
                         'line_start': name_node.start_point[0] + 1
                     })
-            
-            for child in node.children:
-                traverse(child)
-        
-        traverse(tree.root_node)
         
         return {
             'functions': functions,
             'classes': classes,
             'file': str(file_path),
-            'language': 'c' if file_path.suffix == '.c' else 'cpp'
+            'language': language
         }
     
-    def _extract_docstring(self, node, content: bytes) -> Optional[str]:
+    def _extract_docstring(self, node, text: "SourceText") -> Optional[str]:
         """Extract docstring from a Python function or class."""
         body = node.child_by_field_name('body')
-        if body and body.children:
-            first_stmt = body.children[0]
+        if body and body.child_count:
+            first_stmt = body.child(0)
             if first_stmt.type == 'expression_statement':
-                expr = first_stmt.children[0] if first_stmt.children else None
+                expr = first_stmt.child(0) if first_stmt.child_count else None
                 if expr and expr.type == 'string':
-                    docstring = content[expr.start_byte:expr.end_byte].decode('utf-8')
+                    docstring = text(expr)
                     # Clean up the docstring
                     return docstring.strip('"""').strip("'''").strip()
-        return None
\ No newline at end of file
+        return None
+
+
+# Node types whose subtrees cannot contain anything the extractors look for.
+# The walk still yields these nodes but does not enter them.
+_COMMON_SKIP = frozenset({'comment', 'line_comment', 'block_comment', 'string', 'string_literal'})
+SKIP_TYPES = {
+    # Definitions only appear in blocks, never inside simple statements
+    'python': _COMMON_SKIP | {
+        'import_statement', 'import_from_statement', 'future_import_statement',
+        'expression_statement', 'return_statement', 'pass_statement', 'assert_statement',
+        'raise_statement', 'delete_statement', 'global_statement', 'nonlocal_statement',
+        'break_statement', 'continue_statement', 'print_statement', 'exec_statement',
+        'parameters', 'decorator',
+    },
+    # Function expressions can sit inside almost any expression, so only
+    # literals, imports and type-level syntax are skipped
+    'javascript': _COMMON_SKIP | {'regex', 'import_statement', 'jsx_text'},
+    'typescript': _COMMON_SKIP | {
+        'regex', 'import_statement', 'type_annotation', 'type_arguments', 'type_parameters',
+        'type_alias_declaration', 'interface_declaration',
+    },
+    # Go functions are top-level only; function literals are not extracted
+    'go': _COMMON_SKIP | {
+        'function_declaration', 'method_declaration', 'import_declaration', 'package_clause',
+        'const_declaration', 'var_declaration', 'type_declaration',
+        'interpreted_string_literal', 'raw_string_literal',
+    },
+    'rust': _COMMON_SKIP | {
+        'raw_string_literal', 'char_literal', 'use_declaration', 'attribute_item',
+        'inner_attribute_item', 'token_tree', 'parameters', 'type_arguments',
+    },
+    'java': _COMMON_SKIP | {
+        'import_declaration', 'package_declaration', 'formal_parameters',
+        'annotation', 'marker_annotation',
+    },
+    # C has no nested functions, so function bodies and declarations are skipped
+    'c': _COMMON_SKIP | {
+        'compound_statement', 'declaration', 'type_definition', 'parameter_list',
+        'preproc_include', 'preproc_def', 'preproc_function_def',
+        'struct_specifier', 'union_specifier', 'enum_specifier',
+    },
+    'cpp': _COMMON_SKIP | {
+        'raw_string_literal', 'preproc_include', 'preproc_def', 'parameter_list',
+        'template_argument_list',
+    },
+}
+
+
+def walk_tree(node, skip: frozenset = frozenset()) -> Iterator[Any]:
+    """Yield ``node`` and its descendants in document order.
+    
+    Uses a `TreeCursor` rather than recursing through ``node.children``, so
+    no child lists are allocated and nesting depth is not limited by the
+    Python recursion limit. Subtrees of nodes whose type is in ``skip`` are
+    not entered.
+    """
+    cursor = node.walk()
+    while True:
+        current = cursor.node
+        yield current
+        if current.type not in skip and cursor.goto_first_child():
+            continue
+        while not cursor.goto_next_sibling():
+            if not cursor.goto_parent():
+                return
+
+
+class SourceText:
+    """Decode node text from a file's bytes on demand.
+    
+    Slices a memoryview, so only the text of matched nodes is ever copied
+    out of the source buffer.
+    """
+    
+    __slots__ = ('view',)
+    
+    def __init__(self, content: bytes):
+        self.view = memoryview(content)
+    
+    def __call__(self, node) -> str:
+        return str(self.view[node.start_byte:node.end_byte], 'utf-8')
+
+
+# (start_byte, end_byte, functions, classes) for one top-level node
+Chunk = Tuple[int, int, List[Dict[str, Any]], List[Dict[str, Any]]]
+
+
+class ParsedFile:
+    """A file's last content, tree and per-top-level-node elements."""
+    
+    __slots__ = ('content', 'tree', 'chunks', 'language')
+    
+    def __init__(self, content: bytes, tree, chunks: List[Chunk], language: str):
+        self.content = content
+        self.tree = tree
+        self.chunks = chunks
+        self.language = language
+    
+    def result(self, file_path: Path) -> Dict[str, Any]:
+        return {
+            'functions': [f for chunk in self.chunks for f in chunk[2]],
+            'classes': [c for chunk in self.chunks for c in chunk[3]],
+            'file': str(file_path),
+            'language': self.language
+        }
+
+
+def _shift_chunk(chunk: Chunk, shift_bytes: int, shift_lines: int) -> Chunk:
+    start, end, functions, classes = chunk
+    if shift_lines:
+        functions = [dict(f, line_start=f['line_start'] + shift_lines) for f in functions]
+        classes = [dict(c, line_start=c['line_start'] + shift_lines) for c in classes]
+    return (start + shift_bytes, end + shift_bytes, functions, classes)
+
+
+def _point(content: bytes, byte: int) -> Tuple[int, int]:
+    """Tree-sitter (row, column) of a byte offset."""
+    row = content.count(b'\n', 0, byte)
+    return (row, byte - (content.rfind(b'\n', 0, byte) + 1))
+
+
+def _common_prefix(a: bytes, b: bytes, block: int = 4096) -> int:
+    """Length of the common prefix, comparing whole blocks first."""
+    limit = min(len(a), len(b))
+    n = 0
+    while n + block <= limit and a[n:n + block] == b[n:n + block]:
+        n += block
+    while n < limit and a[n] == b[n]:
+        n += 1
+    return n
+
+
+def _common_suffix(a: bytes, b: bytes, limit: int, block: int = 4096) -> int:
+    """Length of the common suffix, at most ``limit`` bytes."""
+    n = 0
+    while n + block <= limit and a[len(a) - n - block:len(a) - n] == b[len(b) - n - block:len(b) - n]:
+        n += block
+    while n < limit and a[len(a) - n - 1] == b[len(b) - n - 1]:
+        n += 1
+    return n
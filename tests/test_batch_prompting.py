@@ -0,0 +1,66 @@
+# tests/test_batch_prompting.py
+from opendox.generators.llm_generator import LLMGenerator
+
+BATCH_RESPONSE = """FUNCTION 1: add
+DESCRIPTION: Adds two numbers.
+RETURNS:
+int The sum
+
+FUNCTION 2: broken
+nothing useful here
+"""
+
+
+def make_generator(responses):
+    generator = LLMGenerator(model="test")
+    prompts = []
+
+    def fake_generate(prompt, max_tokens=500, sections=None):
+        prompts.append(prompt)
+        text = responses.pop(0)
+        if sections is not None:
+            sections.feed(text)
+            sections.finish()
+        return text
+
+    generator.generate = fake_generate
+    return generator, prompts
+
+
+def test_batch_response_is_split_with_per_function_fallback():
+    single = "DESCRIPTION: Handles the broken case.\n"
+    generator, prompts = make_generator([BATCH_RESPONSE, single])
+    functions = [
+        {'name': 'add', 'metadata': {'args': ['a', 'b'], 'returns': 'int'}},
+        {'name': 'broken', 'metadata': {'args': []}},
+    ]
+
+    docs = generator.generate_batch_docs(functions)
+
+    assert len(prompts) == 2  # one batched call plus one fallback
+    assert docs[0].startswith("Adds two numbers.")
+    assert docs[1].startswith("Handles the broken case.")
+
+
+def test_pack_batches_respects_size_and_budget():
+    generator, _ = make_generator([])
+    functions = [{'name': f'f{i}', 'metadata': {'args': []}} for i in range(10)]
+
+    assert [len(b) for b in generator.pack_batches(functions, max_batch=4)] == [4, 4, 2]
+    tight = generator.pack_batches(functions, max_batch=10, token_budget=700)
+    assert all(len(b) < 10 for b in tight)
+    assert sum(len(b) for b in tight) == 10
+
+
+def test_pack_batches_keeps_source_order_around_long_docstrings():
+    generator, _ = make_generator([])
+    functions = [
+        {'name': 'a', 'metadata': {'args': []}},
+        {'name': 'b', 'metadata': {'args': []}},
+        {'name': 'documented', 'docstring': 'x' * 60, 'metadata': {'args': []}},
+        {'name': 'c', 'metadata': {'args': []}},
+    ]
+
+    batches = generator.pack_batches(functions, max_batch=8)
+
+    assert [[f['name'] for f in batch] for batch in batches] == [['a', 'b'], ['documented'], ['c']]
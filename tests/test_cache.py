@@ -0,0 +1,141 @@
+# tests/test_cache.py
+import json
+import os
+
+from opendox.core.cache import DocumentationCache
+from opendox.parsers.python_parser import PythonParser
+
+
+def test_symbol_docs_survive_reload(tmp_path):
+    source = tmp_path / "mod.py"
+    source.write_text("def a():\n    pass\n")
+    cache = DocumentationCache(tmp_path)
+    cache.update_symbols(source, {"fp1": "doc for a"})
+    cache.update(source)
+    cache.save()
+
+    reloaded = DocumentationCache(tmp_path)
+    assert reloaded.get_symbol_doc(source, "fp1") == "doc for a"
+    assert reloaded.get_symbol_doc(source, "other") is None
+    assert not reloaded.needs_update(source)
+
+
+def test_fingerprint_tracks_only_the_edited_symbol(tmp_path):
+    source = tmp_path / "mod.py"
+    source.write_text("def a():\n    return 1\n\ndef b():\n    return 2\n")
+    before = PythonParser().parse_file(source)['functions']
+
+    source.write_text("def a():\n    return 1\n\n\ndef b():\n    return 3\n")
+    after = PythonParser().parse_file(source)['functions']
+
+    assert before[0].metadata['fingerprint'] == after[0].metadata['fingerprint']
+    assert before[1].metadata['fingerprint'] != after[1].metadata['fingerprint']
+
+
+def test_unchanged_stat_skips_hashing(tmp_path, monkeypatch):
+    source = tmp_path / "mod.py"
+    source.write_text("def a():\n    pass\n")
+    cache = DocumentationCache(tmp_path)
+    assert cache.needs_update(source)
+    cache.update(source)
+
+    def fail(path):
+        raise AssertionError("file was hashed")
+    monkeypatch.setattr(cache, "get_file_hash", fail)
+    assert not cache.needs_update(source)
+
+
+def test_touch_without_edit_is_not_a_change(tmp_path):
+    source = tmp_path / "mod.py"
+    source.write_text("def a():\n    pass\n")
+    cache = DocumentationCache(tmp_path)
+    cache.update(source)
+
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert not cache.needs_update(source)
+
+    source.write_text("def a():\n    return 1\n")
+    assert cache.needs_update(source)
+
+
+def test_updates_are_written_in_batches(tmp_path):
+    sources = []
+    for i in range(3):
+        sources.append(tmp_path / f"mod{i}.py")
+        sources[-1].write_text(f"X = {i}\n")
+    cache = DocumentationCache(tmp_path, flush_every=2)
+    for source in sources:
+        cache.update(source)
+    cache.set_meta("git_commit", "abc")
+
+    # The first two were flushed together; the rest waits for save()
+    assert len(DocumentationCache(tmp_path).cache) == 2
+    cache.save()
+    reloaded = DocumentationCache(tmp_path)
+    assert len(reloaded.cache) == 3
+    assert reloaded.get_meta("git_commit") == "abc"
+
+
+def test_migrates_json_cache(tmp_path):
+    source = tmp_path / "mod.py"
+    source.write_text("def a():\n    pass\n")
+    cache_dir = tmp_path / ".opendox"
+    cache_dir.mkdir()
+    (cache_dir / "cache.json").write_text(json.dumps({str(source): "0" * 32}))
+    (cache_dir / "symbols.json").write_text(json.dumps({str(source): {"fp1": "doc for a"}}))
+
+    cache = DocumentationCache(tmp_path)
+    assert cache.get_symbol_doc(source, "fp1") == "doc for a"
+    assert cache.needs_update(source)
+    assert not (cache_dir / "cache.json").exists()
+
+
+def test_fingerprint_covers_decorators(tmp_path):
+    source = tmp_path / "mod.py"
+    source.write_text("@cached\ndef a():\n    return 1\n")
+    before = PythonParser().parse_file(source)['functions'][0].metadata['fingerprint']
+    source.write_text("@other\ndef a():\n    return 1\n")
+    after = PythonParser().parse_file(source)['functions'][0].metadata['fingerprint']
+    assert before != after
+
+
+def _document(project, generator, body):
+    from opendox.core.pipeline import DocumentationPipeline
+
+    (project / "mod.py").write_text(f"def a():\n    return 1\n\ndef b():\n    return {body}\n")
+    pipeline = DocumentationPipeline(generator=generator, llm_cache=False, use_git=False)
+    pipeline.generate(project, project / "out", max_files=0)
+    return pipeline.stats['functions_reused']
+
+
+def test_symbol_docs_depend_on_model_and_skip_fallbacks(tmp_path, monkeypatch):
+    from opendox.generators.llm_generator import LLMGenerator
+    from opendox.generators.mock_generator import MockBackend
+
+    class _DownBackend(MockBackend):
+        def complete(self, model, prompt, options):
+            raise ConnectionError("offline")
+
+    monkeypatch.setattr('opendox.generators.llm_generator.time.sleep', lambda seconds: None)
+    project = tmp_path / "project"
+    project.mkdir()
+
+    assert _document(project, LLMGenerator("m1", backend=_DownBackend(), stream=False), 1) == 0
+    # Fallback docs from the failed run were not stored
+    assert _document(project, LLMGenerator("m1", backend=MockBackend()), 2) == 0
+    assert _document(project, LLMGenerator("m1", backend=MockBackend()), 3) == 1
+    assert _document(project, LLMGenerator("m2", backend=MockBackend()), 4) == 0
+
+
+def test_summary_counts_files_beyond_the_table(tmp_path, capsys):
+    from opendox.core.pipeline import DocumentationPipeline
+    from opendox.generators.mock_generator import MockLLMGenerator
+
+    project = tmp_path / "project"
+    project.mkdir()
+    for i in range(23):
+        (project / f"mod{i}.py").write_text(f"def f{i}():\n    pass\n")
+    pipeline = DocumentationPipeline(generator=MockLLMGenerator(), llm_cache=False, use_git=False)
+    pipeline.generate(project, tmp_path / "out", max_files=0)
+    assert "… and 3 more" in capsys.readouterr().out
@@ -0,0 +1,102 @@
+# tests/test_cache_manager.py
+import socketserver
+import threading
+
+import pytest
+
+pytest.importorskip("redis")
+
+from opendox.core.cache_manager import DocumentationCache
+
+
+class FakeRedisHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough of the Redis protocol for HELLO/PING/GET/MGET/SET."""
+
+    def handle(self):
+        server = self.server
+        self.resp3 = False
+        while True:
+            command = self._read_command()
+            if command is None:
+                return
+            name = command[0].upper()
+            server.commands.append(name)
+            if name == 'HELLO':
+                self.resp3 = command[1] == '3'
+                self._write(b"%1\r\n$5\r\nproto\r\n:" + command[1].encode() + b"\r\n")
+            elif name == 'PING':
+                self._write(b"+PONG\r\n")
+            elif name == 'GET':
+                self._write(self._bulk(server.data.get(command[1])))
+            elif name == 'MGET':
+                values = [self._bulk(server.data.get(key)) for key in command[1:]]
+                self._write(b"*%d\r\n" % len(values) + b"".join(values))
+            elif name == 'SET':  # SET key value EX ttl
+                server.data[command[1]] = command[2]
+                self._write(b"+OK\r\n")
+            else:  # CLIENT SETINFO and other handshake commands
+                self._write(b"+OK\r\n")
+
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2].decode())
+        return args
+
+    def _bulk(self, value):
+        if value is None:
+            return b"_\r\n" if self.resp3 else b"$-1\r\n"
+        data = value.encode()
+        return b"$%d\r\n%s\r\n" % (len(data), data)
+
+    def _write(self, data):
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def fake_redis():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), FakeRedisHandler)
+    server.daemon_threads = True
+    server.data = {}
+    server.commands = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_module_lookups_use_one_mget(fake_redis):
+    url = f"redis://127.0.0.1:{fake_redis.server_address[1]}"
+    cache = DocumentationCache(url)
+    assert cache.enabled
+
+    cache.cache_docs({"h1": "doc one", "h2": "doc two"})
+    assert fake_redis.data == {"doc:h1": "doc one", "doc:h2": "doc two"}
+
+    # A fresh process only has Redis to go on
+    cold = DocumentationCache(url)
+    fake_redis.commands.clear()
+    assert cold.get_cached_docs(["h1", "h2", "h3"]) == {"h1": "doc one", "h2": "doc two", "h3": None}
+    assert fake_redis.commands == ["MGET"]
+    assert cold.get_cached_doc("h1") == "doc one"
+    assert fake_redis.commands == ["MGET"]  # Served from the in-process tier
+
+    stats = cold.stats()
+    assert stats['redis'] == {'hits': 2, 'misses': 1, 'errors': 0}
+    assert stats['memory']['hits'] == 1
+
+
+def test_memory_tier_is_bounded_lru():
+    cache = DocumentationCache("redis://127.0.0.1:1", max_memory_entries=2, socket_timeout=0.1)
+    assert not cache.enabled
+    cache.cache_docs({"a": "A", "b": "B"})
+    cache.get_cached_doc("a")
+    cache.cache_docs({"c": "C"})
+    assert list(cache.memory_cache) == ["a", "c"]
+    assert cache.stats()['memory']['evictions'] == 1
+    assert cache.stats()['redis']['errors'] == 1
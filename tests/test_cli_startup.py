@@ -0,0 +1,30 @@
+# tests/test_cli_startup.py
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative import time of opendox.cli in microseconds; about 60ms locally,
+# against roughly 650ms when the pipeline was imported at module level.
+IMPORT_BUDGET_US = 250_000
+HEAVY_MODULES = {'ollama', 'yaml', 'tree_sitter', 'opendox.core.pipeline', 'opendox.parsers.python_parser'}
+
+
+def import_profile(*args):
+    code = f"import sys; sys.argv = ['opendox', *{list(args)!r}]; from opendox.cli import main; main()"
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative, name = line[len('import time:'):].split('|')
+            if cumulative.strip().isdigit():
+                modules[name.strip()] = int(cumulative)
+    return modules
+
+
+@pytest.mark.parametrize('args', [('--version',), ('status',)])
+def test_cli_startup_stays_light(args):
+    modules = import_profile(*args)
+    assert not HEAVY_MODULES & modules.keys()
+    assert modules['opendox.cli'] < IMPORT_BUDGET_US
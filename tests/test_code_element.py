@@ -0,0 +1,53 @@
+# tests/test_code_element.py
+import pickle
+
+from opendox.formats.mkdocs_formatter import MkDocsFormatter
+from opendox.parsers.base import CodeElement, ElementStore
+
+
+def make_element(name="load", line_start=3):
+    return CodeElement(
+        name="".join(name),  # Built at runtime, so not already interned
+        type="function",
+        line_start=line_start,
+        line_end=line_start + 4,
+        signature=f"{name}(path)",
+        metadata={"args": ["path"], "returns": "str"},
+    )
+
+
+def test_element_is_slotted_and_interned():
+    first, second = make_element(), make_element()
+    assert not hasattr(first, "__dict__")
+    assert first.name is second.name
+    assert first == second
+    assert pickle.loads(pickle.dumps(first)) == first
+    assert CodeElement("f", "function", 1).metadata == {}
+
+
+def test_mapping_access_matches_old_dict_copy():
+    element = make_element()
+    assert element.get("name") == "load"
+    assert element["metadata"]["args"] == ["path"]
+    assert element.get("docstring", "") is None
+    assert element.get("missing", "default") == "default"
+
+
+def test_store_views_read_columns():
+    store = ElementStore([make_element("a", 1), make_element("b", 10),
+                          {"name": "C", "type": "class", "line_start": 20}])
+    assert len(store) == 3
+    assert [view.name for view in store] == ["a", "b", "C"]
+    assert store[1] == make_element("b", 10)
+    assert store[-1].line_end is None
+    assert store[-1].metadata == {}
+    assert store[1].to_element() == make_element("b", 10)
+    assert len(store.types) == 2
+
+
+def test_formatter_renders_elements_and_views(tmp_path):
+    formatter = MkDocsFormatter(tmp_path)
+    element = make_element()
+    view = ElementStore([element])[0]
+    assert formatter.format_function(element) == formatter.format_function(view)
+    assert "Lines 3-7" in formatter.format_function(view)
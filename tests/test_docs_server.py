@@ -0,0 +1,101 @@
+# tests/test_docs_server.py
+import http.client
+import threading
+import time
+
+import pytest
+
+from opendox.core.docs_server import DocsServer, RenderCache
+
+
+@pytest.fixture
+def docs_server(tmp_path):
+    (tmp_path / "index.md").write_text("# Home\n\nSee [api](api/mod.md).\n")
+    (tmp_path / "api").mkdir()
+    (tmp_path / "api" / "mod.md").write_text("# `mod` Module\n\n| a | b |\n|---|---|\n| 1 | 2 |\n")
+    server = DocsServer(tmp_path, "127.0.0.1", 0, poll=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def get(server, path, headers=None):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+    conn.request("GET", path, headers=headers or {})
+    response = conn.getresponse()
+    body = response.read()
+    conn.close()
+    return response, body
+
+
+def test_renders_markdown_with_etags(docs_server):
+    response, body = get(docs_server, "/")
+    assert response.status == 200
+    assert b"<h1>Home</h1>" in body and b"EventSource" in body
+
+    response, body = get(docs_server, "/api/mod.md")
+    assert b"<table>" in body
+    etag = response.getheader("ETag")
+    response, body = get(docs_server, "/api/mod/", {"If-None-Match": etag})
+    assert response.status == 304 and body == b""
+    response, body = get(docs_server, "/api/mod.md", {"If-None-Match": f'"other", {etag}'})
+    assert response.status == 304
+    response, body = get(docs_server, "/api/mod.md", {"If-None-Match": etag[:-1] + 'x"' + etag})
+    assert response.status == 200  # A tag that merely contains ours doesn't match
+
+    assert get(docs_server, "/../secret.md")[0].status == 404
+    assert get(docs_server, "/missing.md")[0].status == 404
+
+
+def test_concurrent_readers_share_one_render(docs_server):
+    statuses = []
+    threads = [threading.Thread(target=lambda: statuses.append(get(docs_server, "/api/mod.md")[0].status))
+               for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert statuses == [200] * 20
+    assert docs_server.cache.renders == 1
+
+    page = docs_server.docs_dir / "api" / "mod.md"
+    page.write_text(page.read_text())  # Rewritten with identical content
+    get(docs_server, "/api/mod.md")
+    assert docs_server.cache.renders == 1
+    page.write_text("# Changed\n")
+    assert b"Changed" in get(docs_server, "/api/mod.md")[1]
+    assert docs_server.cache.renders == 2
+
+
+def test_live_reload_event_on_rewrite(docs_server):
+    conn = http.client.HTTPConnection("127.0.0.1", docs_server.server_port, timeout=5)
+    conn.request("GET", "/__livereload")
+    response = conn.getresponse()
+    assert response.getheader("Content-Type") == "text/event-stream"
+    assert response.fp.readline() == b": connected\n"
+    response.fp.readline()
+
+    time.sleep(0.05)
+    (docs_server.docs_dir / "api" / "mod.md").write_text("# Rewritten\n")
+    line = response.fp.readline()
+    assert line == b"data: api/mod.md\n"  # Relative to the docs tree
+    conn.close()
+
+
+def test_render_cache_is_bounded_and_forgets_deleted_files(tmp_path):
+    cache = RenderCache(max_entries=2)
+    pages = []
+    for name in "abc":
+        pages.append(tmp_path / f"{name}.md")
+        pages[-1].write_text(f"# {name}\n")
+        cache.get(pages[-1])
+    assert list(cache._entries) == [str(pages[1]), str(pages[2])]
+    assert set(cache._path_locks) <= set(cache._entries)
+
+    pages[2].unlink()
+    with pytest.raises(OSError):
+        cache.get(pages[2])
+    assert list(cache._entries) == [str(pages[1])]
+    assert str(pages[2]) not in cache._path_locks
@@ -0,0 +1,32 @@
+# tests/test_file_discovery.py
+from opendox.core.file_discovery import FileDiscovery
+
+
+def make_tree(root):
+    for rel in [
+        "app/main.py",
+        "app/util.js",
+        "app/readme.md",
+        "node_modules/dep/index.js",
+        ".venv/lib/site.py",
+        "pkg/sub/deep.py",
+        "pkg/sub/build/generated.py",
+    ]:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x = 1\n")
+
+
+def test_ignored_directories_are_pruned(tmp_path):
+    make_tree(tmp_path)
+    found = {p.relative_to(tmp_path).as_posix() for p in FileDiscovery().iter_files(tmp_path)}
+    assert found == {"app/main.py", "app/util.js", "pkg/sub/deep.py"}
+
+
+def test_extension_filter_and_limit(tmp_path):
+    make_tree(tmp_path)
+    discovery = FileDiscovery()
+
+    python_only = list(discovery.iter_files(tmp_path, extensions={".py"}))
+    assert sorted(p.name for p in python_only) == ["deep.py", "main.py"]
+    assert len(discovery.discover_files(tmp_path, max_files=1)) == 1
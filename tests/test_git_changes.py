@@ -0,0 +1,91 @@
+# tests/test_git_changes.py
+import pytest
+
+git = pytest.importorskip("git")
+
+from opendox.core.git_changes import GitChangeDetector
+from opendox.core.pipeline import DocumentationPipeline
+from opendox.generators.mock_generator import MockLLMGenerator
+
+
+def _commit(repo, *names):
+    repo.index.add(list(names))
+    return repo.index.commit("update").hexsha
+
+
+def _repo(tmp_path):
+    project = tmp_path / "project"
+    project.mkdir()
+    repo = git.Repo.init(project)
+    (project / "a.py").write_text("def a():\n    return 1\n")
+    (project / "b.py").write_text("def b():\n    return 2\n")
+    return project, repo
+
+
+def test_changed_files_covers_commits_edits_and_untracked(tmp_path):
+    project, repo = _repo(tmp_path)
+    base = _commit(repo, "a.py", "b.py")
+    (project / "a.py").write_text("def a():\n    return 10\n")
+    _commit(repo, "a.py")
+    (project / "b.py").write_text("def b():\n    return 20\n")
+    (project / "c.py").write_text("def c():\n    pass\n")
+
+    detector = GitChangeDetector.open(project)
+    assert detector.changed_files(base) == {project / "a.py", project / "b.py", project / "c.py"}
+    assert detector.changed_files(detector.head_commit()) == {project / "b.py", project / "c.py"}
+    assert detector.changed_files("0" * 40) is None
+
+
+def test_blob_hashes_match_git(tmp_path):
+    project, repo = _repo(tmp_path)
+    _commit(repo, "a.py", "b.py")
+    (project / "b.py").write_text("def b():\n    return 3\n")
+
+    detector = GitChangeDetector.open(project)
+    hashes = detector.tree_hashes()
+    assert hashes[project / "a.py"] == repo.git.hash_object("a.py")
+    assert hashes[project / "b.py"] == repo.git.hash_object("b.py")
+
+
+def test_open_outside_a_repository(tmp_path):
+    assert GitChangeDetector.open(tmp_path) is None
+
+
+def test_pipeline_only_processes_git_changes(tmp_path):
+    project, repo = _repo(tmp_path)
+    _commit(repo, "a.py", "b.py")
+    output = tmp_path / "docs"
+
+    first = DocumentationPipeline(generator=MockLLMGenerator(), llm_cache=False)
+    first.generate(project, output, max_files=0)
+    assert first.stats['modules_processed'] == 2
+
+    (project / "b.py").write_text("def b():\n    return 3\n")
+    second = DocumentationPipeline(generator=MockLLMGenerator(), llm_cache=False)
+    second.generate(project, output, max_files=0)
+    assert list(second.stats['file_details']) == [str(project / "b.py")]
+    assert second.stats['modules_processed'] == 1
+
+
+def test_reverted_and_failed_files_are_carried_into_the_next_run(tmp_path):
+    project, repo = _repo(tmp_path)
+    (project / "bad.py").write_text("def broken(:\n")
+    _commit(repo, "a.py", "b.py", "bad.py")
+    output = tmp_path / "docs"
+    (project / "a.py").write_text("def a():\n    return 1\n\ndef dirty_only():\n    pass\n")
+
+    first = DocumentationPipeline(generator=MockLLMGenerator(), llm_cache=False)
+    first.generate(project, output, max_files=0)
+    page = output / "docs" / "api" / "a.md"
+    assert "dirty_only" in page.read_text()
+
+    repo.git.checkout("--", "a.py")
+    second = DocumentationPipeline(generator=MockLLMGenerator(), llm_cache=False)
+    second.generate(project, output, max_files=0)
+    assert sorted(second.stats['file_details']) == [str(project / "a.py"), str(project / "bad.py")]
+    assert "dirty_only" not in page.read_text()
+
+    # Once documented at its committed content, a.py drops out; bad.py keeps being retried
+    third = DocumentationPipeline(generator=MockLLMGenerator(), llm_cache=False)
+    third.generate(project, output, max_files=0)
+    assert list(third.stats['file_details']) == [str(project / "bad.py")]
@@ -0,0 +1,164 @@
+# tests/test_llm_backends.py
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from opendox.generators.backends import HTTPBackendError, OpenAIBackend, create_backend
+from opendox.generators.llm_generator import LLMGenerator
+from opendox.generators.mock_generator import MockBackend
+
+ANSWER = "DESCRIPTION: Adds numbers.\n\nDETAILS: Sums a and b.\n\nPARAMETERS:\n- a: [int] first\n\n" \
+         "RETURNS:\n[int] the sum\n\nUSAGE NOTES:\nPure function.\n\n" + "ramble " * 200
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.requests.append((self.path, None))
+        self._json(200, {'data': [{'id': 'test'}]})
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.server.requests.append((self.path, payload))
+        self.server.auth = self.headers.get('Authorization')
+        if self.server.fail:
+            return self._json(500, {'error': 'model not loaded'})
+        time.sleep(self.server.delay)
+        if payload.get('stream') and self.server.stream_status != 200:
+            return self._json(self.server.stream_status, {'status': 'queued'})
+        if not payload.get('stream'):
+            return self._json(200, {'choices': [{'message': {'role': 'assistant', 'content': self.server.answer}}]})
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        try:
+            for i in range(0, len(self.server.answer), 8):
+                delta = {'choices': [{'delta': {'content': self.server.answer[i:i + 8]}}]}
+                self._chunk(f"data: {json.dumps(delta)}\n\n".encode())
+                self.server.chunks_sent += 1
+            self._chunk(b"data: [DONE]\n\n")
+            self._chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            self.server.hung_up = True
+            self.close_connection = True
+
+    def _chunk(self, data: bytes):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+        time.sleep(0.001)
+
+    def _json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except BrokenPipeError:
+            self.close_connection = True  # The client timed out
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    server.requests, server.auth, server.fail, server.delay = [], None, False, 0.0
+    server.answer, server.chunks_sent, server.hung_up = ANSWER, 0, False
+    server.stream_status = 200
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server.url = f"http://127.0.0.1:{server.server_port}/v1"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_requests_share_a_kept_alive_connection(stub):
+    backend = OpenAIBackend(stub.url, api_key='secret')
+
+    answers = [backend.complete('test', f'prompt {i}', {'num_predict': 50, 'temperature': 0.7}) for i in range(3)]
+
+    assert answers == [ANSWER] * 3
+    assert backend.connections_opened == 1
+    path, payload = stub.requests[0]
+    assert path == '/v1/chat/completions' and stub.auth == 'Bearer secret'
+    assert payload['max_tokens'] == 50 and payload['messages'][0]['content'] == 'prompt 0'
+    backend.close()
+
+
+def test_streaming_hangs_up_once_sections_are_complete(stub):
+    backend = OpenAIBackend(stub.url)
+    generator = LLMGenerator(model='test', backend=backend)
+
+    doc = generator.generate_function_doc({'name': 'add', 'metadata': {'args': ['a']}})
+
+    assert doc.startswith("Adds numbers.") and "ramble" not in doc
+    deadline = time.monotonic() + 5
+    while not stub.hung_up and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert stub.hung_up and stub.chunks_sent < len(ANSWER) // 8
+
+    # A stream read to [DONE] leaves its connection in the pool
+    stub.answer = "short answer"
+    assert ''.join(backend.stream('test', 'p', {})) == "short answer"
+    assert backend.complete('test', 'p', {}) == "short answer"
+    assert backend.connections_opened == 2
+
+
+def test_stream_rejects_a_success_status_without_events(stub):
+    stub.stream_status = 202
+    backend = OpenAIBackend(stub.url)
+    with pytest.raises(HTTPBackendError, match="HTTP 202"):
+        ''.join(backend.stream('test', 'p', {}))
+
+    # The drained connection went back to the pool exactly once
+    assert backend._idle.qsize() == 1
+    assert backend.complete('test', 'p', {}) == ANSWER
+    assert backend.connections_opened == 1
+    backend.close()
+
+
+def test_health_is_checked_lazily_and_once(stub, monkeypatch):
+    monkeypatch.setattr('opendox.generators.llm_generator.time.sleep', lambda seconds: None)
+    generator = LLMGenerator(model='test', backend=OpenAIBackend(stub.url), stream=False)
+    assert stub.requests == []  # Nothing is sent before the first prompt
+
+    assert generator.generate('hello') == ANSWER
+    stub.fail = True
+    generator.generate('hello')
+    generator.generate('again')
+
+    health_checks = [path for path, _ in stub.requests if path == '/v1/models']
+    assert len(health_checks) == 1
+    with pytest.raises(HTTPBackendError):
+        generator.backend.complete('test', 'hello', {})
+
+
+def test_read_timeout(stub):
+    stub.delay = 0.5
+    backend = OpenAIBackend(stub.url, timeout=0.1)
+    with pytest.raises(socket.timeout):
+        backend.complete('test', 'slow', {})
+
+
+def test_mock_backend_answers_batches_in_one_request():
+    backend = create_backend('mock')
+    generator = LLMGenerator(model='test', backend=backend)
+    functions = [{'name': name, 'metadata': {'args': []}} for name in ('add', 'sub')]
+
+    docs = generator.generate_batch_docs(functions)
+
+    assert isinstance(backend, MockBackend) and backend.requests == 1
+    assert all(doc.startswith("Performs operations on the given inputs.") for doc in docs)
+    assert generator.cache_model == 'mock:test'
+    with pytest.raises(ValueError):
+        create_backend('nope')
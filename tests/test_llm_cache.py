@@ -0,0 +1,36 @@
+# tests/test_llm_cache.py
+from opendox.core.llm_cache import LLMResponseCache
+
+
+def test_hits_and_misses_persist_across_instances(tmp_path):
+    path = tmp_path / "llm.sqlite"
+    cache = LLMResponseCache(path)
+    key = cache.make_key("model", "prompt", {"num_predict": 10})
+
+    assert cache.get(key) is None
+    cache.put(key, "answer")
+    assert cache.get(key) == "answer"
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+    reopened = LLMResponseCache(path)
+    assert reopened.get(key) == "answer"
+
+
+def test_key_depends_on_model_and_options():
+    base = LLMResponseCache.make_key("a", "p", {"temperature": 0.7})
+    assert base != LLMResponseCache.make_key("b", "p", {"temperature": 0.7})
+    assert base != LLMResponseCache.make_key("a", "p", {"temperature": 0.1})
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = LLMResponseCache(tmp_path / "llm.sqlite", max_bytes=20)
+    cache.put("old", "x" * 8)
+    cache.put("kept", "y" * 8)
+    cache.get("old")  # "kept" is now the least recently used
+    cache.put("new", "z" * 8)
+
+    assert cache.get("kept") is None
+    assert cache.get("old") == "x" * 8
+    assert cache.stats()["bytes"] <= 20
+    assert cache.evictions == 1
@@ -0,0 +1,36 @@
+# tests/test_llm_pool.py
+import threading
+import time
+
+from opendox.core.llm_pool import LLMWorkerPool
+
+
+def test_results_keep_submission_order():
+    def work(i):
+        time.sleep(0.01 * (5 - i))
+        return i
+
+    with LLMWorkerPool(4) as pool:
+        futures = [pool.submit(work, i) for i in range(5)]
+        assert [f.result() for f in futures] == [0, 1, 2, 3, 4]
+
+
+def test_in_flight_limit_is_respected():
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def work():
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+
+    with LLMWorkerPool(2) as pool:
+        futures = [pool.submit(work) for _ in range(8)]
+        for f in futures:
+            f.result()
+    assert peak <= 2
@@ -0,0 +1,86 @@
+# tests/test_llm_streaming.py
+from opendox.generators.backends import OllamaBackend
+from opendox.generators.llm_generator import LLMGenerator, ResponseSectionParser
+
+ANSWER = """DESCRIPTION: Adds numbers.
+
+DETAILS: Sums a and b.
+
+PARAMETERS:
+- a: [int] first
+
+RETURNS:
+[int] the sum
+
+USAGE NOTES:
+Pure function.
+
+Example:
+```python
+add(1, 2)
+```
+""" + "ramble " * 100
+
+
+class StreamingClient:
+    def __init__(self):
+        self.chunks_sent = 0
+        self.closed = False
+
+    def generate(self, model, prompt, options, stream=False):
+        def chunks():
+            try:
+                for i in range(0, len(ANSWER), 5):
+                    self.chunks_sent += 1
+                    yield {'response': ANSWER[i:i + 5]}
+            finally:
+                self.closed = True
+        return chunks()
+
+
+def test_streaming_stops_after_last_expected_section():
+    client = StreamingClient()
+    generator = LLMGenerator(model="test", backend=OllamaBackend(client=client))
+
+    doc = generator.generate_function_doc({'name': 'add', 'metadata': {'args': ['a']}})
+
+    assert doc.startswith("Adds numbers.")
+    assert "Pure function." in doc and "ramble" not in doc
+    assert client.closed
+    assert client.chunks_sent < len(ANSWER) // 5 // 2
+
+
+def test_parser_handles_sections_split_across_chunks():
+    sections = ResponseSectionParser()
+    for piece in ["DESCRIP", "TION: Does it.\nRETU", "RNS:\n[int] value\n"]:
+        sections.feed(piece)
+    sections.finish()
+
+    assert sections.description == "Does it."
+    assert sections.returns.strip() == "[int] value"
+    assert not sections.complete
+
+
+class BlockingClient:
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, model, prompt, options):
+        self.calls += 1
+        return {'response': ANSWER}
+
+
+def test_early_stopped_answers_are_cached_apart_from_full_ones(tmp_path):
+    from opendox.core.llm_cache import LLMResponseCache
+
+    cache = LLMResponseCache(tmp_path / "llm.sqlite")
+    function = {'name': 'add', 'metadata': {'args': ['a']}}
+    LLMGenerator(model="test", backend=OllamaBackend(client=StreamingClient()), cache=cache).generate_function_doc(function)
+
+    client = BlockingClient()
+    blocking = LLMGenerator(model="test", backend=OllamaBackend(client=client), cache=cache, stream=False)
+    blocking.generate_function_doc(function)
+    blocking.generate_function_doc(function)
+
+    assert client.calls == 1  # The truncated streamed answer was not reused
+    assert (cache.hits, cache.misses) == (1, 2)
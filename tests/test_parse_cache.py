@@ -0,0 +1,89 @@
+# tests/test_parse_cache.py
+from opendox.core.parse_cache import ParseResultCache
+from opendox.core.parse_pool import ParseStage
+from opendox.parsers.python_parser import PythonParser
+from opendox.parsers.universal_parser import UniversalParser
+
+SOURCE = '''
+import os
+
+
+class Greeter:
+    def greet(self, name: str) -> str:
+        return f"hello {name}"
+
+
+def helper(a, b=1):
+    return a + b
+'''
+
+
+def test_unchanged_content_skips_parsing(tmp_path, monkeypatch):
+    path = tmp_path / "mod.py"
+    path.write_text(SOURCE)
+    cache = ParseResultCache(tmp_path / "parse.sqlite")
+    first = cache.parse(PythonParser(), path)
+    cache.close()
+
+    def fail(self, file_path):
+        raise AssertionError("file was parsed")
+    monkeypatch.setattr(PythonParser, "parse_file", fail)
+
+    # Same content under another name is a hit as well
+    moved = tmp_path / "moved.py"
+    moved.write_text(SOURCE)
+    cache = ParseResultCache(tmp_path / "parse.sqlite")
+    second = cache.parse(PythonParser(), moved)
+    assert second['file'] == str(moved)
+    assert second['functions'] == first['functions']
+    assert second['classes'] == first['classes']
+    assert second['imports'] == first['imports']
+    assert cache.stats() == {'hits': 1, 'misses': 0}
+
+
+def test_parser_version_is_part_of_the_key(tmp_path, monkeypatch):
+    path = tmp_path / "mod.py"
+    path.write_text(SOURCE)
+    cache = ParseResultCache(tmp_path / "parse.sqlite")
+    cache.parse(PythonParser(), path)
+    monkeypatch.setattr(PythonParser, "VERSION", PythonParser.VERSION + 1)
+    cache.parse(PythonParser(), path)
+    assert cache.stats() == {'hits': 0, 'misses': 2}
+
+
+def test_foreign_or_corrupt_entries_are_misses(tmp_path, monkeypatch):
+    path = tmp_path / "mod.py"
+    path.write_text(SOURCE)
+    cache = ParseResultCache(tmp_path / "parse.sqlite")
+    key, _ = cache.lookup(PythonParser(), path)
+    monkeypatch.setattr("sys.version_info", (3, 99, 0))
+    assert cache.lookup(PythonParser(), path)[0] != key
+
+    cache._writes[key] = b"\xff not marshal"
+    assert cache.get_compact(key) is None
+    assert cache.stats() == {'hits': 0, 'misses': 3}
+
+def test_universal_parser_results_round_trip(tmp_path):
+    path = tmp_path / "mod.py"
+    path.write_text(SOURCE)
+    parser = UniversalParser()
+    cache = ParseResultCache(tmp_path / "parse.sqlite")
+    first = cache.parse(parser, path)
+    assert cache.parse(parser, path) == first
+    assert cache.stats()['hits'] == 1
+
+
+def test_parse_stage_mixes_hits_and_misses_in_order(tmp_path):
+    paths = []
+    for i in range(7):
+        path = tmp_path / f"mod{i}.py"
+        path.write_text(SOURCE + f"\nX = {i}\n")
+        paths.append(path)
+    cache = ParseResultCache(tmp_path / "parse.sqlite")
+    list(ParseStage(cache=cache).imap(paths[::2]))
+
+    pooled = ParseStage(workers=2, chunk_size=2, cache=cache)
+    results = list(pooled.imap(iter(paths)))
+    assert [p for p, _ in results] == paths
+    assert all(r['file'] == str(p) for p, r in results)
+    assert cache.stats() == {'hits': 4, 'misses': 7}
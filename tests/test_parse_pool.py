@@ -0,0 +1,69 @@
+# tests/test_parse_pool.py
+import pickle
+
+from opendox.core.parse_pool import ParseStage, compact_result, expand_result
+from opendox.parsers.python_parser import PythonParser
+
+SOURCE = '''
+import os
+from typing import List as L
+
+
+class Greeter:
+    """Say hello."""
+
+    def greet(self, name: str) -> str:
+        return f"hello {name}"
+
+
+def helper(a, b=1):
+    return a + b
+'''
+
+
+def test_compact_result_round_trip(tmp_path):
+    path = tmp_path / "mod.py"
+    path.write_text(SOURCE)
+    result = PythonParser().parse_file(path)
+
+    data = pickle.loads(pickle.dumps(compact_result(result)))
+    restored = expand_result(data)
+
+    assert restored['functions'] == result['functions']
+    assert restored['classes'] == result['classes']
+    assert restored['total_lines'] == result['total_lines']
+    assert restored['imports'] == result['imports']
+
+
+def test_process_pool_matches_in_process(tmp_path):
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"mod{i}.py"
+        path.write_text(SOURCE)
+        paths.append(path)
+    (tmp_path / "broken.py").write_text("def oops(:\n")
+    paths.append(tmp_path / "broken.py")
+
+    serial = list(ParseStage(workers=0).imap(paths))
+    pooled = list(ParseStage(workers=2, chunk_size=2).imap(iter(paths)))
+
+    assert [p for p, _ in pooled] == paths
+    for (_, a), (_, b) in zip(serial, pooled):
+        assert a.get('error') == b.get('error')
+        assert a.get('functions') == b.get('functions')
+        assert a.get('imports') == b.get('imports')
+
+
+def test_serial_parse_errors_stay_per_file(tmp_path):
+    class FlakyParser(PythonParser):
+        def parse_file(self, file_path):
+            if file_path.name == "bad.py":
+                raise AttributeError("boom")
+            return super().parse_file(file_path)
+
+    (tmp_path / "bad.py").write_text(SOURCE)
+    (tmp_path / "good.py").write_text("import a.b.c\n\n\n@a.b.c\ndef wrapped():\n    pass\n")
+    results = dict(ParseStage(FlakyParser(), workers=0).imap([tmp_path / "bad.py", tmp_path / "good.py"]))
+
+    assert results[tmp_path / "bad.py"] == {'error': 'boom', 'file': str(tmp_path / "bad.py")}
+    assert results[tmp_path / "good.py"]['functions'][0].metadata['decorators'] == ['a.b.c']
@@ -0,0 +1,51 @@
+# tests/test_python_parser.py
+import json
+import pickle
+
+from opendox.parsers.python_parser import PythonParser
+
+SOURCE = '''
+import os
+from typing import List
+
+
+class Store:
+    def get(self, key: str) -> List[int]:
+        return []
+
+    async def fetch(self, key):
+        def convert(value):
+            return value
+        return convert(key)
+
+
+async def main(argv: List[str]) -> int:
+    import sys
+    return 0
+'''
+
+
+def test_single_pass_collects_everything(tmp_path):
+    path = tmp_path / "mod.py"
+    path.write_text(SOURCE)
+    result = PythonParser().parse_file(path)
+
+    functions = {f.metadata['qualname']: f for f in result['functions']}
+    # Module level first, then nested definitions, as ast.walk ordered them
+    assert list(functions) == ['main', 'Store.get', 'Store.fetch', 'Store.fetch.<locals>.convert']
+    assert functions['main'].metadata['is_async']
+    assert functions['Store.get'].metadata['is_method']
+    assert not functions['Store.fetch.<locals>.convert'].metadata['is_method']
+    assert result['classes'][0].metadata['methods'] == ['get', 'fetch']
+    assert [i['module'] for i in result['imports']] == ['os', 'typing', 'sys']
+
+
+def test_signatures_are_plain_strings(tmp_path):
+    path = tmp_path / "mod.py"
+    path.write_text(SOURCE)
+    get = PythonParser().parse_file(path)['functions'][1]
+
+    assert type(get.signature) is str and type(get.metadata['returns']) is str
+    assert get.signature == 'get(self, key: str) -> List[int]'
+    assert json.loads(json.dumps(get.to_dict()))['metadata']['returns'] == 'List[int]'
+    assert pickle.loads(pickle.dumps(get)) == get
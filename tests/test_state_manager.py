@@ -0,0 +1,65 @@
+# tests/test_state_manager.py
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("duckdb")
+
+from opendox.core.pipeline import DocumentationPipeline
+from opendox.database.state_manager import DocumentationStateManager
+from opendox.generators.mock_generator import MockLLMGenerator
+
+
+def test_bulk_upsert_and_changed_files(tmp_path):
+    state = DocumentationStateManager(tmp_path)
+    state.upsert_file_states([
+        {'file_path': 'a.py', 'content_hash': 'h1', 'parse_success': True, 'doc_generated': True,
+         'generation_time_ms': 12, 'model': 'mock'},
+        {'file_path': 'b.py', 'content_hash': 'h2', 'parse_success': False, 'doc_generated': False},
+    ])
+    assert state.get_changed_files() == ['b.py']
+
+    checkpoint = datetime.now()
+    state.upsert_file_states([
+        {'file_path': 'b.py', 'content_hash': 'h3', 'parse_success': True, 'doc_generated': True},
+    ])
+    assert state.get_changed_files() == []
+    assert state.get_changed_files(since=checkpoint) == ['b.py']
+    rows = state.conn.execute(
+        "SELECT file_path, generation_time_ms FROM documentation_metadata ORDER BY file_path").fetchall()
+    assert rows == [('a.py', 12), ('b.py', None)]
+
+
+def test_pipeline_records_state(tmp_path):
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "a.py").write_text("def a():\n    return 1\n")
+    (project / "broken.py").write_text("def broken(:\n")
+
+    pipeline = DocumentationPipeline(generator=MockLLMGenerator(), llm_cache=False, state_db=True)
+    pipeline.generate(project, tmp_path / "docs", max_files=0)
+
+    state = DocumentationStateManager(project)
+    rows = state.conn.execute(
+        "SELECT file_path, parse_success, doc_generated FROM files ORDER BY file_path").fetchall()
+    assert rows == [(str(project / "a.py"), True, True), (str(project / "broken.py"), False, False)]
+
+
+def test_pipeline_state_reuses_cache_hashes(tmp_path, monkeypatch):
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "a.py").write_text("def a():\n    return 1\n")
+    (project / "broken.py").write_text("def broken(:\n")
+
+    hashed = []
+    original = DocumentationStateManager._hash_file
+    monkeypatch.setattr(DocumentationStateManager, "_hash_file",
+                        staticmethod(lambda file_path: hashed.append(file_path) or original(file_path)))
+    pipeline = DocumentationPipeline(generator=MockLLMGenerator(), llm_cache=False, state_db=True, use_git=False)
+    pipeline.generate(project, tmp_path / "docs", max_files=0)
+
+    # Only the file the cache never hashed (it failed to parse) is read by the state manager
+    assert hashed == [str(project / "broken.py")]
+    state = DocumentationStateManager(project)
+    hashes = dict(state.conn.execute("SELECT file_path, content_hash FROM files").fetchall())
+    assert hashes[str(project / "a.py")] == pipeline.cache.known_hash(project / "a.py")
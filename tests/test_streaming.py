@@ -0,0 +1,48 @@
+# tests/test_streaming.py
+import pytest
+
+from opendox.core.streaming import StageRunner
+
+
+def test_stages_preserve_order_with_small_queues():
+    runner = StageRunner(queue_depth=1)
+    source = runner.channel()
+    doubled = runner.channel()
+    seen = []
+
+    def produce():
+        for i in range(50):
+            runner.put(source, i)
+
+    def double():
+        for item in runner.iterate(source):
+            runner.put(doubled, item * 2)
+
+    def consume():
+        seen.extend(runner.iterate(doubled))
+
+    runner.start('produce', produce, output=source)
+    runner.start('double', double, output=doubled)
+    runner.start('consume', consume)
+    runner.join()
+
+    assert seen == [i * 2 for i in range(50)]
+
+
+def test_stage_failure_stops_the_run():
+    runner = StageRunner(queue_depth=1)
+    source = runner.channel()
+
+    def produce():
+        for i in range(1000):
+            if not runner.put(source, i):
+                return
+
+    def fail():
+        next(runner.iterate(source))
+        raise RuntimeError("boom")
+
+    runner.start('produce', produce, output=source)
+    runner.start('fail', fail)
+    with pytest.raises(RuntimeError):
+        runner.join()
@@ -0,0 +1,50 @@
+# tests/test_tracing.py
+import json
+import time
+
+from opendox.core.tracing import Tracer
+
+
+def test_spans_export_as_chrome_trace_events(tmp_path):
+    tracer = Tracer()
+    tracer.start(keep_events=True)
+    with tracer.span("parse", file="a.py"):
+        time.sleep(0.001)
+    tracer.record("parse", time.time(), 0.002, pid=42, tid=42, file="b.py")
+    tracer.stop()
+    with tracer.span("ignored"):
+        pass
+
+    path = tmp_path / "trace.json"
+    tracer.export_chrome(path)
+    events = json.loads(path.read_text())["traceEvents"]
+
+    assert [e["args"]["file"] for e in events] == ["a.py", "b.py"]
+    assert all(e["ph"] == "X" and e["dur"] > 0 for e in events)
+    assert events[1]["pid"] == 42
+    assert tracer.stage_breakdown()["parse"]["count"] == 2
+
+
+def test_breakdown_without_event_retention():
+    tracer = Tracer()
+    tracer.start()
+    for duration in (0.001, 0.002, 0.100):
+        tracer.record("llm", time.time(), duration)
+
+    breakdown = tracer.stage_breakdown()["llm"]
+    assert breakdown["count"] == 3
+    assert breakdown["p50_ms"] == 2.0
+    assert breakdown["p99_ms"] == 100.0
+
+
+def test_breakdown_memory_is_bounded():
+    tracer = Tracer()
+    tracer.start()
+    for i in range(10_000):
+        tracer.record("parse", time.time(), 0.001 * (i % 10 + 1))
+
+    breakdown = tracer.stage_breakdown()["parse"]
+    assert breakdown["count"] == 10_000
+    assert round(breakdown["total_ms"]) == 55_000
+    assert len(tracer._durations["parse"].samples) <= 2048
+    assert 3.0 <= breakdown["p50_ms"] <= 8.0
@@ -0,0 +1,110 @@
+# tests/test_universal_parser.py
+import sys
+import threading
+import warnings
+
+import pytest
+
+pytest.importorskip("tree_sitter_languages")
+warnings.simplefilter("ignore", FutureWarning)
+
+from opendox.parsers.universal_parser import SKIP_TYPES, UniversalParser, load_language, walk_tree
+
+
+@pytest.fixture(scope="module")
+def parser():
+    parser = UniversalParser()
+    if not parser.available:
+        pytest.skip("tree-sitter grammars unavailable")
+    return parser
+
+
+def test_walk_matches_recursive_order(parser):
+    tree = parser.parser_for(".js").parse(b"function a() { return [1, () => 2]; }\nclass B { m() {} }")
+
+    def recursive(node):
+        yield node
+        for child in node.children:
+            yield from recursive(child)
+
+    assert [n.id for n in walk_tree(tree.root_node)] == [n.id for n in recursive(tree.root_node)]
+    pruned = [n.type for n in walk_tree(tree.root_node, frozenset({"function_declaration"}))]
+    assert "function_declaration" in pruned and "return_statement" not in pruned
+
+
+def test_deep_nesting_does_not_hit_recursion_limit(parser, tmp_path):
+    depth = sys.getrecursionlimit() + 200
+    path = tmp_path / "deep.js"
+    path.write_text("const f = () => " + "[" * depth + "1" + "]" * depth + ";\nfunction g() {}\n")
+    result = parser.parse_file(path)
+    assert "error" not in result
+    assert {"f", "g"} <= {f["name"] for f in result["functions"]}
+
+
+def test_python_extraction_with_skips(parser, tmp_path):
+    path = tmp_path / "mod.py"
+    path.write_text(
+        'import os\n\n'
+        'class Café:\n'
+        '    """Serves coffee."""\n'
+        '    def brew(self, cups):\n'
+        '        def inner(x):\n'
+        '            return x\n'
+        '        return [inner(c) for c in range(cups)]\n',
+        encoding="utf-8",
+    )
+    result = parser.parse_file(path)
+    assert [c["name"] for c in result["classes"]] == ["Café"]
+    assert result["classes"][0]["docstring"] == "Serves coffee."
+    assert [(f["name"], f["metadata"]["args"]) for f in result["functions"]] == [
+        ("brew", ["self", "cups"]), ("inner", ["x"])]
+    assert "expression_statement" in SKIP_TYPES["python"]
+
+
+def test_grammars_load_on_first_use(tmp_path):
+    load_language.cache_clear()
+    parser = UniversalParser()
+    assert load_language.cache_info().currsize == 0
+    path = tmp_path / "mod.py"
+    path.write_text("def f():\n    pass\n")
+    # A fresh thread has no parsers yet, so its first parse loads the grammar
+    results = []
+    thread = threading.Thread(target=lambda: results.append(parser.parse_file(path)))
+    thread.start()
+    thread.join()
+    assert results[0]["functions"][0]["name"] == "f"
+    assert UniversalParser().parser_for(".py") is parser.parser_for(".py")
+    assert load_language.cache_info().currsize == 1
+
+
+def test_parsers_are_per_thread():
+    parser = UniversalParser()
+    other = []
+    thread = threading.Thread(target=lambda: other.append(parser.parser_for(".py")))
+    thread.start()
+    thread.join()
+    assert other[0] is not parser.parser_for(".py")
+    assert parser.parsers[".js"] is load_language("javascript")
+
+
+def test_incremental_reparse_matches_cold_parse(tmp_path):
+    path = tmp_path / "svc.ts"
+    body = "".join(f"function f{i}(x: number) {{\n  return x + {i};\n}}\n" for i in range(20))
+    path.write_text(body)
+    incremental = UniversalParser(incremental=True)
+    incremental.parse_file(path)
+
+    # Rename one function and add a line above it, shifting everything after
+    edited = body.replace("function f5(", "\nfunction renamed(")
+    path.write_text(edited)
+    result = incremental.parse_file(path)
+    assert result == UniversalParser().parse_file(path)
+    lines = {f["name"]: f["line_start"] for f in result["functions"]}
+    assert "f5" not in lines and lines["renamed"] == 17
+    assert lines["f6"] == 20
+    stats = incremental.reparse_stats
+    assert stats["incremental"] == 1
+    assert stats["extracted"] - 20 < 3 and stats["reused"] >= 18
+
+    assert incremental.parse_file(path) == result
+    assert stats["unchanged"] == 1
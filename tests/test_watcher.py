@@ -0,0 +1,121 @@
+# tests/test_watcher.py
+import threading
+import time
+
+from opendox.core.pipeline import DocumentationPipeline
+from opendox.core.watcher import ChangeBatcher, PollingWatcher, run_watch
+from opendox.generators.mock_generator import MockLLMGenerator
+
+
+def test_burst_becomes_one_batch(tmp_path):
+    batcher = ChangeBatcher(debounce=0.1)
+
+    def checkout():
+        for i in range(500):
+            batcher.add(tmp_path / f"m{i}.py")
+
+    threading.Thread(target=checkout).start()
+    assert len(batcher.next_batch(timeout=5)) == 500
+    assert batcher.next_batch(timeout=0.2) == set()
+
+
+def test_polling_reports_added_modified_and_deleted(tmp_path):
+    (tmp_path / "a.py").write_text("a = 1\n")
+    (tmp_path / "b.py").write_text("b = 1\n")
+    (tmp_path / "notes.md").write_text("ignored\n")
+    seen = []
+    watcher = PollingWatcher(tmp_path, seen.append)
+
+    (tmp_path / "a.py").write_text("a = 22\n")
+    (tmp_path / "b.py").unlink()
+    (tmp_path / "c.py").write_text("c = 1\n")
+    (tmp_path / "notes.md").write_text("still ignored\n")
+    watcher.poll()
+    assert sorted(p.name for p in seen) == ["a.py", "b.py", "c.py"]
+
+
+def test_update_files_rewrites_only_affected_pages(tmp_path):
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "a.py").write_text("def alpha():\n    pass\n")
+    (project / "b.py").write_text("def beta():\n    pass\n")
+    output = tmp_path / "docs"
+    api = output / "docs" / "api"
+
+    pipeline = DocumentationPipeline(generator=MockLLMGenerator(), llm_cache=False)
+    pipeline.open_session(project, output)
+    try:
+        pipeline.generate(project, output, max_files=0)
+        config_written = (output / "mkdocs.yml").stat().st_mtime_ns
+        b_written = (api / "b.md").stat().st_mtime_ns
+
+        (project / "a.py").write_text('def alpha():\n    """Edited."""\n')
+        changes = pipeline.update_files([project / "a.py", project / "b.py"])
+        assert changes["updated"] == [project / "a.py"]
+        assert changes["unchanged"] == [project / "b.py"]
+        assert (api / "b.md").stat().st_mtime_ns == b_written
+        assert (output / "mkdocs.yml").stat().st_mtime_ns == config_written  # Same modules and counts
+
+        (project / "b.py").unlink()
+        (project / "c.py").write_text("def gamma():\n    pass\n")
+        changes = pipeline.update_files([project / "b.py", project / "c.py"])
+        assert changes["removed"] == [project / "b.py"]
+        assert not (api / "b.md").exists()
+        config = (output / "mkdocs.yml").read_text()
+        assert "api/c.md" in config and "api/a.md" in config and "api/b.md" not in config
+    finally:
+        pipeline.close_session()
+
+
+def test_deleting_a_module_keeps_same_named_pages_and_drops_state(tmp_path):
+    project = tmp_path / "project"
+    (project / "a").mkdir(parents=True)
+    (project / "b").mkdir()
+    (project / "a" / "utils.py").write_text("def from_a():\n    pass\n")
+    (project / "b" / "utils.py").write_text("def from_b():\n    pass\n")
+    output = tmp_path / "docs"
+    page = output / "docs" / "api" / "utils.md"
+
+    pipeline = DocumentationPipeline(generator=MockLLMGenerator(), llm_cache=False, use_git=False, state_db=True)
+    pipeline.open_session(project, output)
+    try:
+        pipeline.generate(project, output, max_files=0)
+        count_rows = "SELECT count(*) FROM files"
+        assert pipeline.state.conn.execute(count_rows).fetchone()[0] == 2
+        owner = next(p for p in project.rglob("utils.py") if str(p) in page.read_text())
+        other = next(p for p in project.rglob("utils.py") if p != owner)
+
+        other.unlink()
+        assert pipeline.update_files([other])["removed"] == [other]
+        assert page.exists()
+
+        owner.unlink()
+        pipeline.update_files([owner])
+        assert not page.exists()
+        assert pipeline.state.conn.execute(count_rows).fetchone()[0] == 0
+    finally:
+        pipeline.close_session()
+
+def test_run_watch_regenerates_edited_page(tmp_path):
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "mod.py").write_text("def before():\n    pass\n")
+    output = tmp_path / "docs"
+    page = output / "docs" / "api" / "mod.md"
+    stop = threading.Event()
+    pipeline = DocumentationPipeline(generator=MockLLMGenerator(), llm_cache=False)
+    thread = threading.Thread(target=run_watch, args=(pipeline, project, output),
+                              kwargs={"debounce": 0.05, "poll": True, "interval": 0.05, "stop": stop})
+    thread.start()
+    try:
+        deadline = time.monotonic() + 10
+        while not page.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        (project / "mod.py").write_text("def after():\n    pass\n")
+        while "after" not in page.read_text() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert "after" in page.read_text()
+    finally:
+        stop.set()
+        thread.join()
+    assert pipeline.session is None